@@ -1,27 +1,65 @@
 import sys
-import json
 import os
+import shutil
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QLineEdit, QComboBox, QTableWidget, 
                             QTableWidgetItem, QPushButton, QGroupBox, QFormLayout, 
                             QSpinBox, QDoubleSpinBox, QMessageBox, QFileDialog, QSplitter,
                             QTextEdit, QHeaderView, QFrame, QStackedWidget, QInputDialog,
-                            QGraphicsDropShadowEffect)
-from PyQt5.QtCore import Qt, QSize, pyqtSlot, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve
-from PyQt5.QtGui import QIcon, QFont, QColor, QPalette, QLinearGradient, QGradient, QPainter, QPen, QBrush
+                            QGraphicsDropShadowEffect, QDialog, QStyledItemDelegate, QProgressBar)
+from PyQt5.QtCore import Qt, QSize, pyqtSlot, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve, QTimer, QSemaphore, QLockFile
+from PyQt5.QtGui import QIcon, QFont, QColor, QPalette, QLinearGradient, QGradient, QPainter, QPen, QBrush, QKeySequence
 import requests
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import numpy as np
 import sys
 import os
 
+from core.change_bus import ChangeBus
+from core.deferred_section import DeferredSection
+from core.history import CHUNK_SIZE, History, expand
+from core.journal import SYNC_INTERVAL, EditJournal
+from core.library import ScenarioLibrary
+from core.model_store import ScenarioStore
+from core.mps import is_mps_path, open_mps, read_mps_file, write_mps
+from core.name_registry import NameRegistry
+from core.scenario_binary import BINARY_SUFFIX, BinaryScenario, is_binary_scenario, save_binary_scenario
+from core.result_export import RESULT_FORMATS, ResultArrays, write_results
+from core.scenario_stream import SECTIONS, ScenarioReader, section_columns, write_scenario
+from core.table_csv import read_csv_batches, result_rows, write_csv
+from core.tabular import format_numbers, parse_delimited
+from core.usage_matrix import UsageMatrix
+from core.validation import TABLE_TITLES, validate_scenario
+from widgets.library_dialog import LibraryDialog
+from widgets.result_tree import ResultView
+from widgets.sweep_dialog import SweepDialog
+from widgets.table_filter import TableFilterBox
+from widgets.table_paste import add_paste_action
+from widgets.table_text import column_texts
+from widgets.usage_matrix_editor import UsageMatrixDialog
+
 # Set API base URL
 API_BASE_URL = "http://localhost:5000"
 
 # Define allowed optimizer types
 ALLOWED_OPTIMIZERS = ["demand-constrained-production", "basic-production"]
+LIBRARY_PATH = os.path.join(os.path.expanduser("~"), ".prod_problem", "library.sqlite")
+AUTOSAVE_DIR = os.path.join(os.path.expanduser("~"), ".prod_problem", "autosave")
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+# Scenario sections that stay out of their tables when larger than LAZY_SECTION_ROWS, until shown
+LAZY_SECTIONS = ("resource_usage", "demand_constraints")
+LAZY_SECTION_ROWS = 20000
+# Sections naming the products or resources of other sections
+REFERENCED_SECTIONS = {"resource_usage": ("products", "resources"), "demand_constraints": ("products",)}
+# Change-bus topic marked when an input section is edited
+SECTION_TOPICS = {"products": "products", "resources": "resources", "resource_usage": "usage",
+                  "demand_constraints": "demand"}
+# Input rows above which validation, the model store and the journal catch up with a change on an InputPassThread
+INPUT_PASS_ROWS = 20000
+# x axis label of the live objective chart for single runs; sweeps label it with the swept capacity
+RUN_LABEL = "Run"
 
 class OptimizationThread(QThread):
     """Thread for running optimization requests without blocking the UI"""
@@ -45,90 +83,279 @@ class OptimizationThread(QThread):
         except Exception as e:
             self.error_occurred.emit(f"Error: {str(e)}")
 
-class ModernFigureCanvas(FigureCanvas):
-    """Base class for modern-looking charts"""
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
-        plt.style.use('default')
-        self.fig = Figure(figsize=(width, height), dpi=dpi)
-        self.fig.patch.set_facecolor('#ffffff')
-        self.axes = self.fig.add_subplot(111)
-        self.axes.set_facecolor('#f8f9fa')
-        
-        super().__init__(self.fig)
-        self.setParent(parent)
-        self.fig.tight_layout()
+class SweepThread(OptimizationThread):
+    """Thread solving the scenario once per capacity of one resource, sending each result as it arrives"""
+    step_ready = pyqtSignal(int, float, dict)
+    
+    def __init__(self, optimizer_type, data, resource, capacities):
+        super().__init__(optimizer_type, data)
+        self.resource = resource
+        self.capacities = capacities
+        
+    def run(self):
+        try:
+            url = f"{API_BASE_URL}/production/optimize/{self.optimizer_type}"
+            # One connection for every run of the sweep
+            with requests.Session() as session:
+                for index, capacity in enumerate(self.capacities):
+                    if self.isInterruptionRequested():
+                        return
+                    resources = [
+                        dict(resource, available_capacity=capacity) if resource["name"] == self.resource else resource
+                        for resource in self.data["resources"]
+                    ]
+                    response = session.post(url, json={**self.data, "resources": resources})
+                    if response.status_code != 200:
+                        self.error_occurred.emit(f"API Error: {response.status_code} - {response.text}")
+                        return
+                    self.step_ready.emit(index, capacity, response.json())
+        except Exception as e:
+            self.error_occurred.emit(f"Error: {str(e)}")
 
-class ResourceUsageChart(ModernFigureCanvas):
-    """Widget for displaying resource utilization charts"""
-    def update_chart(self, resource_utilization):
-        self.axes.clear()
-        if not resource_utilization:
-            return
-            
-        resources = []
-        used_values = []
-        available_values = []
+class ScenarioLoadThread(QThread):
+    """Thread streaming a scenario file into table rows without blocking the UI
+
+    Rows arrive as batches of column text through rows_ready and the GUI
+    thread releases batch_slots once it has added each batch. Only a few
+    batches can wait at a time, so memory stays bounded however large
+    the file is. Formats with a header send the row count of every
+    section through counts_ready before any rows.
+    """
+    rows_ready = pyqtSignal(str, list)
+    counts_ready = pyqtSignal(dict)
+    progress = pyqtSignal(int)
+    loaded = pyqtSignal(dict)
+    error_occurred = pyqtSignal(str)
+    # Small enough that adding one batch to a table keeps the UI responsive
+    batch_rows = 2000
+    # Sections collected as cell text in deferred instead of being sent to the tables
+    defer_sections = LAZY_SECTIONS
+    
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.batch_slots = QSemaphore(4)
+        self.warnings = []
+        self.deferred = {}
         
-        for resource, details in resource_utilization.items():
-            resources.append(resource)
-            used_values.append(details['used'])
-            available_values.append(details['available'])
+    def run(self):
+        try:
+            if is_mps_path(self.file_path):
+                # Parsing is the first half of the progress bar and filling the tables the second
+                scenario = read_mps_file(self.file_path, lambda fraction: self.progress.emit(int(fraction * 50)))
+                self.warnings = scenario.warnings
+                if not self.send_scenario(scenario, 50):
+                    return
+                settings = scenario.settings
+            elif is_binary_scenario(self.file_path):
+                scenario = BinaryScenario(self.file_path)
+                if not self.send_scenario(scenario):
+                    return
+                settings = scenario.settings
+            else:
+                with open(self.file_path, "rb") as f:
+                    size = os.fstat(f.fileno()).st_size or 1
+                    reader = ScenarioReader(f, self.batch_rows)
+                    for section, rows in reader:
+                        if not self.send_rows(section, section_columns(section, rows),
+                                              min(100, reader.bytes_read * 100 // size)):
+                            return
+                settings = reader.settings
+            self.loaded.emit(settings)
+        except (OSError, ValueError) as e:
+            self.error_occurred.emit(str(e))
+        except Exception as e:
+            # Without a signal the window would stay locked waiting for the load
+            self.error_occurred.emit(f"{type(e).__name__}: {e}")
             
-        x = np.arange(len(resources))
-        width = 0.35
-        
-        # Use modern colors
-        self.axes.bar(x - width/2, used_values, width, label='Used', color='#3b82f6')
-        self.axes.bar(x + width/2, available_values, width, label='Available', color='#8b5cf6')
-        
-        self.axes.set_ylabel('Capacity', color='#1e293b')
-        self.axes.set_title('Resource Utilization', color='#1e293b', fontweight='bold')
-        self.axes.set_xticks(x)
-        self.axes.set_xticklabels(resources, rotation=45, ha='right', color='#1e293b')
-        self.axes.tick_params(axis='y', colors='#1e293b')
-        self.axes.spines['bottom'].set_color('#cbd5e1')
-        self.axes.spines['top'].set_color('#cbd5e1')
-        self.axes.spines['left'].set_color('#cbd5e1')
-        self.axes.spines['right'].set_color('#cbd5e1')
-        self.axes.legend(facecolor='#ffffff', edgecolor='#cbd5e1')
-        
-        self.fig.tight_layout()
-        self.draw()
+    def send_scenario(self, scenario, start=0):
+        """Send every section of a ScenarioArrays in batches; False if the load was interrupted"""
+        counts = scenario.row_counts()
+        self.counts_ready.emit(counts)
+        total = sum(counts.values()) or 1
+        done = 0
+        for section, columns in scenario.text_batches(self.batch_rows):
+            done += len(columns[0])
+            if not self.send_rows(section, columns, start + done * (100 - start) // total):
+                return False
+        return True
+        
+    def send_rows(self, section, columns, percent):
+        """Hand one batch to the GUI thread once it has room; False if the load was interrupted"""
+        if section in self.defer_sections:
+            if section in self.deferred:
+                for texts, batch in zip(self.deferred[section], columns):
+                    texts.extend(batch)
+            else:
+                self.deferred[section] = [list(batch) for batch in columns]
+            self.progress.emit(percent)
+            return not self.isInterruptionRequested()
+        while not self.batch_slots.tryAcquire(1, 100):
+            if self.isInterruptionRequested():
+                return False
+        self.rows_ready.emit(section, columns)
+        self.progress.emit(percent)
+        return not self.isInterruptionRequested()
 
-class ProductionChart(ModernFigureCanvas):
-    """Widget for displaying production plan charts"""
-    def update_chart(self, production_plan):
-        self.axes.clear()
-        if not production_plan:
-            return
-            
-        products = list(production_plan.keys())
-        quantities = list(production_plan.values())
-        
-        # Sort by quantity for better visualization
-        sorted_data = sorted(zip(products, quantities), key=lambda x: x[1], reverse=True)
-        products = [x[0] for x in sorted_data]
-        quantities = [x[1] for x in sorted_data]
-        
-        y_pos = np.arange(len(products))
-        
-        # Create a gradient of colors
-        colors = plt.cm.viridis(np.linspace(0, 0.8, len(products)))
-        
-        self.axes.barh(y_pos, quantities, align='center', color='#3b82f6')
-        self.axes.set_yticks(y_pos)
-        self.axes.set_yticklabels(products, color='#1e293b')
-        self.axes.invert_yaxis()  # labels read top-to-bottom
-        self.axes.set_xlabel('Production Quantity', color='#1e293b')
-        self.axes.set_title('Production Plan', color='#1e293b', fontweight='bold')
-        self.axes.tick_params(axis='x', colors='#1e293b')
-        self.axes.spines['bottom'].set_color('#cbd5e1')
-        self.axes.spines['top'].set_color('#cbd5e1')
-        self.axes.spines['left'].set_color('#cbd5e1')
-        self.axes.spines['right'].set_color('#cbd5e1')
-        
-        self.fig.tight_layout()
-        self.draw()
+class LibraryLoadThread(ScenarioLoadThread):
+    """Thread streaming a scenario stored in the library into the tables"""
+    
+    def __init__(self, library_path, scenario_id):
+        super().__init__(library_path)
+        self.scenario_id = scenario_id
+        
+    def run(self):
+        try:
+            # SQLite connections stay on the thread that opened them
+            library = ScenarioLibrary(self.file_path)
+            try:
+                scenario = library.scenario(self.scenario_id)
+            finally:
+                library.close()
+            if self.send_scenario(scenario):
+                self.loaded.emit(scenario.settings)
+        except (sqlite3.Error, ValueError) as e:
+            self.error_occurred.emit(str(e))
+        except Exception as e:
+            self.error_occurred.emit(f"{type(e).__name__}: {e}")
+
+class CsvImportThread(ScenarioLoadThread):
+    """Thread streaming a CSV file into the rows of one input table"""
+    defer_sections = ()
+    
+    def __init__(self, file_path, section, column_count, numeric_columns):
+        super().__init__(file_path)
+        self.section = section
+        self.column_count = column_count
+        self.numeric_columns = numeric_columns
+        self.fraction_read = 0.0
+        
+    def run(self):
+        try:
+            for columns in read_csv_batches(self.file_path, self.column_count, self.numeric_columns, self.batch_rows,
+                                            lambda fraction: setattr(self, "fraction_read", fraction)):
+                if not self.send_rows(self.section, columns, int(self.fraction_read * 100)):
+                    return
+            self.loaded.emit({})
+        except (OSError, ValueError) as e:
+            self.error_occurred.emit(str(e))
+        except Exception as e:
+            self.error_occurred.emit(f"{type(e).__name__}: {e}")
+
+class SectionFillThread(ScenarioLoadThread):
+    """Thread handing the cell text of a deferred section to its table in batches"""
+    defer_sections = ()
+    
+    def __init__(self, section, columns):
+        super().__init__(None)
+        self.section = section
+        self.columns = columns
+        
+    def run(self):
+        count = len(self.columns[0])
+        for start in range(0, count, self.batch_rows):
+            stop = min(start + self.batch_rows, count)
+            if not self.send_rows(self.section, [column[start:stop] for column in self.columns], stop * 100 // count):
+                return
+        self.loaded.emit({})
+
+class InputPassThread(QThread):
+    """Thread validating, storing and journaling a change of large input tables without blocking the UI
+
+    Until it finishes the GUI thread leaves the model store and the
+    journal to it; MainWindow.finish_input_pass waits for it whenever
+    they are needed sooner. Only the sections named in sections are
+    checked, stored and journaled again; the problems the previous report
+    found in the others are kept.
+    """
+    def __init__(self, columns, sections, previous, store, journal, settings):
+        super().__init__()
+        self.columns = columns
+        self.sections = sections
+        self.previous = previous
+        self.store = store
+        self.journal = journal
+        self.settings = settings
+        self.report = None
+        self.error = None
+        self.journal_error = None
+        
+    def run(self):
+        changed = {key: self.columns[key] for key in self.sections}
+        try:
+            self.report = validate_scenario(*[self.columns[key] for key in SECTIONS], self.previous, self.sections)
+            self.store.load_table_text(changed)
+        except Exception as e:
+            # Nothing may escape a thread; finish_input_pass reports it
+            self.error = e
+        if self.journal is not None:
+            try:
+                self.journal.record(changed, self.settings)
+            except OSError as e:
+                self.journal_error = e
+
+class ExportThread(QThread):
+    """Thread writing an export file without blocking the UI
+
+    write is called with the open file and returns the number of rows or
+    results written, which exported reports along with the path.
+    """
+    exported = pyqtSignal(str, int)
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, file_path, write, mode="w"):
+        super().__init__()
+        self.file_path = file_path
+        self.write = write
+        self.mode = mode
+        
+    def run(self):
+        try:
+            with open(self.file_path, self.mode, newline=None if "b" in self.mode else "") as f:
+                count = self.write(f)
+            self.exported.emit(self.file_path, count)
+        except (OSError, ValueError) as e:
+            self.error_occurred.emit(str(e))
+
+def lock_autosave_session(directory):
+    """Create a new autosave session under directory and lock it; returns the lock and the session path
+
+    The lock file sits next to the session directory and is taken before
+    the directory exists, so no other window mistakes a session that is
+    still starting for one left behind.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"session-{uuid.uuid4().hex}")
+    lock = QLockFile(path + ".lock")
+    # Held for as long as the window is open, however long that is
+    lock.setStaleLockTime(0)
+    if not lock.tryLock(0):
+        raise OSError(f"Cannot lock {path}.lock")
+    os.makedirs(path)
+    return lock, path
+
+def abandoned_autosave_sessions(directory):
+    """Lock the sessions under directory whose window is gone; returns (lock, path) pairs, newest first
+
+    A lock is only free once its window has closed or its process has died.
+    """
+    sessions = []
+    for entry in os.scandir(directory):
+        if not entry.is_dir():
+            continue
+        lock = QLockFile(entry.path + ".lock")
+        lock.setStaleLockTime(0)
+        if lock.tryLock(0):
+            sessions.append((lock, entry.path))
+    # The session written to last comes first
+    sessions.sort(key=lambda session: max((entry.stat().st_mtime for entry in os.scandir(session[1])), default=0),
+                  reverse=True)
+    return sessions
+
+def remove_autosave_session(lock, path):
+    """Delete a session's files, then release its lock"""
+    shutil.rmtree(path, ignore_errors=True)
+    lock.unlock()
 
 class StyleHelper:
     """Helper class for styling the application"""
@@ -327,7 +554,7 @@ class StyleHelper:
     @staticmethod
     def style_text_edit(text_edit):
         text_edit.setStyleSheet("""
-            QTextEdit {
+            QTextEdit, QPlainTextEdit {
                 background-color: #ffffff;
                 color: #1e293b;
                 border: 1px solid #e2e8f0;
@@ -344,9 +571,104 @@ class StyleHelper:
         shadow.setOffset(0, 5)
         widget.setGraphicsEffect(shadow)
 
+@contextmanager
+def bulk_update(*tables):
+    """Fill tables in one pass with their signals and painting suspended
+
+    Nothing downstream sees the individual inserts, so callers refresh
+    dependent views once after the block. Blocks may be nested.
+    """
+    states = [(table.blockSignals(True), table.updatesEnabled()) for table in tables]
+    for table in tables:
+        table.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        for table, (signals_blocked, updates_enabled) in zip(tables, states):
+            table.blockSignals(signals_blocked)
+            table.setUpdatesEnabled(updates_enabled)
+
+def patch_numeric_cells(table, old, new):
+    """Bring a table from snapshot old to new by rewriting only the numeric cells that differ
+
+    Returns False when names or row counts changed and the rows need replacing instead.
+    """
+    for column in range(len(new)):
+        if column not in table.numeric_columns and old[column] is not new[column]:
+            return False
+    for column in table.numeric_columns:
+        for number, (old_chunk, new_chunk) in enumerate(zip(old[column], new[column])):
+            if old_chunk is new_chunk:
+                continue
+            for row, (old_text, new_text) in enumerate(zip(old_chunk, new_chunk), number * CHUNK_SIZE):
+                if old_text != new_text:
+                    table.setItem(row, column, QTableWidgetItem(new_text))
+    return True
+
+def format_number_cell(item):
+    """Show a numeric cell with two decimals; other text is left for the validator to flag"""
+    try:
+        text = f"{float(item.text()):.2f}"
+    except ValueError:
+        return
+    if text != item.text():
+        item.setText(text)
+
+def remove_unregistered_rows(table, column, registry):
+    """Remove the rows whose cell in column refers to an id the registry no longer has
+
+    Cells without an id name something unknown and stay for the validator to flag.
+    """
+    rows = []
+    for row in range(table.rowCount()):
+        item = table.item(row, column)
+        entity_id = item.data(Qt.UserRole) if item is not None else None
+        if entity_id is not None and not registry.has_id(entity_id):
+            rows.append(row)
+    # Runs of adjacent rows go in one call, from the bottom so the rows above keep their numbers
+    while rows:
+        stop = start = rows.pop()
+        while rows and rows[-1] == start - 1:
+            start = rows.pop()
+        table.model().removeRows(start, stop - start + 1)
+
+def make_reference_item(name, entity_id):
+    """Create a cell naming a product or resource, with its registry id as user data"""
+    item = QTableWidgetItem(name)
+    item.setData(Qt.UserRole, entity_id)
+    return item
+
+class RegistryComboDelegate(QStyledItemDelegate):
+    """Edits a product or resource cell with a dropdown of every registered name
+
+    The dropdown only exists while the cell is being edited, so tables
+    with many rows don't pay for one combo box widget per row.
+    """
+    def __init__(self, registry, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        for entity_id, name in self.registry.items():
+            combo.addItem(name, entity_id)
+        StyleHelper.style_combo_box(combo)
+        return combo
+        
+    def setEditorData(self, editor, index):
+        editor.setCurrentIndex(editor.findData(index.data(Qt.UserRole)))
+        
+    def setModelData(self, editor, model, index):
+        if editor.currentIndex() >= 0:
+            model.setData(index, editor.currentData(), Qt.UserRole)
+            model.setData(index, editor.currentText(), Qt.EditRole)
+
 class ModernTableWidget(QTableWidget):
-    """Base class for modern styled table widgets"""
-    def __init__(self, parent=None):
+    """Base class for modern styled table widgets whose first column names an entity"""
+    entity_label = "Entry"
+    name_columns = (0,)
+    
+    def __init__(self, parent=None, registry=None):
         super().__init__(parent)
         StyleHelper.style_table(self)
         self.verticalHeader().setVisible(False)
@@ -354,16 +676,94 @@ class ModernTableWidget(QTableWidget):
         self.setSelectionBehavior(QTableWidget.SelectRows)
         self.setEditTriggers(QTableWidget.DoubleClicked | QTableWidget.EditKeyPressed)
         
+        # Names are registered with stable ids stored on the name cells
+        self.registry = registry if registry is not None else NameRegistry()
+        # Ids of the names in the table when a replace began, handed back to the names that return
+        self.reusable_ids = {}
+        
     def add_empty_row(self):
         row = self.rowCount()
         self.insertRow(row)
+        
+    def replace_rows(self, columns):
+        """Replace every row with columns of cell text; names that remain keep their ids"""
+        self.begin_replace()
+        self.append_rows(columns)
+        self.end_replace()
+        
+    def begin_replace(self):
+        """Empty the table but keep its names registered until end_replace
+
+        Rows added in between reuse the id of a name that was there before,
+        so rows of other tables referring to it stay.
+        """
+        self.setRowCount(0)
+        self.reusable_ids = {name: entity_id for entity_id, name in self.registry.items()}
+        
+    def end_replace(self):
+        """Unregister the names that did not come back, pruning the rows that refer to them"""
+        gone, self.reusable_ids = self.reusable_ids.values(), {}
+        self.registry.prune(list(gone))
+        
+    def remove_current_row(self):
+        """Remove the current row and unregister its name"""
+        row = self.currentRow()
+        if row < 0:
+            return
+        item = self.item(row, 0)
+        entity_id = item.data(Qt.UserRole) if item else None
+        self.removeRow(row)
+        if entity_id is not None:
+            self.registry.remove(entity_id)
+            
+    def on_name_changed(self, item):
+        """Register, rename or reject an edited name cell"""
+        name = item.text().strip()
+        entity_id = item.data(Qt.UserRole)
+        
+        if entity_id is None:
+            if not name:
+                return
+            if name in self.registry:
+                QMessageBox.warning(None, "Invalid Input", f"{self.entity_label} '{name}' already exists.")
+                self.restore_name(item, "")
+                return
+            self.blockSignals(True)
+            item.setData(Qt.UserRole, self.registry.add(name))
+            self.blockSignals(False)
+        elif not name:
+            QMessageBox.warning(None, "Invalid Input", f"{self.entity_label} name cannot be empty.")
+            self.restore_name(item, self.registry.name_of(entity_id))
+        elif name != self.registry.name_of(entity_id) and name in self.registry:
+            QMessageBox.warning(None, "Invalid Input", f"{self.entity_label} '{name}' already exists.")
+            self.restore_name(item, self.registry.name_of(entity_id))
+        else:
+            # Dependent tables reference the id, so this renames it everywhere
+            self.registry.rename(entity_id, name)
+            
+    def restore_name(self, item, name):
+        self.blockSignals(True)
+        item.setText(name)
+        self.blockSignals(False)
+        
+    def name_item(self, name):
+        """Create a name cell with the id its name had before a replace, or a newly registered one"""
+        item = QTableWidgetItem(name)
+        entity_id = self.reusable_ids.pop(name, None)
+        if entity_id is None and name and name not in self.registry:
+            entity_id = self.registry.add(name)
+        if entity_id is not None:
+            item.setData(Qt.UserRole, entity_id)
+        return item
 
 class ProductsTableWidget(ModernTableWidget):
     """Custom table widget for products data"""
     product_changed = pyqtSignal()
+    entity_label = "Product"
+    numeric_columns = (1, 2)
     
-    def __init__(self, parent=None):
-        super().__init__(parent)
+    def __init__(self, parent=None, registry=None):
+        super().__init__(parent, registry)
         self.setColumnCount(3)
         self.setHorizontalHeaderLabels(["Product Name", "Profit per Unit", "Cost per Unit"])
         self.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
@@ -372,20 +772,18 @@ class ProductsTableWidget(ModernTableWidget):
         self.itemChanged.connect(self.on_item_changed)
         
     def on_item_changed(self, item):
-        # Validate numeric inputs for profit and cost columns
-        if item.column() in [1, 2]:  # Profit or Cost column
-            try:
-                # Try to convert to float
-                value = float(item.text())
-                # Format to 2 decimal places
-                item.setText(f"{value:.2f}")
-            except ValueError:
-                # If not a valid number, reset to 0
-                item.setText("0.00")
-                QMessageBox.warning(None, "Invalid Input", "Please enter a valid number.")
+        if item.column() == 0:  # Name column
+            self.on_name_changed(item)
+        # Format profit and cost; invalid values are flagged by the table validator
+        elif item.column() in [1, 2]:  # Profit or Cost column
+            format_number_cell(item)
         
         self.product_changed.emit()
         
+    def remove_current_row(self):
+        super().remove_current_row()
+        self.product_changed.emit()
+        
     def get_products_data(self):
         products = []
         for row in range(self.rowCount()):
@@ -411,20 +809,37 @@ class ProductsTableWidget(ModernTableWidget):
         return names
         
     def set_products_data(self, products):
-        self.setRowCount(0)
-        for product in products:
-            row = self.rowCount()
-            self.insertRow(row)
-            self.setItem(row, 0, QTableWidgetItem(product["name"]))
-            self.setItem(row, 1, QTableWidgetItem(str(product["profit_per_unit"])))
-            self.setItem(row, 2, QTableWidgetItem(str(product["cost_per_unit"])))
+        names = [product["name"] for product in products]
+        profits = [f"{product['profit_per_unit']:.2f}" for product in products]
+        costs = [f"{product['cost_per_unit']:.2f}" for product in products]
+        
+        with bulk_update(self):
+            self.begin_replace()
+            self.setRowCount(len(names))
+            for row, (name, profit, cost) in enumerate(zip(names, profits, costs)):
+                self.setItem(row, 0, self.name_item(name))
+                self.setItem(row, 1, QTableWidgetItem(profit))
+                self.setItem(row, 2, QTableWidgetItem(cost))
+            self.end_replace()
+                
+    def append_rows(self, columns):
+        """Append pasted columns of cell text below the existing rows"""
+        names, profits, costs = columns[0], format_numbers(columns[1]), format_numbers(columns[2])
+        start = self.rowCount()
+        self.setRowCount(start + len(names))
+        for row, (name, profit, cost) in enumerate(zip(names, profits, costs), start):
+            self.setItem(row, 0, self.name_item(name))
+            self.setItem(row, 1, QTableWidgetItem(profit))
+            self.setItem(row, 2, QTableWidgetItem(cost))
 
 class ResourcesTableWidget(ModernTableWidget):
     """Custom table widget for resources data"""
     resource_changed = pyqtSignal()
+    entity_label = "Resource"
+    numeric_columns = (1,)
     
-    def __init__(self, parent=None):
-        super().__init__(parent)
+    def __init__(self, parent=None, registry=None):
+        super().__init__(parent, registry)
         self.setColumnCount(2)
         self.setHorizontalHeaderLabels(["Resource Name", "Available Capacity"])
         self.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
@@ -432,18 +847,16 @@ class ResourcesTableWidget(ModernTableWidget):
         self.itemChanged.connect(self.on_item_changed)
         
     def on_item_changed(self, item):
-        # Validate numeric input for capacity column
-        if item.column() == 1:  # Capacity column
-            try:
-                # Try to convert to float
-                value = float(item.text())
-                # Format to 2 decimal places
-                item.setText(f"{value:.2f}")
-            except ValueError:
-                # If not a valid number, reset to 0
-                item.setText("0.00")
-                QMessageBox.warning(None, "Invalid Input", "Please enter a valid number.")
+        if item.column() == 0:  # Name column
+            self.on_name_changed(item)
+        # Format capacity; invalid values are flagged by the table validator
+        elif item.column() == 1:  # Capacity column
+            format_number_cell(item)
+        
+        self.resource_changed.emit()
         
+    def remove_current_row(self):
+        super().remove_current_row()
         self.resource_changed.emit()
         
     def get_resources_data(self):
@@ -469,16 +882,32 @@ class ResourcesTableWidget(ModernTableWidget):
         return names
         
     def set_resources_data(self, resources):
-        self.setRowCount(0)
-        for resource in resources:
-            row = self.rowCount()
-            self.insertRow(row)
-            self.setItem(row, 0, QTableWidgetItem(resource["name"]))
-            self.setItem(row, 1, QTableWidgetItem(str(resource["available_capacity"])))
+        names = [resource["name"] for resource in resources]
+        capacities = [f"{resource['available_capacity']:.2f}" for resource in resources]
+        
+        with bulk_update(self):
+            self.begin_replace()
+            self.setRowCount(len(names))
+            for row, (name, capacity) in enumerate(zip(names, capacities)):
+                self.setItem(row, 0, self.name_item(name))
+                self.setItem(row, 1, QTableWidgetItem(capacity))
+            self.end_replace()
+                
+    def append_rows(self, columns):
+        """Append pasted columns of cell text below the existing rows"""
+        names, capacities = columns[0], format_numbers(columns[1])
+        start = self.rowCount()
+        self.setRowCount(start + len(names))
+        for row, (name, capacity) in enumerate(zip(names, capacities), start):
+            self.setItem(row, 0, self.name_item(name))
+            self.setItem(row, 1, QTableWidgetItem(capacity))
 
 class ResourceUsageTableWidget(QTableWidget):
     """Custom table widget for resource usage data with dropdown selection"""
-    def __init__(self, parent=None):
+    name_columns = (0, 1)
+    numeric_columns = (2,)
+    
+    def __init__(self, parent=None, product_registry=None, resource_registry=None):
         super().__init__(parent)
         self.setColumnCount(3)
         self.setHorizontalHeaderLabels(["Product", "Resource", "Usage per Unit"])
@@ -488,6 +917,7 @@ class ResourceUsageTableWidget(QTableWidget):
         self.verticalHeader().setVisible(False)
         self.setAlternatingRowColors(True)
         self.setSelectionBehavior(QTableWidget.SelectRows)
+        self.setEditTriggers(QTableWidget.DoubleClicked | QTableWidget.SelectedClicked | QTableWidget.EditKeyPressed)
         StyleHelper.style_table(self)
         
         # Set row height to accommodate dropdowns
@@ -496,79 +926,52 @@ class ResourceUsageTableWidget(QTableWidget):
         # Initially disable the table
         self.setEnabled(False)
         
-        # Product and resource names
-        self.product_names = []
-        self.resource_names = []
-        
-        # Connect itemChanged signal for validation
-        self.itemChanged.connect(self.validate_numeric_input)
-        
-    def validate_numeric_input(self, item):
-        # Validate numeric input for usage column
+        # Product and resource cells carry the registry ids and are edited with dropdowns
+        self.product_registry = product_registry if product_registry is not None else NameRegistry()
+        self.resource_registry = resource_registry if resource_registry is not None else NameRegistry()
+        self.product_registry.add_listener(
+            lambda event, entity_id, name: self.on_registry_changed(0, event, entity_id, name)
+        )
+        self.resource_registry.add_listener(
+            lambda event, entity_id, name: self.on_registry_changed(1, event, entity_id, name)
+        )
+        self.setItemDelegateForColumn(0, RegistryComboDelegate(self.product_registry, self))
+        self.setItemDelegateForColumn(1, RegistryComboDelegate(self.resource_registry, self))
+        
+        # Connect itemChanged signal for formatting
+        self.itemChanged.connect(self.format_numeric_input)
+        
+    def format_numeric_input(self, item):
+        # Format the usage column; invalid values are flagged by the table validator
         if item.column() == 2:  # Usage column
-            try:
-                # Try to convert to float
-                value = float(item.text())
-                # Format to 2 decimal places
-                item.setText(f"{value:.2f}")
-            except ValueError:
-                # If not a valid number, reset to 0
-                item.setText("0.00")
-                QMessageBox.warning(None, "Invalid Input", "Please enter a valid number.")
+            format_number_cell(item)
     
-    def update_product_names(self, names):
-        """Update the list of available product names"""
-        self.product_names = names
-        self.update_dropdowns()
-        
-    def update_resource_names(self, names):
-        """Update the list of available resource names"""
-        self.resource_names = names
-        self.update_dropdowns()
-        
-    def update_dropdowns(self):
-        """Update all dropdown cells with current product and resource names"""
-        for row in range(self.rowCount()):
-            # Update product dropdown
-            product_combo = self.cellWidget(row, 0)
-            if product_combo:
-                current_text = product_combo.currentText()
-                product_combo.clear()
-                product_combo.addItems(self.product_names)
-                if current_text in self.product_names:
-                    product_combo.setCurrentText(current_text)
-            
-            # Update resource dropdown
-            resource_combo = self.cellWidget(row, 1)
-            if resource_combo:
-                current_text = resource_combo.currentText()
-                resource_combo.clear()
-                resource_combo.addItems(self.resource_names)
-                if current_text in self.resource_names:
-                    resource_combo.setCurrentText(current_text)
+    def on_registry_changed(self, column, event, entity_id, name):
+        """Apply a single registry change to the cells in one column"""
+        if event == "added":
+            # The dropdown editor reads the registry when it opens
+            return
+        if event == "pruned":
+            remove_unregistered_rows(self, column, self.product_registry if column == 0 else self.resource_registry)
+            return
+        for row in reversed(range(self.rowCount())):
+            item = self.item(row, column)
+            if item is None or item.data(Qt.UserRole) != entity_id:
+                continue
+            if event == "renamed":
+                item.setText(name)
+            else:
+                # Rows using a removed name go with it
+                self.removeRow(row)
         
     def add_empty_row(self):
-        """Add a new row with dropdown cells"""
+        """Add a new row defaulting to the first product and resource"""
         row = self.rowCount()
         self.insertRow(row)
         
-        # Add product dropdown with improved visibility
-        product_combo = QComboBox()
-        product_combo.addItems(self.product_names)
-        product_combo.setMinimumWidth(150)  # Set minimum width
-        product_combo.setMaximumWidth(300)  # Set maximum width
-        product_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)  # Adjust to content
-        StyleHelper.style_combo_box(product_combo)
-        self.setCellWidget(row, 0, product_combo)
-        
-        # Add resource dropdown with improved visibility
-        resource_combo = QComboBox()
-        resource_combo.addItems(self.resource_names)
-        resource_combo.setMinimumWidth(150)  # Set minimum width
-        resource_combo.setMaximumWidth(300)  # Set maximum width
-        resource_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)  # Adjust to content
-        StyleHelper.style_combo_box(resource_combo)
-        self.setCellWidget(row, 1, resource_combo)
+        for column, registry in ((0, self.product_registry), (1, self.resource_registry)):
+            entity_id, name = next(registry.items(), (None, ""))
+            self.setItem(row, column, make_reference_item(name, entity_id))
         
         # Add usage cell
         self.setItem(row, 2, QTableWidgetItem("0.00"))
@@ -577,14 +980,14 @@ class ResourceUsageTableWidget(QTableWidget):
         """Get resource usage data from the table"""
         resource_usage = []
         for row in range(self.rowCount()):
-            product_combo = self.cellWidget(row, 0)
-            resource_combo = self.cellWidget(row, 1)
+            product_item = self.item(row, 0)
+            resource_item = self.item(row, 1)
             
-            if not product_combo or not resource_combo:
+            if not product_item or not resource_item:
                 continue
                 
-            product = product_combo.currentText()
-            resource = resource_combo.currentText()
+            product = product_item.text()
+            resource = resource_item.text()
             usage = float(self.item(row, 2).text()) if self.item(row, 2) and self.item(row, 2).text() else 0
             
             if product and resource:
@@ -597,45 +1000,50 @@ class ResourceUsageTableWidget(QTableWidget):
         
     def set_resource_usage_data(self, resource_usage):
         """Set resource usage data in the table"""
+        products = [ru["product_name"] for ru in resource_usage]
+        resources = [ru["resource_name"] for ru in resource_usage]
+        usages = [f"{ru['usage_per_unit']:.2f}" for ru in resource_usage]
+        product_id = self.product_registry.id_of
+        resource_id = self.resource_registry.id_of
+        
+        with bulk_update(self):
+            self.setRowCount(0)
+            self.setRowCount(len(products))
+            for row, (product, resource, usage) in enumerate(zip(products, resources, usages)):
+                self.setItem(row, 0, make_reference_item(product, product_id(product)))
+                self.setItem(row, 1, make_reference_item(resource, resource_id(resource)))
+                self.setItem(row, 2, QTableWidgetItem(usage))
+                
+    def replace_rows(self, columns):
+        """Replace every row with columns of cell text"""
         self.setRowCount(0)
-        for ru in resource_usage:
-            row = self.rowCount()
-            self.insertRow(row)
-            
-            # Add product dropdown with improved visibility
-            product_combo = QComboBox()
-            product_combo.addItems(self.product_names)
-            product_combo.setMinimumWidth(150)  # Set minimum width
-            product_combo.setMaximumWidth(300)  # Set maximum width
-            product_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)  # Adjust to content
-            if ru["product_name"] in self.product_names:
-                product_combo.setCurrentText(ru["product_name"])
-            StyleHelper.style_combo_box(product_combo)
-            self.setCellWidget(row, 0, product_combo)
-        
-            # Add resource dropdown with improved visibility
-            resource_combo = QComboBox()
-            resource_combo.addItems(self.resource_names)
-            resource_combo.setMinimumWidth(150)  # Set minimum width
-            resource_combo.setMaximumWidth(300)  # Set maximum width
-            resource_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)  # Adjust to content
-            if ru["resource_name"] in self.resource_names:
-                resource_combo.setCurrentText(ru["resource_name"])
-            StyleHelper.style_combo_box(resource_combo)
-            self.setCellWidget(row, 1, resource_combo)
-        
-            # Add usage cell
-            self.setItem(row, 2, QTableWidgetItem(f"{ru['usage_per_unit']:.2f}"))
+        self.append_rows(columns)
+        
+    def append_rows(self, columns):
+        """Append pasted columns of cell text; unknown names are kept for the validator to flag"""
+        products, resources, usages = columns[0], columns[1], format_numbers(columns[2])
+        # Pasted names repeat a lot, so resolve each distinct one once
+        product_ids = {name: self.product_registry.id_of(name) for name in set(products)}
+        resource_ids = {name: self.resource_registry.id_of(name) for name in set(resources)}
+        start = self.rowCount()
+        self.setRowCount(start + len(products))
+        for row, (product, resource, usage) in enumerate(zip(products, resources, usages), start):
+            self.setItem(row, 0, make_reference_item(product, product_ids[product]))
+            self.setItem(row, 1, make_reference_item(resource, resource_ids[resource]))
+            self.setItem(row, 2, QTableWidgetItem(usage))
             
     def check_enable_state(self):
         """Check if the table should be enabled based on product and resource names"""
-        should_enable = len(self.product_names) > 0 and len(self.resource_names) > 0
+        should_enable = len(self.product_registry) > 0 and len(self.resource_registry) > 0
         self.setEnabled(should_enable)
         return should_enable
 
 class DemandConstraintsTableWidget(QTableWidget):
     """Custom table widget for demand constraints data with dropdown selection for products"""
-    def __init__(self, parent=None):
+    name_columns = (0,)
+    numeric_columns = (1, 2)
+    
+    def __init__(self, parent=None, registry=None):
         super().__init__(parent)
         self.setColumnCount(3)
         self.setHorizontalHeaderLabels(["Product", "Min Demand", "Max Demand"])
@@ -645,6 +1053,7 @@ class DemandConstraintsTableWidget(QTableWidget):
         self.verticalHeader().setVisible(False)
         self.setAlternatingRowColors(True)
         self.setSelectionBehavior(QTableWidget.SelectRows)
+        self.setEditTriggers(QTableWidget.DoubleClicked | QTableWidget.SelectedClicked | QTableWidget.EditKeyPressed)
         StyleHelper.style_table(self)
         
         # Set row height to accommodate dropdowns
@@ -653,56 +1062,44 @@ class DemandConstraintsTableWidget(QTableWidget):
         # Initially disable the table
         self.setEnabled(False)
         
-        # Product names
-        self.product_names = []
+        # Product cells carry the registry ids and are edited with a dropdown
+        self.registry = registry if registry is not None else NameRegistry()
+        self.registry.add_listener(self.on_registry_changed)
+        self.setItemDelegateForColumn(0, RegistryComboDelegate(self.registry, self))
         
-        # Connect itemChanged signal for validation
-        self.itemChanged.connect(self.validate_numeric_input)
+        # Connect itemChanged signal for formatting
+        self.itemChanged.connect(self.format_numeric_input)
         
-    def validate_numeric_input(self, item):
-        # Validate numeric inputs for min and max demand columns
+    def format_numeric_input(self, item):
+        # Format min and max demand; empty cells mean no bound and invalid values are flagged by the table validator
         if item.column() in [1, 2]:  # Min or Max demand column
-            if item.text():  # Only validate if not empty
-                try:
-                    # Try to convert to float
-                    value = float(item.text())
-                    # Format to 2 decimal places
-                    item.setText(f"{value:.2f}")
-                except ValueError:
-                    # If not a valid number, reset to empty
-                    item.setText("")
-                    QMessageBox.warning(None, "Invalid Input", "Please enter a valid number.")
+            format_number_cell(item)
     
-    def update_product_names(self, names):
-        """Update the list of available product names"""
-        self.product_names = names
-        self.update_dropdowns()
-        
-    def update_dropdowns(self):
-        """Update all dropdown cells with current product names"""
-        for row in range(self.rowCount()):
-            # Update product dropdown
-            product_combo = self.cellWidget(row, 0)
-            if product_combo:
-                current_text = product_combo.currentText()
-                product_combo.clear()
-                product_combo.addItems(self.product_names)
-                if current_text in self.product_names:
-                    product_combo.setCurrentText(current_text)
+    def on_registry_changed(self, event, entity_id, name):
+        """Apply a single registry change to the product cells"""
+        if event == "added":
+            # The dropdown editor reads the registry when it opens
+            return
+        if event == "pruned":
+            remove_unregistered_rows(self, 0, self.registry)
+            return
+        for row in reversed(range(self.rowCount())):
+            item = self.item(row, 0)
+            if item is None or item.data(Qt.UserRole) != entity_id:
+                continue
+            if event == "renamed":
+                item.setText(name)
+            else:
+                # Constraints on a removed product go with it
+                self.removeRow(row)
         
     def add_empty_row(self):
-        """Add a new row with dropdown cells"""
+        """Add a new row defaulting to the first product"""
         row = self.rowCount()
         self.insertRow(row)
         
-        # Add product dropdown with improved visibility
-        product_combo = QComboBox()
-        product_combo.addItems(self.product_names)
-        product_combo.setMinimumWidth(150)  # Set minimum width
-        product_combo.setMaximumWidth(300)  # Set maximum width
-        product_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)  # Adjust to content
-        StyleHelper.style_combo_box(product_combo)
-        self.setCellWidget(row, 0, product_combo)
+        entity_id, name = next(self.registry.items(), (None, ""))
+        self.setItem(row, 0, make_reference_item(name, entity_id))
         
         # Add min demand cell
         self.setItem(row, 1, QTableWidgetItem(""))
@@ -714,12 +1111,12 @@ class DemandConstraintsTableWidget(QTableWidget):
         """Get demand constraints data from the table"""
         demand_constraints = []
         for row in range(self.rowCount()):
-            product_combo = self.cellWidget(row, 0)
+            product_item = self.item(row, 0)
             
-            if not product_combo:
+            if not product_item:
                 continue
                 
-            product = product_combo.currentText()
+            product = product_item.text()
             min_demand = self.item(row, 1).text() if self.item(row, 1) else ""
             max_demand = self.item(row, 2).text() if self.item(row, 2) else ""
             
@@ -734,37 +1131,38 @@ class DemandConstraintsTableWidget(QTableWidget):
         
     def set_demand_constraints_data(self, demand_constraints):
         """Set demand constraints data in the table"""
-        self.setRowCount(0)
-        for dc in demand_constraints:
-            row = self.rowCount()
-            self.insertRow(row)
-            
-            # Add product dropdown with improved visibility
-            product_combo = QComboBox()
-            product_combo.addItems(self.product_names)
-            product_combo.setMinimumWidth(150)  # Set minimum width
-            product_combo.setMaximumWidth(300)  # Set maximum width
-            product_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)  # Adjust to content
-            if dc["product_name"] in self.product_names:
-                product_combo.setCurrentText(dc["product_name"])
-            StyleHelper.style_combo_box(product_combo)
-            self.setCellWidget(row, 0, product_combo)
-            
-            # Add min demand cell
-            if "min_demand" in dc:
-                self.setItem(row, 1, QTableWidgetItem(f"{dc['min_demand']:.2f}"))
-            else:
-                self.setItem(row, 1, QTableWidgetItem(""))
+        products = [dc["product_name"] for dc in demand_constraints]
+        min_demands = [f"{dc['min_demand']:.2f}" if "min_demand" in dc else "" for dc in demand_constraints]
+        max_demands = [f"{dc['max_demand']:.2f}" if "max_demand" in dc else "" for dc in demand_constraints]
+        product_id = self.registry.id_of
+        
+        with bulk_update(self):
+            self.setRowCount(0)
+            self.setRowCount(len(products))
+            for row, (product, min_demand, max_demand) in enumerate(zip(products, min_demands, max_demands)):
+                self.setItem(row, 0, make_reference_item(product, product_id(product)))
+                self.setItem(row, 1, QTableWidgetItem(min_demand))
+                self.setItem(row, 2, QTableWidgetItem(max_demand))
                 
-            # Add max demand cell
-            if "max_demand" in dc:
-                self.setItem(row, 2, QTableWidgetItem(f"{dc['max_demand']:.2f}"))
-            else:
-                self.setItem(row, 2, QTableWidgetItem(""))
+    def replace_rows(self, columns):
+        """Replace every row with columns of cell text"""
+        self.setRowCount(0)
+        self.append_rows(columns)
+        
+    def append_rows(self, columns):
+        """Append pasted columns of cell text; unknown products are kept for the validator to flag"""
+        products, min_demands, max_demands = columns[0], format_numbers(columns[1]), format_numbers(columns[2])
+        product_id = self.registry.id_of
+        start = self.rowCount()
+        self.setRowCount(start + len(products))
+        for row, (product, min_demand, max_demand) in enumerate(zip(products, min_demands, max_demands), start):
+            self.setItem(row, 0, make_reference_item(product, product_id(product)))
+            self.setItem(row, 1, QTableWidgetItem(min_demand))
+            self.setItem(row, 2, QTableWidgetItem(max_demand))
                 
     def check_enable_state(self):
         """Check if the table should be enabled based on product names"""
-        should_enable = len(self.product_names) > 0
+        should_enable = len(self.registry) > 0
         self.setEnabled(should_enable)
         return should_enable
 
@@ -787,6 +1185,57 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Production Optimization")
         self.setMinimumSize(1200, 800)
         self.from_launcher = "--from-launcher" in sys.argv
+        # Report how long chart redraws take in the status bar
+        self.show_timings = "--timings" in sys.argv
+        # Draw the charts on a worker thread, leaving the GUI thread only the finished images to paint
+        self.threaded_charts = "--threaded-charts" in sys.argv
+        self.chart_thread = None
+        # Render seconds of the charts a result sent to the chart thread, None until drawn
+        self.chart_seconds = {}
+        self.chart_message = ""
+        
+        # Shared name indexes; dependent tables refer to products and resources by id
+        self.product_registry = NameRegistry()
+        self.resource_registry = NameRegistry()
+        
+        # Typed copy of the table contents, refreshed once per flush so reads don't parse cell text
+        self.store = ScenarioStore(self.product_registry, self.resource_registry)
+        
+        # Edits only mark tables dirty; dependent views recompute once per event-loop pass
+        self.change_bus = ChangeBus(lambda flush: QTimer.singleShot(0, flush))
+        
+        # Cells flagged by the last validation pass, per table
+        self.highlighted_cells = {}
+        self.input_errors = None
+        # Validation, store and journal passes over large inputs run here; see on_inputs_changed
+        self.input_pass = None
+        
+        # Undo history of the input tables; one entry per change-bus flush
+        self.history = History()
+        self.pending_command = None
+        
+        # Rows edited since the last flush per input section, None where the whole section changed
+        self.changed_rows = {}
+        # Cell text of the input tables as of the last flush; sections without edits are reused from it
+        self.flushed_columns = None
+        
+        # Filter boxes above the input tables, keyed like input_tables
+        self.table_filters = {}
+        
+        # Large sections of an opened scenario are kept as cell text until their table is shown
+        self.deferred_sections = {}
+        self.section_stacks = {}
+        for registry in (self.product_registry, self.resource_registry):
+            registry.add_listener(
+                lambda event, entity_id, name, registry=registry: self.on_deferred_names_changed(
+                    registry, event, entity_id, name
+                )
+            )
+        
+        # Every flushed edit is appended to a journal that survives a crash; see start_journal
+        self.journal = None
+        self.session_lock = None
+        self.session_path = None
         
         # Initialize UI components
         self.init_ui()
@@ -794,6 +1243,12 @@ class MainWindow(QMainWindow):
         # Initialize data
         self.current_result = None
         self.optimization_thread = None
+        self.sweep_thread = None
+        self.load_thread = None
+        self.export_threads = []
+        self.result_history = []
+        self.library = None
+        self.library_scenario_id = None
         
     def init_ui(self):
         # Create central widget and main layout
@@ -839,14 +1294,37 @@ class MainWindow(QMainWindow):
         self.load_button.clicked.connect(self.load_example)
         header_layout.addWidget(self.load_button)
         
+        self.open_button = ModernButton("Open")
+        self.open_button.clicked.connect(self.open_scenario)
+        header_layout.addWidget(self.open_button)
+        
+        self.library_button = ModernButton("Library")
+        self.library_button.clicked.connect(self.open_library)
+        header_layout.addWidget(self.library_button)
+        
         self.save_button = ModernButton("Save")
         self.save_button.clicked.connect(self.save_data)
         header_layout.addWidget(self.save_button)
         
+        self.undo_button = ModernButton("Undo")
+        self.undo_button.setShortcut(QKeySequence.Undo)
+        self.undo_button.clicked.connect(self.undo)
+        header_layout.addWidget(self.undo_button)
+        
+        self.redo_button = ModernButton("Redo")
+        self.redo_button.setShortcut(QKeySequence.Redo)
+        self.redo_button.clicked.connect(self.redo)
+        header_layout.addWidget(self.redo_button)
+        
         self.optimize_button = ModernButton("Optimize", primary=True)
         self.optimize_button.clicked.connect(self.run_optimization)
         header_layout.addWidget(self.optimize_button)
         
+        self.sweep_button = ModernButton("Sweep")
+        self.sweep_button.setToolTip("Solve the scenario over a range of capacities of one resource")
+        self.sweep_button.clicked.connect(self.run_sweep)
+        header_layout.addWidget(self.sweep_button)
+        
         if self.from_launcher:
           self.return_button = ModernButton("Return to Launcher")
           self.return_button.clicked.connect(self.return_to_launcher)
@@ -903,17 +1381,19 @@ class MainWindow(QMainWindow):
         products_layout.setContentsMargins(15, 25, 15, 15)
         products_layout.setSpacing(10)
         
-        self.products_table = ProductsTableWidget()
+        self.products_table = ProductsTableWidget(registry=self.product_registry)
+        products_layout.addWidget(self.add_filter_box("products", self.products_table))
         products_layout.addWidget(self.products_table)
         
         products_buttons_layout = QHBoxLayout()
         add_product_button = ModernButton("Add Product")
-        add_product_button.clicked.connect(self.products_table.add_empty_row)
+        add_product_button.clicked.connect(lambda: self.add_input_row("products"))
         products_buttons_layout.addWidget(add_product_button)
         
         remove_product_button = ModernButton("Remove Selected")
-        remove_product_button.clicked.connect(lambda: self.products_table.removeRow(self.products_table.currentRow()))
+        remove_product_button.clicked.connect(self.products_table.remove_current_row)
         products_buttons_layout.addWidget(remove_product_button)
+        products_buttons_layout.addWidget(self.add_import_button("products"))
         
         products_layout.addLayout(products_buttons_layout)
         top_layout.addWidget(products_group)
@@ -924,17 +1404,19 @@ class MainWindow(QMainWindow):
         resources_layout.setContentsMargins(15, 25, 15, 15)
         resources_layout.setSpacing(10)
         
-        self.resources_table = ResourcesTableWidget()
+        self.resources_table = ResourcesTableWidget(registry=self.resource_registry)
+        resources_layout.addWidget(self.add_filter_box("resources", self.resources_table))
         resources_layout.addWidget(self.resources_table)
         
         resources_buttons_layout = QHBoxLayout()
         add_resource_button = ModernButton("Add Resource")
-        add_resource_button.clicked.connect(self.resources_table.add_empty_row)
+        add_resource_button.clicked.connect(lambda: self.add_input_row("resources"))
         resources_buttons_layout.addWidget(add_resource_button)
         
         remove_resource_button = ModernButton("Remove Selected")
-        remove_resource_button.clicked.connect(lambda: self.resources_table.removeRow(self.resources_table.currentRow()))
+        remove_resource_button.clicked.connect(self.resources_table.remove_current_row)
         resources_buttons_layout.addWidget(remove_resource_button)
+        resources_buttons_layout.addWidget(self.add_import_button("resources"))
         
         resources_layout.addLayout(resources_buttons_layout)
         top_layout.addWidget(resources_group)
@@ -951,12 +1433,16 @@ class MainWindow(QMainWindow):
         resource_usage_layout.setContentsMargins(15, 25, 15, 15)
         resource_usage_layout.setSpacing(10)
         
-        self.resource_usage_table = ResourceUsageTableWidget()
-        resource_usage_layout.addWidget(self.resource_usage_table)
+        self.resource_usage_table = ResourceUsageTableWidget(
+            product_registry=self.product_registry,
+            resource_registry=self.resource_registry
+        )
+        resource_usage_layout.addWidget(self.add_filter_box("resource_usage", self.resource_usage_table))
+        resource_usage_layout.addWidget(self.add_section_stack("resource_usage", self.resource_usage_table))
         
         resource_usage_buttons_layout = QHBoxLayout()
         self.add_usage_button = ModernButton("Add Resource Usage")
-        self.add_usage_button.clicked.connect(self.resource_usage_table.add_empty_row)
+        self.add_usage_button.clicked.connect(lambda: self.add_input_row("resource_usage"))
         self.add_usage_button.setEnabled(False)  # Initially disabled
         resource_usage_buttons_layout.addWidget(self.add_usage_button)
         
@@ -965,6 +1451,12 @@ class MainWindow(QMainWindow):
         self.remove_usage_button.setEnabled(False)  # Initially disabled
         resource_usage_buttons_layout.addWidget(self.remove_usage_button)
         
+        self.matrix_usage_button = ModernButton("Edit as Matrix")
+        self.matrix_usage_button.clicked.connect(self.open_usage_matrix)
+        self.matrix_usage_button.setEnabled(False)  # Initially disabled
+        resource_usage_buttons_layout.addWidget(self.matrix_usage_button)
+        resource_usage_buttons_layout.addWidget(self.add_import_button("resource_usage"))
+        
         resource_usage_layout.addLayout(resource_usage_buttons_layout)
         middle_layout.addWidget(resource_usage_group)
         
@@ -985,11 +1477,11 @@ class MainWindow(QMainWindow):
         demand_constraints_label.setStyleSheet("color: #1e293b; font-weight: bold;")
         constraints_layout.addWidget(demand_constraints_label)
         
-        self.demand_constraints_table = DemandConstraintsTableWidget()
+        self.demand_constraints_table = DemandConstraintsTableWidget(registry=self.product_registry)
 
         # Add buttons for demand constraints with initial disabled state
         self.add_demand_button = ModernButton("Add Demand Constraint")
-        self.add_demand_button.clicked.connect(self.demand_constraints_table.add_empty_row)
+        self.add_demand_button.clicked.connect(lambda: self.add_input_row("demand_constraints"))
         self.add_demand_button.setEnabled(False)  # Initially disabled
         demand_buttons_layout = QHBoxLayout()
         demand_buttons_layout.addWidget(self.add_demand_button)
@@ -998,8 +1490,10 @@ class MainWindow(QMainWindow):
         self.remove_demand_button.clicked.connect(lambda: self.demand_constraints_table.removeRow(self.demand_constraints_table.currentRow()))
         self.remove_demand_button.setEnabled(False)  # Initially disabled
         demand_buttons_layout.addWidget(self.remove_demand_button)
+        demand_buttons_layout.addWidget(self.add_import_button("demand_constraints"))
 
-        constraints_layout.addWidget(self.demand_constraints_table)
+        constraints_layout.addWidget(self.add_filter_box("demand_constraints", self.demand_constraints_table))
+        constraints_layout.addWidget(self.add_section_stack("demand_constraints", self.demand_constraints_table))
         
         constraints_layout.addLayout(demand_buttons_layout)
         
@@ -1102,8 +1596,9 @@ class MainWindow(QMainWindow):
         production_chart_layout = QVBoxLayout(production_chart_group)
         production_chart_layout.setContentsMargins(15, 25, 15, 15)
         
-        self.production_chart = ProductionChart()
-        production_chart_layout.addWidget(self.production_chart)
+        # The charts are built when the Results tab is first shown, see ensure_charts
+        self.production_chart = None
+        self.production_chart_layout = production_chart_layout
         
         charts_layout.addWidget(production_chart_group)
         
@@ -1112,11 +1607,32 @@ class MainWindow(QMainWindow):
         resource_chart_layout = QVBoxLayout(resource_chart_group)
         resource_chart_layout.setContentsMargins(15, 25, 15, 15)
         
-        self.resource_chart = ResourceUsageChart()
-        resource_chart_layout.addWidget(self.resource_chart)
+        self.resource_chart = None
+        self.resource_chart_layout = resource_chart_layout
         
         charts_layout.addWidget(resource_chart_group)
         
+        # Objective of each run of the session, or of each run of a sweep
+        objective_chart_group = ModernGroupBox("Objective")
+        objective_chart_layout = QVBoxLayout(objective_chart_group)
+        objective_chart_layout.setContentsMargins(15, 25, 15, 15)
+        
+        self.objective_chart = None
+        self.objective_chart_layout = objective_chart_layout
+        self.live_feed = None
+        
+        charts_layout.addWidget(objective_chart_group)
+        
+        # Capacity each product consumes of each resource
+        usage_chart_group = ModernGroupBox("Capacity Consumed")
+        usage_chart_layout = QVBoxLayout(usage_chart_group)
+        usage_chart_layout.setContentsMargins(15, 25, 15, 15)
+        
+        self.usage_chart = None
+        self.usage_chart_layout = usage_chart_layout
+        
+        charts_layout.addWidget(usage_chart_group)
+        
         results_splitter.addWidget(charts_widget)
         
         # Detailed results section
@@ -1128,16 +1644,40 @@ class MainWindow(QMainWindow):
         details_group_layout = QVBoxLayout(details_group)
         details_group_layout.setContentsMargins(15, 25, 15, 15)
         
-        self.results_text = QTextEdit()
-        self.results_text.setReadOnly(True)
-        StyleHelper.style_text_edit(self.results_text)
-        details_group_layout.addWidget(self.results_text)
+        # The result as a tree expanded on demand; the raw JSON is only made when its tab is opened
+        self.result_view = ResultView()
+        StyleHelper.style_text_edit(self.result_view.raw_text)
+        details_group_layout.addWidget(self.result_view)
+        
+        export_buttons_layout = QHBoxLayout()
+        self.export_buttons = {}
+        for key, text in (("production_plan", "Export Production Plan"), ("resource_utilization", "Export Resource Utilization")):
+            button = ModernButton(text)
+            button.clicked.connect(lambda checked, key=key: self.export_result_csv(key))
+            button.setEnabled(False)  # Initially disabled
+            export_buttons_layout.addWidget(button)
+            self.export_buttons[key] = button
+        export_buttons_layout.addStretch()
+        
+        self.export_results_button = ModernButton("Export Results")
+        self.export_results_button.clicked.connect(lambda: self.export_results(self.result_history[-1:]))
+        self.export_results_button.setEnabled(False)  # Initially disabled
+        export_buttons_layout.addWidget(self.export_results_button)
+        
+        self.export_session_button = ModernButton("Export Session")
+        self.export_session_button.setToolTip("Export every result of this session")
+        self.export_session_button.clicked.connect(lambda: self.export_results(list(self.result_history)))
+        self.export_session_button.setEnabled(False)  # Initially disabled
+        export_buttons_layout.addWidget(self.export_session_button)
+        details_group_layout.addLayout(export_buttons_layout)
         
         details_layout.addWidget(details_group)
         results_splitter.addWidget(details_widget)
         
         results_layout.addWidget(results_splitter)
+        self.results_splitter = results_splitter
         self.tab_widget.addTab(results_tab, "Results")
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         
         main_layout.addWidget(self.tab_widget)
         
@@ -1152,11 +1692,43 @@ class MainWindow(QMainWindow):
         """)
         
         # Connect signals for updating resource usage table
-        self.products_table.product_changed.connect(self.update_resource_usage_dropdowns)
-        self.resources_table.resource_changed.connect(self.update_resource_usage_dropdowns)
+        self.products_table.product_changed.connect(lambda: self.change_bus.mark("products"))
+        self.resources_table.resource_changed.connect(lambda: self.change_bus.mark("resources"))
+        self.change_bus.subscribe("products", self.update_resource_usage_dropdowns)
+        self.change_bus.subscribe("resources", self.update_resource_usage_dropdowns)
         
         # Connect demand constraints table to check for optimizer type
-        self.demand_constraints_table.itemChanged.connect(self.check_optimizer_type)
+        self.change_bus.subscribe("demand", self.check_optimizer_type)
+        
+        # Paste tab- or comma-separated rows from the clipboard into any input table
+        for key, table in self.input_tables().items():
+            add_paste_action(table, lambda text, table=table, key=key: self.paste_rows(table, key, text))
+        
+        # Validate and record an undo step once per flush instead of once per edited cell
+        for key, table in self.input_tables().items():
+            table.itemChanged.connect(lambda item, key=key: self.mark_changed(key, item.row()))
+            # Added and removed rows change the model without an itemChanged
+            table.model().rowsInserted.connect(lambda *args, key=key: self.mark_changed(key))
+            table.model().rowsRemoved.connect(lambda *args, key=key: self.mark_changed(key))
+            self.change_bus.subscribe(SECTION_TOPICS[key], self.on_inputs_changed)
+        
+        self.history_label = QLabel("")
+        self.statusBar().addPermanentWidget(self.history_label)
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.hide()
+        self.statusBar().addPermanentWidget(self.load_progress)
+        self.history.record("Initial state", self.input_columns())
+        self.update_history_status()
+        
+        # Settings are journaled as they change; lines written since the last fsync are synced on a timer
+        self.objective_combo.currentIndexChanged.connect(lambda index: self.on_settings_changed())
+        self.min_total_spin.valueChanged.connect(lambda value: self.on_settings_changed())
+        self.max_total_spin.valueChanged.connect(lambda value: self.on_settings_changed())
+        self.journal_timer = QTimer(self)
+        self.journal_timer.timeout.connect(self.sync_journal)
+        self.journal_timer.start(int(SYNC_INTERVAL * 1000))
+        QTimer.singleShot(0, self.start_journal)
         
         # Fetch available optimizers
         self.fetch_optimizers()
@@ -1176,21 +1748,14 @@ class MainWindow(QMainWindow):
           print(f"Error returning to launcher: {e}")
 
     def update_resource_usage_dropdowns(self):
-        """Update the resource usage and demand constraints tables with current product and resource names"""
-        product_names = self.products_table.get_product_names()
-        resource_names = self.resources_table.get_resource_names()
-        
-        # Update resource usage table
-        self.resource_usage_table.update_product_names(product_names)
-        self.resource_usage_table.update_resource_names(resource_names)
+        """Enable the resource usage and demand constraints tables once products and resources exist"""
+        # The dropdowns themselves follow the name registries
         
         # Enable/disable the resource usage table and buttons based on available products and resources
         resource_usage_enabled = self.resource_usage_table.check_enable_state()
         self.add_usage_button.setEnabled(resource_usage_enabled)
         self.remove_usage_button.setEnabled(resource_usage_enabled)
-        
-        # Update demand constraints table
-        self.demand_constraints_table.update_product_names(product_names)
+        self.matrix_usage_button.setEnabled(resource_usage_enabled)
         
         # Enable/disable the demand constraints table and buttons based on available products
         demand_constraints_enabled = self.demand_constraints_table.check_enable_state()
@@ -1202,6 +1767,444 @@ class MainWindow(QMainWindow):
         if demand_constraints_enabled:
             self.statusBar().showMessage("Demand constraints table enabled", 3000)
         
+    def paste_rows(self, table, key, text):
+        """Append clipboard rows to a table in one bulk pass and one change notification"""
+        if key in self.deferred_sections:
+            self.show_section(key, lambda: self.paste_rows(table, key, text))
+            return
+        start = time.perf_counter()
+        columns = parse_delimited(text, table.columnCount(), table.numeric_columns)
+        row_count = len(columns[0])
+        if not row_count:
+            self.statusBar().showMessage("Nothing to paste", 3000)
+            return
+        with bulk_update(table):
+            table.append_rows(columns)
+        self.pending_command = f"Paste {row_count} rows"
+        self.mark_changed(key)
+        self.statusBar().showMessage(f"Pasted {row_count} rows in {time.perf_counter() - start:.2f} s", 5000)
+        
+    def add_filter_box(self, key, table):
+        """Create the filter box shown above one input table"""
+        filter_box = TableFilterBox(table, table.name_columns, table.numeric_columns)
+        filter_box.setStyleSheet("""
+            QLineEdit {
+                background-color: #ffffff;
+                border: 1px solid #e2e8f0;
+                border-radius: 6px;
+                padding: 6px;
+            }
+            QLineEdit:focus {
+                border: 1px solid #3b82f6;
+            }
+        """)
+        filter_box.filtered.connect(
+            lambda shown, total, title=TABLE_TITLES[key]: self.statusBar().showMessage(
+                f"{title}: showing {shown} of {total} rows", 3000
+            )
+        )
+        self.table_filters[key] = filter_box
+        return filter_box
+        
+    def add_import_button(self, key):
+        """Create the button that replaces one input table with rows from a CSV file"""
+        button = ModernButton("Import CSV")
+        button.setToolTip(f"Replace the {TABLE_TITLES[key].lower()} with rows from a CSV or tab-separated file")
+        button.clicked.connect(lambda: self.import_csv(key))
+        return button
+        
+    def add_section_stack(self, key, table):
+        """Stack a table with the placeholder shown instead while its rows are deferred"""
+        stack = QStackedWidget()
+        stack.addWidget(table)
+        placeholder = QWidget()
+        placeholder_layout = QVBoxLayout(placeholder)
+        placeholder_layout.addStretch()
+        label = QLabel("")
+        label.setAlignment(Qt.AlignCenter)
+        label.setStyleSheet("color: #64748b;")
+        placeholder_layout.addWidget(label)
+        show_button = ModernButton("Show Rows")
+        show_button.clicked.connect(lambda: self.show_section(key))
+        placeholder_layout.addWidget(show_button, 0, Qt.AlignCenter)
+        placeholder_layout.addStretch()
+        stack.addWidget(placeholder)
+        self.section_stacks[key] = (stack, label)
+        return stack
+        
+    def update_section_placeholder(self, key):
+        """Show the table of a section, or its placeholder with the row count while the rows are deferred"""
+        stack, label = self.section_stacks[key]
+        section = self.deferred_sections.get(key)
+        if section is not None:
+            label.setText(f"{section.row_count:,} {TABLE_TITLES[key].lower()} rows are loaded but not shown yet")
+        stack.setCurrentIndex(0 if section is None else 1)
+        self.table_filters[key].setEnabled(section is None)
+        
+    def section_row_count(self, key):
+        """Rows of a section, deferred or in its table"""
+        section = self.deferred_sections.get(key)
+        return section.row_count if section is not None else self.input_tables()[key].rowCount()
+        
+    def section_registries(self, key):
+        """The registry each name column of a section refers to"""
+        if key == "resource_usage":
+            return {0: self.product_registry, 1: self.resource_registry}
+        if key == "demand_constraints":
+            return {0: self.product_registry}
+        return {}
+        
+    def fill_section(self, key, columns, lazy=True):
+        """Replace the rows of a section; unless lazy is False, large lazy sections are kept as cell text"""
+        table = self.input_tables()[key]
+        with bulk_update(table):
+            if lazy and key in LAZY_SECTIONS and columns and len(columns[0]) > LAZY_SECTION_ROWS:
+                table.setRowCount(0)
+                self.deferred_sections[key] = DeferredSection(columns, self.section_registries(key))
+            else:
+                self.deferred_sections.pop(key, None)
+                table.replace_rows(columns)
+        if key in self.section_stacks:
+            self.update_section_placeholder(key)
+        
+    def on_deferred_names_changed(self, registry, event, entity_id, name):
+        """Apply a product or resource change to the deferred sections naming it"""
+        if event == "added":
+            return
+        for key, section in self.deferred_sections.items():
+            if registry in section.registries.values():
+                section.apply(registry, event, entity_id, name)
+                self.update_section_placeholder(key)
+                
+    def show_section(self, key, then=None):
+        """Fill the table of a deferred section on a worker thread, then call then"""
+        section = self.deferred_sections.get(key)
+        if section is None:
+            if then is not None:
+                then()
+            return
+        description = f"{section.row_count:,} {TABLE_TITLES[key].lower()} rows"
+        command = f"Show {TABLE_TITLES[key].lower()}"
+        thread = SectionFillThread(key, section.columns)
+        if self.start_load(thread, description, (key,)):
+            thread.loaded.connect(lambda _: self.finish_showing_section(description, command, then))
+            thread.start()
+            
+    def finish_showing_section(self, description, command, then):
+        self.finish_loading(description, command=command)
+        if then is not None:
+            then()
+        
+    def add_input_row(self, key):
+        """Add an empty row to an input table, clearing its filter so the new row is visible"""
+        if key in self.deferred_sections:
+            self.show_section(key, lambda: self.add_input_row(key))
+            return
+        self.table_filters[key].clear()
+        self.input_tables()[key].add_empty_row()
+        
+    def input_tables(self):
+        """The input tables keyed like the scenario sections they hold"""
+        return {
+            "products": self.products_table,
+            "resources": self.resources_table,
+            "resource_usage": self.resource_usage_table,
+            "demand_constraints": self.demand_constraints_table
+        }
+        
+    def input_columns(self):
+        """Read the cell text of every input table, column by column, deferred sections included"""
+        return {
+            key: self.deferred_sections[key].columns if key in self.deferred_sections
+            else [column_texts(table, column) for column in range(table.columnCount())]
+            for key, table in self.input_tables().items()
+        }
+        
+    def mark_changed(self, key, row=None):
+        """Note an edited row of an input section, or the whole section when row is None, for the next flush"""
+        if row is None:
+            self.changed_rows[key] = None
+        elif self.changed_rows.get(key, ()) is not None:
+            self.changed_rows.setdefault(key, set()).add(row)
+        self.change_bus.mark(SECTION_TOPICS[key])
+        
+    def changed_input_columns(self):
+        """Bring the input columns up to date with the edits noted since the last flush
+
+        Returns the columns of every section and the sections that need
+        checking again: those whose text changed and those referring to
+        products or resources whose names changed. Only edited rows are
+        read back from the tables, and columns without a change stay the
+        same lists, so an edit costs its own rows rather than the scenario.
+        """
+        previous, changed_rows, self.changed_rows = self.flushed_columns, self.changed_rows, {}
+        columns = {}
+        for key, table in self.input_tables().items():
+            if key in self.deferred_sections:
+                columns[key] = self.deferred_sections[key].columns
+                continue
+            old = previous[key] if previous is not None else None
+            rows = changed_rows.get(key, ())
+            if old is None or rows is None or not old or len(old[0]) != table.rowCount():
+                new = [column_texts(table, column) for column in range(table.columnCount())]
+                # Unchanged columns of a re-read section still count as unchanged
+                if old is not None and len(old) == len(new):
+                    new = [old_cells if old_cells == cells else cells for old_cells, cells in zip(old, new)]
+            else:
+                new = list(old)
+                for row in rows:
+                    for column, cells in enumerate(new):
+                        item = table.item(row, column)
+                        text = item.text() if item else ""
+                        if text != cells[row]:
+                            if cells is old[column]:
+                                cells = new[column] = list(cells)
+                            cells[row] = text
+            columns[key] = old if old is not None and all(a is b for a, b in zip(new, old)) else new
+        self.flushed_columns = columns
+        
+        if previous is None:
+            return columns, set(columns)
+        sections = {key for key in columns if columns[key] is not previous[key]}
+        for key, sources in REFERENCED_SECTIONS.items():
+            if any(columns[source][0] is not previous[source][0] for source in sources):
+                sections.add(key)
+        return columns, sections
+        
+    def on_inputs_changed(self):
+        """Validate the tables, refresh the model store and record the change as one undo step
+
+        Only the sections changed_input_columns reports are checked,
+        stored and journaled again. Past INPUT_PASS_ROWS rows those passes
+        run on an InputPassThread, so a large scenario can be worked with
+        while they finish.
+        """
+        self.finish_input_pass()
+        columns, sections = self.changed_input_columns()
+        changed = {key: columns[key] for key in sections}
+        for key, filter_box in self.table_filters.items():
+            if key in changed:
+                filter_box.set_columns(changed[key])
+        if self.history.record(self.pending_command or "Edit", changed):
+            # Later results are no longer solved on the library scenario the tables came from
+            self.library_scenario_id = None
+        self.pending_command = None
+        self.update_history_status()
+        if not changed:
+            return
+        
+        if sum(len(table_columns[0]) for table_columns in columns.values() if table_columns) > INPUT_PASS_ROWS:
+            thread = InputPassThread(columns, sections, self.input_errors, self.store, self.journal,
+                                     self.input_settings())
+            thread.finished.connect(lambda: self.finish_input_pass(thread))
+            self.input_pass = thread
+            thread.start()
+            return
+        self.show_validation(validate_scenario(*[columns[key] for key in SECTIONS], self.input_errors, sections))
+        self.store.load_table_text(changed)
+        self.record_journal(changed)
+        
+    def finish_input_pass(self, thread=None):
+        """Wait for the running input pass, or only for thread if given, and show what it found"""
+        if self.input_pass is None or (thread is not None and thread is not self.input_pass):
+            return
+        thread = self.input_pass
+        thread.wait()
+        self.input_pass = None
+        if thread.journal_error is not None:
+            self.journal = None
+            self.statusBar().showMessage(f"Autosave stopped: {thread.journal_error}", 10000)
+        if thread.error is not None:
+            # The store may be half updated; the next flush reads and stores everything again
+            self.flushed_columns = None
+            self.statusBar().showMessage(f"Checking the inputs failed: {thread.error}", 10000)
+        else:
+            self.show_validation(thread.report)
+        
+    def start_journal(self):
+        """Offer to recover the edits of a session that did not close cleanly, then start journaling
+
+        Each window journals into its own session under AUTOSAVE_DIR and
+        holds its lock while open, so the sessions of windows still running
+        are never offered. Of the sessions left behind, the latest with
+        edits is offered; older ones wait for the next start.
+        """
+        try:
+            self.session_lock, self.session_path = lock_autosave_session(AUTOSAVE_DIR)
+            offered = False
+            for lock, path in abandoned_autosave_sessions(AUTOSAVE_DIR):
+                journal = EditJournal(path)
+                recovered = journal.recover() if journal.recoverable() else None
+                if recovered is not None and any(columns and columns[0] for columns in recovered[0].values()):
+                    if offered:
+                        lock.unlock()
+                        continue
+                    offered = True
+                    tables, settings = recovered
+                    answer = QMessageBox.question(
+                        self, "Recover Edits", "The last session did not close cleanly. Recover its unsaved edits?"
+                    )
+                    if answer == QMessageBox.Yes:
+                        self.recover_journal(tables, settings)
+                remove_autosave_session(lock, path)
+            self.finish_input_pass()
+            self.journal = EditJournal(self.session_path)
+            self.journal.start(self.input_columns(), self.input_settings())
+        except OSError as e:
+            self.journal = None
+            self.statusBar().showMessage(f"Autosave is off: {e}", 10000)
+        
+    def recover_journal(self, tables, settings):
+        """Fill the input tables with the cell text replayed from the journal as one undo step"""
+        with bulk_update(*self.input_tables().values()):
+            for key, table in self.input_tables().items():
+                columns = tables.get(key)
+                if columns and len(columns) == table.columnCount():
+                    self.fill_section(key, columns)
+        self.set_input_settings(settings)
+        self.update_resource_usage_dropdowns()
+        self.pending_command = "Recover edits"
+        for key in self.input_tables():
+            self.mark_changed(key)
+        self.change_bus.flush()
+        
+    def on_settings_changed(self):
+        """Journal a changed objective or total constraint, which also leaves the library scenario behind"""
+        self.library_scenario_id = None
+        self.record_journal()
+        
+    def record_journal(self, columns=None):
+        """Append the changes since the last call to the autosave journal"""
+        self.finish_input_pass()
+        if self.journal is None:
+            return
+        try:
+            self.journal.record(columns, self.input_settings())
+        except OSError as e:
+            self.journal = None
+            self.statusBar().showMessage(f"Autosave stopped: {e}", 10000)
+        
+    def sync_journal(self):
+        # A running input pass has the journal; the next timeout syncs it
+        if self.journal is None or self.input_pass is not None:
+            return
+        try:
+            self.journal.sync()
+        except OSError as e:
+            self.journal = None
+            self.statusBar().showMessage(f"Autosave stopped: {e}", 10000)
+        
+    def undo(self):
+        """Restore the input tables as they were before the last command"""
+        self.restore_history(self.history.undo)
+        
+    def redo(self):
+        """Re-apply the last undone command"""
+        self.restore_history(self.history.redo)
+        
+    def restore_history(self, step):
+        """Move through the history with step and show the resulting snapshot"""
+        # Record edits still waiting for a flush before moving through the history
+        if self.change_bus.pending:
+            self.change_bus.flush()
+        before = self.history.current
+        snapshot = step()
+        if snapshot is None:
+            return
+        self.library_scenario_id = None
+        
+        tables = self.input_tables()
+        # Sections already shown stay shown
+        deferred = set(self.deferred_sections)
+        with bulk_update(*tables.values()):
+            # Names that stay keep their ids, so only sections that differ are refilled
+            for key, table in tables.items():
+                old, new = before.tables[key], snapshot.tables[key]
+                if old is new or (key not in self.deferred_sections and patch_numeric_cells(table, old, new)):
+                    continue
+                self.fill_section(key, expand(new), lazy=key in deferred)
+        
+        # The flush revalidates and refreshes dependent views; the state equals the snapshot so nothing new is recorded
+        for key in tables:
+            self.mark_changed(key)
+        self.update_history_status()
+        
+    def update_history_status(self):
+        """Refresh the undo/redo buttons and the history memory shown in the status bar"""
+        undo_label = self.history.undo_label()
+        redo_label = self.history.redo_label()
+        self.undo_button.setEnabled(undo_label is not None)
+        self.undo_button.setToolTip(f"Undo {undo_label}" if undo_label else "")
+        self.redo_button.setEnabled(redo_label is not None)
+        self.redo_button.setToolTip(f"Redo {redo_label}" if redo_label else "")
+        self.history_label.setText(
+            f"History: {len(self.history)} steps, "
+            f"{self.history.memory_bytes / 1048576:.1f} of {self.history.max_bytes / 1048576:.0f} MB"
+        )
+        
+    def validate_input_tables(self, columns=None):
+        """Check all input tables at once, highlight the bad cells and summarize in the status bar"""
+        self.finish_input_pass()
+        if columns is None:
+            columns = self.input_columns()
+        return self.show_validation(validate_scenario(*[columns[key] for key in SECTIONS]))
+        
+    def show_validation(self, report):
+        """Highlight the cells a validation report flags and summarize it in the status bar"""
+        tables = self.input_tables()
+        error_color = QColor(StyleHelper.get_error_color())
+        error_color.setAlpha(60)
+        for key, table in tables.items():
+            cells = report.for_table(key)
+            if key in self.deferred_sections:
+                # Highlighted once the rows are shown
+                self.highlighted_cells[key] = {}
+                continue
+            with bulk_update(table):
+                # Only cells highlighted last time need resetting
+                for row, column in self.highlighted_cells.get(key, {}).keys() - cells.keys():
+                    item = table.item(row, column)
+                    if item:
+                        item.setData(Qt.BackgroundRole, None)
+                        item.setToolTip("")
+                for (row, column), message in cells.items():
+                    item = table.item(row, column)
+                    if item is None:
+                        item = QTableWidgetItem("")
+                        table.setItem(row, column, item)
+                    item.setBackground(error_color)
+                    item.setToolTip(message)
+            table.viewport().update()
+            self.highlighted_cells[key] = cells
+            
+        if report:
+            self.statusBar().showMessage(report.summary())
+        elif self.input_errors:
+            self.statusBar().showMessage("All input problems resolved", 3000)
+        self.input_errors = report
+        return report
+        
+    def open_usage_matrix(self):
+        """Edit resource usage as a product x resource grid"""
+        if "resource_usage" in self.deferred_sections:
+            self.show_section("resource_usage", self.open_usage_matrix)
+            return
+        if self.validate_input_tables().for_table("resource_usage"):
+            QMessageBox.warning(self, "Validation Error",
+                                "Fix the highlighted resource usage cells before editing them as a matrix.")
+            return
+        matrix = UsageMatrix.from_resource_usage(
+            self.resource_usage_table.get_resource_usage_data(),
+            self.products_table.get_product_names(),
+            self.resources_table.get_resource_names()
+        )
+        dialog = UsageMatrixDialog(matrix, self)
+        if dialog.exec() == QDialog.Accepted:
+            self.resource_usage_table.set_resource_usage_data(dialog.matrix().to_resource_usage())
+            self.pending_command = "Edit usage matrix"
+            self.mark_changed("resource_usage")
+            self.statusBar().showMessage(f"Updated {dialog.matrix().nnz} resource usage entries", 3000)
+        
     def fetch_optimizers(self):
         """Fetch available optimizers from the API"""
         try:
@@ -1223,8 +2226,8 @@ class MainWindow(QMainWindow):
             
     def check_optimizer_type(self, item=None):
         """Check if demand constraints are defined and switch optimizer type if needed"""
-        demand_constraints = self.demand_constraints_table.get_demand_constraints_data()
-        if demand_constraints:
+        # Only the product column matters here, so cells awaiting validation are not parsed
+        if any(column_texts(self.demand_constraints_table, 0)):
             # Switch to demand-constrained-production
             index = self.optimizer_combo.findText("demand-constrained-production")
             if index >= 0 and self.optimizer_combo.currentText() == "basic-production":
@@ -1233,53 +2236,77 @@ class MainWindow(QMainWindow):
             
     def get_input_data(self):
         """Collect all input data from UI components"""
+        # Bring the model store up to date with edits still waiting for a flush
+        if self.change_bus.pending:
+            self.change_bus.flush()
+        self.finish_input_pass()
+            
+        settings = self.input_settings()
         data = {
-            "objective": self.objective_combo.currentText(),
-            "products": self.products_table.get_products_data(),
-            "resources": self.resources_table.get_resources_data(),
-            "resource_usage": self.resource_usage_table.get_resource_usage_data()
+            "objective": settings["objective"],
+            "products": self.store.products_data(),
+            "resources": self.store.resources_data(),
+            "resource_usage": self.store.resource_usage_data()
         }
         
         # Add demand constraints if any
-        demand_constraints = self.demand_constraints_table.get_demand_constraints_data()
+        demand_constraints = self.store.demand_constraints_data()
         if demand_constraints:
             data["demand_constraints"] = demand_constraints
             
+        if "total_constraints" in settings:
+            data["total_constraints"] = settings["total_constraints"]
+                
+        return data
+        
+    def input_settings(self):
+        """Collect the objective and any total constraints"""
+        settings = {"objective": self.objective_combo.currentText()}
+        
         # Add total constraints if any
         min_total = self.min_total_spin.value() if self.min_total_spin.value() > 0 else None
         max_total = self.max_total_spin.value() if self.max_total_spin.value() > 0 else None
         
         if min_total is not None or max_total is not None:
-            data["total_constraints"] = {}
+            settings["total_constraints"] = {}
             if min_total is not None:
-                data["total_constraints"]["min_total"] = min_total
+                settings["total_constraints"]["min_total"] = min_total
             if max_total is not None:
-                data["total_constraints"]["max_total"] = max_total
+                settings["total_constraints"]["max_total"] = max_total
                 
-        return data
+        return settings
         
     def set_input_data(self, data):
         """Set input data to UI components"""
-        # Set objective
-        index = self.objective_combo.findText(data.get("objective", "maximize_profit"))
-        if index >= 0:
-            self.objective_combo.setCurrentIndex(index)
+        self.set_input_settings(data)
             
-        # Set products
-        self.products_table.set_products_data(data.get("products", []))
-        
-        # Set resources
-        self.resources_table.set_resources_data(data.get("resources", []))
-        
-        # Update resource usage dropdowns before setting data
+        # Fill every table in one pass; dependent views are refreshed once afterwards
+        tables = (self.products_table, self.resources_table,
+                  self.resource_usage_table, self.demand_constraints_table)
+        with bulk_update(*tables):
+            self.products_table.set_products_data(data.get("products", []))
+            self.resources_table.set_resources_data(data.get("resources", []))
+            self.resource_usage_table.set_resource_usage_data(data.get("resource_usage", []))
+            self.demand_constraints_table.set_demand_constraints_data(data.get("demand_constraints", []))
+        
+        # Enable the resource usage and demand tables
         self.update_resource_usage_dropdowns()
+            
+        # Check if we need to switch optimizer type
+        self.check_optimizer_type(None)
         
-        # Set resource usage
-        self.resource_usage_table.set_resource_usage_data(data.get("resource_usage", []))
+        # The whole load is a single undo step
+        self.pending_command = "Load scenario"
+        for key in self.input_tables():
+            self.mark_changed(key)
+        self.on_inputs_changed()
         
-        # Update demand constraints dropdowns before setting data
-        self.demand_constraints_table.update_product_names(self.products_table.get_product_names())
-        self.demand_constraints_table.set_demand_constraints_data(data.get("demand_constraints", []))
+    def set_input_settings(self, data):
+        """Set the objective and total constraints of a scenario"""
+        # Set objective
+        index = self.objective_combo.findText(data.get("objective", "maximize_profit"))
+        if index >= 0:
+            self.objective_combo.setCurrentIndex(index)
         
         # Set total constraints
         total_constraints = data.get("total_constraints", {})
@@ -1296,67 +2323,348 @@ class MainWindow(QMainWindow):
         else:
             self.max_total_spin.setValue(0)
             
-        # Check if we need to switch optimizer type
-        self.check_optimizer_type(None)
-            
     def load_example(self):
         """Load example data"""
         options = ["Demand Constrained"]
         selected, ok = QInputDialog.getItem(self, "Select Example", 
                                           "Choose an example:", options, 0, False)
         if ok and selected:
-            try:
-                with open("example_demand_constrained.json", "r") as f:
-                    data = json.load(f)
-                        
-                self.set_input_data(data)
-                self.statusBar().showMessage(f"Loaded {selected} example")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Failed to load example: {str(e)}")
+            self.load_scenario_file(os.path.join(EXAMPLES_DIR, "example_demand_constrained.json"), f"{selected} example")
+            
+    def open_scenario(self):
+        """Load a scenario file chosen by the user"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Open Data", "",
+            f"Scenario Files (*.json *{BINARY_SUFFIX} *.mps *.mps.gz);;JSON Files (*.json);;"
+            f"Binary Scenarios (*{BINARY_SUFFIX});;MPS Models (*.mps *.mps.gz)"
+        )
+        if file_path:
+            self.load_scenario_file(file_path, os.path.basename(file_path))
+            
+    def load_scenario_file(self, file_path, description):
+        """Stream a scenario file into the tables on a worker thread, reporting progress"""
+        thread = ScenarioLoadThread(file_path)
+        if self.start_load(thread, description, SECTIONS):
+            self.library_scenario_id = None
+            thread.loaded.connect(lambda settings: self.finish_loading(description, settings))
+            thread.error_occurred.connect(lambda message: self.finish_loading(description, error=message))
+            thread.start()
+            
+    def open_library(self):
+        """Search the scenario library and open the scenario picked there"""
+        try:
+            if self.library is None:
+                self.library = ScenarioLibrary(LIBRARY_PATH)
+            dialog = LibraryDialog(self.library, self.save_to_library, self)
+        except sqlite3.Error as e:
+            QMessageBox.warning(self, "Error", f"Failed to open the library: {str(e)}")
+            return
+        if dialog.exec() == QDialog.Accepted and dialog.selected_id is not None:
+            scenario_id = dialog.selected_id
+            description = f"{dialog.selected_name} from the library"
+            thread = LibraryLoadThread(LIBRARY_PATH, scenario_id)
+            if self.start_load(thread, description, SECTIONS):
+                self.library_scenario_id = None
+                thread.loaded.connect(lambda settings: self.finish_library_load(description, scenario_id, settings))
+                thread.error_occurred.connect(lambda message: self.finish_loading(description, error=message))
+                thread.start()
+                
+    def finish_library_load(self, description, scenario_id, settings):
+        """Finish loading a library scenario; later results are stored with it"""
+        self.finish_loading(description, settings)
+        self.library_scenario_id = scenario_id
+        
+    def save_to_library(self, name, tags):
+        """Add the scenario in the tables to the library; later results are stored with it"""
+        if self.change_bus.pending:
+            self.change_bus.flush()
+        self.finish_input_pass()
+        try:
+            self.library_scenario_id = self.library.add_store(name, self.store, self.input_settings(), tags)
+            self.statusBar().showMessage(f"Saved {name} to the library", 5000)
+        except sqlite3.Error as e:
+            QMessageBox.warning(self, "Error", f"Failed to save to the library: {str(e)}")
+            
+    def import_csv(self, key):
+        """Replace one input table with the rows of a CSV file chosen by the user"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, f"Import {TABLE_TITLES[key]}", "", "CSV Files (*.csv *.tsv *.txt);;All Files (*)"
+        )
+        if not file_path:
+            return
+        table = self.input_tables()[key]
+        description = os.path.basename(file_path)
+        command = f"Import {TABLE_TITLES[key].lower()}"
+        thread = CsvImportThread(file_path, key, table.columnCount(), table.numeric_columns)
+        if self.start_load(thread, description, (key,)):
+            thread.loaded.connect(lambda _: self.finish_loading(description, command=command))
+            thread.error_occurred.connect(lambda message: self.finish_loading(description, error=message, command=command))
+            thread.start()
+            
+    def start_load(self, thread, description, sections):
+        """Clear the tables of sections and stream the rows of a load thread into them
+
+        Returns False, without starting anything, while another load runs
+        or if the file is missing; otherwise the caller connects the
+        thread's loaded and error_occurred signals and starts it.
+        """
+        if self.load_thread is not None:
+            return False
+        if thread.file_path is not None and not os.path.isfile(thread.file_path):
+            QMessageBox.warning(self, "Error", f"Failed to load {description}: {thread.file_path} not found")
+            return False
+        
+        # Flushes wait until the whole file is in, so validation and history run once
+        self.change_bus.hold()
+        tables = [self.input_tables()[section] for section in sections]
+        self.replaced_tables = []
+        with bulk_update(*tables):
+            # Referring sections are emptied first, so dropping names leaves no rows of theirs to prune
+            for section, table in reversed(list(zip(sections, tables))):
+                if any(section in names and key not in sections for key, names in REFERENCED_SECTIONS.items()):
+                    # Rows elsewhere refer to these names, so the names that come back keep their ids
+                    table.begin_replace()
+                    self.replaced_tables.append(table)
+                else:
+                    self.fill_section(section, [[] for _ in range(table.columnCount())])
+        self.load_sections = []
+        self.set_loading(True)
+        self.statusBar().showMessage(f"Loading {description}...")
+        self.load_started = time.perf_counter()
+        
+        self.load_thread = thread
+        thread.counts_ready.connect(lambda counts: self.show_load_counts(description, counts))
+        thread.rows_ready.connect(self.add_loaded_rows)
+        thread.progress.connect(self.load_progress.setValue)
+        return True
+        
+    def set_loading(self, loading):
+        """Lock the inputs and commands that would race a running load"""
+        self.tab_widget.widget(0).setEnabled(not loading)
+        for button in (self.load_button, self.open_button, self.library_button, self.save_button, self.optimize_button,
+                       self.sweep_button):
+            button.setEnabled(not loading)
+        if loading:
+            self.undo_button.setEnabled(False)
+            self.redo_button.setEnabled(False)
+            self.load_progress.setValue(0)
+        self.load_progress.setVisible(loading)
+        
+    def show_load_counts(self, description, counts):
+        """Show the size of every section of a load as soon as the file header is read"""
+        self.statusBar().showMessage(f"Loading {description}: " + ", ".join(
+            f"{counts[key]:,} {TABLE_TITLES[key].lower()} rows" for key in SECTIONS
+        ) + "...")
+        for key, (stack, label) in self.section_stacks.items():
+            if counts[key] > LAZY_SECTION_ROWS:
+                # The section will wait for Show Rows; say so before its text is read
+                label.setText(f"{counts[key]:,} {TABLE_TITLES[key].lower()} rows are loading")
+                stack.setCurrentIndex(1)
+        
+    def add_loaded_rows(self, section, columns):
+        """Append one batch from the load thread and let it read the next"""
+        table = self.input_tables()[section]
+        with bulk_update(table):
+            table.append_rows(columns)
+        if section not in self.load_sections:
+            self.load_sections.append(section)
+        self.load_thread.batch_slots.release()
+        
+    def finish_loading(self, description, settings=None, error=None, command="Load scenario"):
+        """Wrap up a scenario load or table import; the loaded rows become one undo step"""
+        self.load_thread.wait()
+        warnings = self.load_thread.warnings
+        deferred = self.load_thread.deferred
+        self.load_thread = None
+        
+        # Names missing from a replaced table are dropped with the rows of other sections naming them
+        before = {key: self.section_row_count(key) for key in REFERENCED_SECTIONS}
+        for table in self.replaced_tables:
+            table.end_replace()
+        self.replaced_tables = []
+        dropped = sum(before[key] - self.section_row_count(key) for key in REFERENCED_SECTIONS)
+        
+        # Names are resolved as rows arrive, so rows listed before their products or resources need another pass
+        tables = self.input_tables()
+        for key, depends_on in REFERENCED_SECTIONS.items():
+            if key in self.load_sections and any(
+                section in self.load_sections[self.load_sections.index(key):] for section in depends_on
+            ):
+                table = tables[key]
+                with bulk_update(table):
+                    table.replace_rows([column_texts(table, column) for column in range(table.columnCount())])
+        # Collected sections arrive once every name is registered
+        for section, columns in deferred.items():
+            self.fill_section(section, columns)
+        
+        if settings is not None:
+            self.set_input_settings(settings)
+        self.pending_command = command if error is None else f"{command} (incomplete)"
+        self.set_loading(False)
+        self.change_bus.release()
+        if self.change_bus.pending:
+            self.change_bus.flush()
+        self.pending_command = None
+        self.update_history_status()
+        
+        if error is not None:
+            QMessageBox.warning(self, "Error", f"Failed to load {description}: {error}")
+        else:
+            rows = sum(tables[section].rowCount() for section in self.load_sections)
+            rows += sum(len(columns[0]) for columns in deferred.values())
+            hidden = [TABLE_TITLES[section].lower() for section in deferred if section in self.deferred_sections]
+            self.statusBar().showMessage(
+                f"Loaded {description}: {rows} rows in {time.perf_counter() - self.load_started:.1f} s"
+                + (f"; {' and '.join(hidden)} shown on request" if hidden else "")
+                + (f"; removed {dropped} rows naming products or resources no longer listed" if dropped else "")
+            )
+            if warnings:
+                QMessageBox.information(self, "Partial Import",
+                                        f"Parts of {description} have no place in a scenario:\n\n" + "\n".join(warnings))
+            
+    def closeEvent(self, event):
+        """Stop a running load, sweep and chart drawing so their threads do not outlive the window, and drop the autosave"""
+        if self.load_thread is not None:
+            self.load_thread.requestInterruption()
+            self.load_thread.wait()
+        if self.sweep_thread is not None:
+            self.sweep_thread.requestInterruption()
+            self.sweep_thread.wait()
+        if self.chart_thread is not None:
+            self.chart_thread.stop()
+        for thread in self.export_threads:
+            thread.wait()
+        self.finish_input_pass()
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        if self.session_lock is not None:
+            # A clean close leaves nothing to recover
+            remove_autosave_session(self.session_lock, self.session_path)
+            self.session_lock = None
+        super().closeEvent(event)
                 
     def save_data(self):
         """Save current input data to file"""
-        file_path, _ = QFileDialog.getSaveFileName(self, "Save Data", "", "JSON Files (*.json)")
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Save Data", "", f"JSON Files (*.json);;Binary Scenarios (*{BINARY_SUFFIX});;MPS Models (*.mps)"
+        )
         if file_path:
             try:
-                data = self.get_input_data()
-                with open(file_path, "w") as f:
-                    json.dump(data, f, indent=2)
+                # Write straight from the model store
+                if self.change_bus.pending:
+                    self.change_bus.flush()
+                self.finish_input_pass()
+                if file_path.endswith(BINARY_SUFFIX) or selected_filter.startswith("Binary"):
+                    if not file_path.endswith(BINARY_SUFFIX):
+                        file_path += BINARY_SUFFIX
+                    with open(file_path, "wb") as f:
+                        save_binary_scenario(f, self.store, self.input_settings())
+                elif is_mps_path(file_path) or selected_filter.startswith("MPS"):
+                    if not is_mps_path(file_path):
+                        file_path += ".mps"
+                    with open_mps(file_path) as f:
+                        write_mps(f, self.store, self.input_settings())
+                else:
+                    # A batch of rows at a time
+                    with open(file_path, "w") as f:
+                        write_scenario(f, self.input_settings(), (
+                            (section, self.store.section_batches(section)) for section in SECTIONS
+                        ))
                 self.statusBar().showMessage(f"Data saved to {file_path}")
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Failed to save data: {str(e)}")
                 
+    def export_result_csv(self, key):
+        """Write one table of the current result to a CSV file chosen by the user"""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Results", f"{key}.csv", "CSV Files (*.csv)")
+        if not file_path:
+            return
+        header, rows = result_rows(self.current_result, key)
+        self.start_export(ExportThread(file_path, lambda f: write_csv(f, header, rows)), "rows")
+        
+    def export_results(self, results):
+        """Write results, with their plan, utilization, messages and run details, to a file chosen by the user"""
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export Results", "results.json",
+            "JSON Files (*.json);;CSV Files (*.csv);;NumPy Archives (*.npz)"
+        )
+        if not file_path:
+            return
+        result_format = next((name for name, suffix in RESULT_FORMATS.items() if file_path.endswith(suffix)), None)
+        if result_format is None:
+            result_format = {"CSV": "csv", "NumPy": "binary"}.get(selected_filter.split()[0], "json")
+            file_path += RESULT_FORMATS[result_format]
+        mode = "wb" if result_format == "binary" else "w"
+        self.start_export(ExportThread(file_path, lambda f: write_results(f, results, result_format), mode),
+                          "results" if len(results) != 1 else "result")
+        
+    def start_export(self, thread, unit):
+        """Run an export thread, reporting in the status bar how many units it wrote"""
+        thread.exported.connect(
+            lambda path, count: self.statusBar().showMessage(f"Exported {count} {unit} to {path}")
+        )
+        thread.error_occurred.connect(
+            lambda message: QMessageBox.warning(self, "Error", f"Failed to export results: {message}")
+        )
+        thread.finished.connect(lambda: self.export_threads.remove(thread))
+        self.export_threads.append(thread)
+        self.statusBar().showMessage(f"Exporting to {thread.file_path}...")
+        thread.start()
+        
+    def prepare_optimization(self):
+        """Validate the input and pick the optimizer; (optimizer type, request data), or None after warning the user"""
+        # Validate every table before reading any values
+        report = self.validate_input_tables()
+        if report:
+            details = "\n".join(
+                f"{TABLE_TITLES[error.table]} row {error.row + 1}: {error.message}"
+                for error in report.errors[:10]
+            )
+            if len(report) > 10:
+                details += f"\n... and {len(report) - 10} more"
+            self.tab_widget.setCurrentIndex(0)
+            QMessageBox.warning(self, "Validation Error",
+                                f"{report.summary()}\n\n{details}\n\nInvalid cells are highlighted.")
+            return None
+            
+        # Validate input data
+        data = self.get_input_data()
+        
+        if not data["products"]:
+            QMessageBox.warning(self, "Validation Error", "No products defined")
+            return None
+            
+        if not data["resources"]:
+            QMessageBox.warning(self, "Validation Error", "No resources defined")
+            return None
+            
+        if not data["resource_usage"]:
+            QMessageBox.warning(self, "Validation Error", "No resource usage defined")
+            return None
+            
+        # Get optimizer type
+        optimizer_type = self.optimizer_combo.currentText()
+        if not optimizer_type:
+            QMessageBox.warning(self, "Validation Error", "No optimizer selected")
+            return None
+            
+        # Check if we need to switch optimizer type
+        if "demand_constraints" in data and optimizer_type == "basic-production":
+            optimizer_type = "demand-constrained-production"
+            index = self.optimizer_combo.findText(optimizer_type)
+            if index >= 0:
+                self.optimizer_combo.setCurrentIndex(index)
+                self.statusBar().showMessage("Switched to demand-constrained optimizer due to demand constraints", 5000)
+        return optimizer_type, data
+        
     def run_optimization(self):
         """Run optimization with current input data"""
         try:
-            # Validate input data
-            data = self.get_input_data()
-            
-            if not data["products"]:
-                QMessageBox.warning(self, "Validation Error", "No products defined")
+            prepared = self.prepare_optimization()
+            if prepared is None:
                 return
-                
-            if not data["resources"]:
-                QMessageBox.warning(self, "Validation Error", "No resources defined")
-                return
-                
-            if not data["resource_usage"]:
-                QMessageBox.warning(self, "Validation Error", "No resource usage defined")
-                return
-                
-            # Get optimizer type
-            optimizer_type = self.optimizer_combo.currentText()
-            if not optimizer_type:
-                QMessageBox.warning(self, "Validation Error", "No optimizer selected")
-                return
-                
-            # Check if we need to switch optimizer type
-            if "demand_constraints" in data and optimizer_type == "basic-production":
-                optimizer_type = "demand-constrained-production"
-                index = self.optimizer_combo.findText(optimizer_type)
-                if index >= 0:
-                    self.optimizer_combo.setCurrentIndex(index)
-                    self.statusBar().showMessage("Switched to demand-constrained optimizer due to demand constraints", 5000)
+            optimizer_type, data = prepared
                 
             # Disable optimize button and show status
             self.optimize_button.setEnabled(False)
@@ -1370,9 +2678,10 @@ class MainWindow(QMainWindow):
             self.objective_value_label.setText("-")
             self.total_production_label.setText("-")
             self.messages_text.clear()
-            self.results_text.clear()
+            self.result_view.clear()
             
             # Run optimization in a separate thread
+            self.optimization_started = time.perf_counter()
             self.optimization_thread = OptimizationThread(optimizer_type, data)
             self.optimization_thread.result_ready.connect(self.handle_optimization_result)
             self.optimization_thread.error_occurred.connect(self.handle_optimization_error)
@@ -1382,12 +2691,134 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", f"Failed to run optimization: {str(e)}")
             self.optimize_button.setEnabled(True)
             
+    def run_sweep(self):
+        """Solve the scenario over a range of capacities of one resource, or stop the sweep that is running"""
+        if self.sweep_thread is not None:
+            self.sweep_thread.requestInterruption()
+            self.statusBar().showMessage("Stopping the sweep after the current run...")
+            return
+        try:
+            prepared = self.prepare_optimization()
+            if prepared is None:
+                return
+            optimizer_type, data = prepared
+            dialog = SweepDialog(data["resources"], self)
+            if dialog.exec() != QDialog.Accepted:
+                return
+                
+            self.ensure_charts()
+            self.live_feed.start(f"{dialog.resource()} capacity")
+            self.tab_widget.setCurrentIndex(1)
+            self.optimize_button.setEnabled(False)
+            self.sweep_button.setText("Stop Sweep")
+            self.statusBar().showMessage("Sweeping...")
+            
+            # Results only go to the live chart and the session history, so a fast sweep stays cheap
+            self.optimization_started = time.perf_counter()
+            self.sweep_solved = 0
+            self.sweep_thread = SweepThread(optimizer_type, data, dialog.resource(), dialog.capacities())
+            self.sweep_thread.step_ready.connect(self.handle_sweep_result)
+            self.sweep_thread.error_occurred.connect(self.handle_optimization_error)
+            self.sweep_thread.finished.connect(self.finish_sweep)
+            self.sweep_thread.start()
+            
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to run sweep: {str(e)}")
+            
+    def handle_sweep_result(self, index, capacity, result):
+        thread = self.sweep_thread
+        self.result_history.append(ResultArrays(result, {
+            "run": len(self.result_history) + 1,
+            "optimizer": thread.optimizer_type,
+            "objective": thread.data.get("objective"),
+            "sweep_resource": thread.resource,
+            "capacity": capacity,
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "duration_s": round(time.perf_counter() - self.optimization_started, 3)
+        }))
+        self.optimization_started = time.perf_counter()
+        self.sweep_solved += 1
+        self.live_feed.add(capacity, result.get("objective_value"))
+        self.statusBar().showMessage(f"Sweeping: {index + 1} of {len(thread.capacities)} runs solved")
+        
+    def finish_sweep(self):
+        runs = len(self.sweep_thread.capacities)
+        self.sweep_thread = None
+        self.optimize_button.setEnabled(True)
+        self.sweep_button.setText("Sweep")
+        self.statusBar().showMessage(f"Sweep finished: {self.sweep_solved} of {runs} runs solved")
+        self.export_session_button.setEnabled(bool(self.result_history))
+        self.export_session_button.setToolTip(f"Export all {len(self.result_history)} results of this session")
+        
+    def on_tab_changed(self, index):
+        if index == 1:  # Results
+            self.ensure_charts()
+            
+    def ensure_charts(self):
+        """Build the chart canvases, importing matplotlib, unless that has been done already"""
+        if self.production_chart is not None:
+            return
+        if self.threaded_charts:
+            from widgets.charts import (ChartRenderThread, LiveObjectiveImage, ProductionImage, RenderedChart,
+                                        ResourceUsageImage, UsageHeatmapImage)
+            self.chart_thread = ChartRenderThread()
+            self.production_chart = RenderedChart(self.chart_thread, "production", ProductionImage)
+            self.resource_chart = RenderedChart(self.chart_thread, "resources", ResourceUsageImage)
+            self.objective_chart = RenderedChart(self.chart_thread, "objective", LiveObjectiveImage)
+            self.usage_chart = RenderedChart(self.chart_thread, "usage", UsageHeatmapImage)
+            self.chart_thread.rendered.connect(self.on_chart_rendered)
+            self.chart_thread.start()
+        else:
+            from widgets.charts import LiveObjectiveChart, ProductionChart, ResourceUsageChart, UsageHeatmapChart
+            self.production_chart = ProductionChart()
+            self.resource_chart = ResourceUsageChart()
+            self.objective_chart = LiveObjectiveChart()
+            self.usage_chart = UsageHeatmapChart()
+        from widgets.charts import LiveFeed
+        self.live_feed = LiveFeed(self.objective_chart, self)
+        self.production_chart_layout.addWidget(self.production_chart)
+        self.resource_chart_layout.addWidget(self.resource_chart)
+        self.objective_chart_layout.addWidget(self.objective_chart)
+        self.usage_chart_layout.addWidget(self.usage_chart)
+        # The splitter shared out its height before the charts were there; share it again once they are shown
+        QTimer.singleShot(0, self.share_results_height)
+        
+    def on_chart_rendered(self, key, image, hint, seconds):
+        """Report the time the chart thread took once it has drawn every chart of the last result"""
+        if key not in self.chart_seconds:
+            return
+        self.chart_seconds[key] = seconds
+        if None in self.chart_seconds.values():
+            return
+        self.statusBar().showMessage(
+            f"{self.chart_message} (charts drawn in {sum(self.chart_seconds.values()) * 1000:.0f} ms)"
+        )
+        self.chart_seconds = {}
+        
+    def share_results_height(self):
+        splitter = self.results_splitter
+        splitter.setSizes([splitter.widget(index).sizeHint().height() for index in range(splitter.count())])
+        
     def handle_optimization_result(self, result):
         """Handle optimization result"""
         self.current_result = result
+        self.result_history.append(ResultArrays(result, {
+            "run": len(self.result_history) + 1,
+            "optimizer": self.optimization_thread.optimizer_type,
+            "objective": self.optimization_thread.data.get("objective"),
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "duration_s": round(time.perf_counter() - self.optimization_started, 3)
+        }))
         self.optimize_button.setEnabled(True)
         self.statusBar().showMessage("Optimization completed")
         
+        if self.library_scenario_id is not None:
+            try:
+                self.library.add_result(self.library_scenario_id, self.result_history[-1])
+                self.statusBar().showMessage("Optimization completed; result saved to the library")
+            except sqlite3.Error as e:
+                self.statusBar().showMessage(f"Optimization completed; saving the result to the library failed: {e}")
+        
         # Update status
         status = result.get("status", "unknown")
         self.status_label.setText(status)
@@ -1434,15 +2865,42 @@ class MainWindow(QMainWindow):
                 self.messages_text.append(f"• <span style='color: #eab308;'>{warning}</span>")
                 
         # Update charts
+        charts_started = time.perf_counter()
+        self.ensure_charts()
         if "production_plan" in result:
             self.production_chart.update_chart(result["production_plan"])
             
         if "resource_utilization" in result:
             self.resource_chart.update_chart(result["resource_utilization"])
             
+        if "production_plan" in result and "resource_utilization" in result:
+            self.usage_chart.update_chart((self.result_history[-1],
+                                           self.optimization_thread.data.get("resource_usage", [])))
+            
+        if self.live_feed.label != RUN_LABEL:
+            self.live_feed.start(RUN_LABEL)
+        self.live_feed.add(len(self.result_history), result.get("objective_value"))
+        if self.show_timings and self.threaded_charts:
+            # The charts are drawn later on the chart thread, which reports each one's time
+            self.chart_message = self.statusBar().currentMessage()
+            self.chart_seconds = {chart.key: None for chart, drawn in (
+                (self.production_chart, "production_plan" in result),
+                (self.resource_chart, "resource_utilization" in result),
+                (self.usage_chart, "production_plan" in result and "resource_utilization" in result)) if drawn}
+        elif self.show_timings:
+            self.statusBar().showMessage(
+                f"{self.statusBar().currentMessage()} (charts drawn in "
+                f"{(time.perf_counter() - charts_started) * 1000:.0f} ms)"
+            )
+            
+        for key, button in self.export_buttons.items():
+            button.setEnabled(bool(result.get(key)))
+        self.export_results_button.setEnabled(True)
+        self.export_session_button.setEnabled(True)
+        self.export_session_button.setToolTip(f"Export all {len(self.result_history)} results of this session")
+            
         # Update detailed results
-        self.results_text.clear()
-        self.results_text.append(json.dumps(result, indent=2))
+        self.result_view.set_result(result)
         
     def handle_optimization_error(self, error_message):
         """Handle optimization error"""
@@ -0,0 +1,84 @@
+"""Time loading synthetic scenarios into the app.py input tables
+
+Usage: python benchmarks/bench_bulk_load.py [rows ...]
+
+Runs headless by default. Each scenario has 20 resources, one product per
+20 usage rows and a demand constraint on every other product.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from app import (ProductsTableWidget, ResourcesTableWidget, ResourceUsageTableWidget,
+                 DemandConstraintsTableWidget, bulk_update)
+from core.name_registry import NameRegistry
+
+RESOURCE_COUNT = 20
+
+
+def make_scenario(usage_rows):
+    product_count = max(1, usage_rows // RESOURCE_COUNT)
+    return {
+        "products": [
+            {"name": f"Product {i}", "profit_per_unit": i % 50 + 1, "cost_per_unit": i % 7}
+            for i in range(product_count)
+        ],
+        "resources": [
+            {"name": f"Resource {j}", "available_capacity": 1000 + j}
+            for j in range(RESOURCE_COUNT)
+        ],
+        "resource_usage": [
+            {
+                "product_name": f"Product {k // RESOURCE_COUNT}",
+                "resource_name": f"Resource {k % RESOURCE_COUNT}",
+                "usage_per_unit": (k % 9) / 2
+            }
+            for k in range(usage_rows)
+        ],
+        "demand_constraints": [
+            {"product_name": f"Product {i}", "min_demand": 1, "max_demand": 100}
+            for i in range(0, product_count, 2)
+        ],
+    }
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    app = QApplication(sys.argv[:1])
+
+    product_registry = NameRegistry()
+    resource_registry = NameRegistry()
+    products_table = ProductsTableWidget(registry=product_registry)
+    resources_table = ResourcesTableWidget(registry=resource_registry)
+    usage_table = ResourceUsageTableWidget(product_registry=product_registry,
+                                           resource_registry=resource_registry)
+    demand_table = DemandConstraintsTableWidget(registry=product_registry)
+    tables = (products_table, resources_table, usage_table, demand_table)
+
+    print(f"{'usage rows':>10}  {'load (s)':>9}  {'read back (s)':>13}")
+    for size in sizes:
+        scenario = make_scenario(size)
+
+        start = time.perf_counter()
+        with bulk_update(*tables):
+            products_table.set_products_data(scenario["products"])
+            resources_table.set_resources_data(scenario["resources"])
+            usage_table.set_resource_usage_data(scenario["resource_usage"])
+            demand_table.set_demand_constraints_data(scenario["demand_constraints"])
+        app.processEvents()
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        usage_table.get_resource_usage_data()
+        read_time = time.perf_counter() - start
+
+        print(f"{size:>10}  {load_time:>9.3f}  {read_time:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
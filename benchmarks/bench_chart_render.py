@@ -0,0 +1,106 @@
+"""Measure how long the GUI thread stalls while results stream into the charts
+
+Usage: python benchmarks/bench_chart_render.py [products] [results]
+
+Feeds a stream of results to the production and resource charts, drawn
+on the GUI thread and then on a ChartRenderThread, while a 5 ms timer
+records how late the event loop gets to it. Runs headless by default.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication, QHBoxLayout, QWidget
+
+from widgets.charts import (ChartRenderThread, ProductionChart, ProductionImage, RenderedChart,
+                            ResourceUsageChart, ResourceUsageImage)
+
+RESULT_INTERVAL_MS = 20
+TICK_MS = 5
+
+
+def make_result(product_count, number):
+    return {
+        "production_plan": {f"Product {i}": float((i * 7919 + number * 31) % 1000) for i in range(product_count)},
+        "resource_utilization": {
+            f"Resource {i}": {"used": float((i * 13 + number) % 500), "available": 500.0} for i in range(40)
+        },
+    }
+
+
+def run(app, charts, results):
+    """Stream the results into the charts and return the tick gaps in seconds"""
+    window = QWidget()
+    layout = QHBoxLayout(window)
+    for chart in charts:
+        layout.addWidget(chart)
+    window.resize(1200, 400)
+    window.show()
+    app.processEvents()
+
+    gaps = []
+    last = [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        gaps.append(now - last[0])
+        last[0] = now
+
+    def feed():
+        if not results:
+            feeder.stop()
+            return
+        result = results.pop(0)
+        charts[0].update_chart(result["production_plan"])
+        charts[1].update_chart(result["resource_utilization"])
+
+    ticker = QTimer(interval=TICK_MS, timeout=tick)
+    feeder = QTimer(interval=RESULT_INTERVAL_MS, timeout=feed)
+    ticker.start()
+    feeder.start()
+    while feeder.isActive():
+        app.processEvents()
+    ticker.stop()
+    window.close()
+    return gaps
+
+
+def report(label, gaps, started):
+    gaps = sorted(gaps)
+    print(f"{label:>12}: longest stall {gaps[-1] * 1000:.0f} ms, 95th percentile "
+          f"{gaps[int(len(gaps) * 0.95)] * 1000:.0f} ms, {time.perf_counter() - started:.2f} s in all")
+
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    result_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    app = QApplication(sys.argv[:1])
+    results = [make_result(product_count, number) for number in range(result_count)]
+
+    started = time.perf_counter()
+    report("GUI thread", run(app, [ProductionChart(), ResourceUsageChart()], list(results)), started)
+
+    thread = ChartRenderThread()
+    images = []
+    thread.rendered.connect(lambda key, image, hint, seconds: images.append(key))
+    charts = [RenderedChart(thread, "production", ProductionImage),
+              RenderedChart(thread, "resources", ResourceUsageImage)]
+    thread.start()
+    started = time.perf_counter()
+    report("worker", run(app, charts, list(results)), started)
+    # Let the thread draw the changes still pending, and the image in progress when they run out
+    while thread.pending:
+        app.processEvents()
+    time.sleep(0.5)
+    app.processEvents()
+    thread.stop()
+    app.processEvents()
+    print(f"{'':>12}  {len(images)} images drawn for {result_count * 2} chart updates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Time the cold start of app.py up to a shown, idle main window
+
+Usage: python benchmarks/bench_cold_start.py [runs]
+
+Each run starts a fresh interpreter that imports app, builds the main
+window and shows it, then opens the Results tab. A local HTTP server
+answers the optimizer list request the window makes on start, and HOME
+points at a temporary directory so no autosave from a real session is
+found. Runs headless by default. Reports the median of the runs.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class OptimizersHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"optimizers": ["basic-production", "demand-constrained-production"]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def child(port):
+    """Start the app in this interpreter and print the timings as JSON"""
+    start = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    import app
+    from PyQt5.QtWidgets import QApplication
+    imported = time.perf_counter()
+
+    app.API_BASE_URL = f"http://127.0.0.1:{port}"
+    qt_app = QApplication(sys.argv[:1])
+    window = app.MainWindow()
+    window.show()
+    qt_app.processEvents()
+    shown = time.perf_counter()
+
+    window.tab_widget.setCurrentIndex(1)
+    qt_app.processEvents()
+    results = time.perf_counter()
+    print(json.dumps({"import": imported - start, "window": shown - start, "results_tab": results - shown}))
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        child(int(sys.argv[2]))
+        return
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    server = HTTPServer(("127.0.0.1", 0), OptimizersHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    environment = dict(os.environ, HOME=tempfile.mkdtemp())
+    environment.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, __file__, "--child", str(server.server_address[1])],
+                                env=environment, capture_output=True, text=True, check=True).stdout
+        timing = json.loads(output.strip().splitlines()[-1])
+        timing["process"] = time.perf_counter() - start
+        timings.append(timing)
+    server.shutdown()
+
+    for key, label in (("import", "import app"), ("window", "window shown"),
+                       ("results_tab", "first Results tab"), ("process", "whole process")):
+        print(f"{label:>18}: {statistics.median(timing[key] for timing in timings):.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Measure the autosave journal: bytes and time per edit, and replay time
+
+Usage: python benchmarks/bench_journal.py [usage rows] [edits]
+
+Journals a run of random single-cell edits, row inserts and row removals
+on the table text of a synthetic scenario and compares the bytes each
+edit appends with rewriting the whole scenario, which is what a plain
+autosave would cost. Then times recovering the tables from the snapshot
+and the journal, as a restart after a crash would.
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_bulk_load import make_scenario
+from core.journal import EditJournal
+
+FIELDS = {
+    "products": ("name", "profit_per_unit", "cost_per_unit"),
+    "resources": ("name", "available_capacity"),
+    "resource_usage": ("product_name", "resource_name", "usage_per_unit"),
+    "demand_constraints": ("product_name", "min_demand", "max_demand"),
+}
+
+
+def table_text(scenario):
+    """The scenario as the cell text columns the app journals"""
+    return {
+        key: [[str(entry.get(field, "")) for entry in scenario.get(key, [])] for field in fields]
+        for key, fields in FIELDS.items()
+    }
+
+
+def edit(tables, number):
+    """Apply one random edit to a copy of the usage table, as the app reads it back after a flush"""
+    columns = [list(column) for column in tables["resource_usage"]]
+    row = random.randrange(len(columns[0]))
+    kind = number % 3
+    if kind == 0:
+        columns[2][row] = str(random.uniform(0, 10))
+    elif kind == 1:
+        for column, cell in zip(columns, ("P1", "R1", "1.0")):
+            column.insert(row, cell)
+    else:
+        for column in columns:
+            del column[row]
+    return {**tables, "resource_usage": columns}
+
+
+def main():
+    usage_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    edit_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    random.seed(1)
+    directory = tempfile.mkdtemp()
+    tables = table_text(make_scenario(usage_rows))
+    settings = {"objective": "maximize_profit"}
+    full_bytes = len(json.dumps(tables, separators=(",", ":")))
+
+    journal = EditJournal(directory)
+    start = time.perf_counter()
+    journal.start(tables, settings)
+    print(f"snapshot of {usage_rows} usage rows: {full_bytes / 1e6:.1f} MB in {time.perf_counter() - start:.2f} s")
+
+    written = 0
+    record_time = 0.0
+    for number in range(edit_count):
+        tables = edit(tables, number)
+        start = time.perf_counter()
+        written += journal.record(tables, settings)
+        record_time += time.perf_counter() - start
+    journal.sync()
+    print(f"{edit_count} edits: {written / edit_count:.0f} bytes and {record_time / edit_count * 1000:.2f} ms "
+          f"per edit, versus {full_bytes / 1e6:.1f} MB for a full rewrite")
+
+    start = time.perf_counter()
+    recovered, _ = journal.recover()
+    elapsed = time.perf_counter() - start
+    assert recovered == tables
+    print(f"replay of snapshot and {edit_count} journaled edits: {elapsed:.2f} s")
+
+    journal.close(discard=True)
+    shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Time searching and opening scenarios in the scenario library
+
+Usage: python benchmarks/bench_library.py [scenarios] [usage rows]
+
+Fills a temporary library with copies of one synthetic scenario under
+different names and tags, then times typical searches, which only read
+the indexed metadata, and reading one scenario back from its blob.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_bulk_load import make_scenario
+from bench_scenario_formats import make_store
+from core.library import ScenarioLibrary
+from core.result_export import ResultArrays
+
+TAGS = ("eu", "us", "asia", "pilot", "archived")
+OPTIMIZERS = ("basic-production", "demand-constrained-production")
+
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return result, time.perf_counter() - start
+
+
+def main():
+    scenario_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    usage_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    random.seed(1)
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "library.sqlite")
+    library = ScenarioLibrary(path)
+
+    store = make_store(make_scenario(usage_rows))
+    scenario_id = library.add_store("template", store, {"objective": "maximize_profit"})
+    data = library.scenario_data(scenario_id)
+    start = time.perf_counter()
+    for index in range(scenario_count):
+        scenario_id = library.add_scenario(f"plant {index:05d}", data, random.sample(TAGS, 2))
+        result = {"status": "optimal", "objective_value": random.uniform(0, 1e6)}
+        library.add_result(scenario_id, ResultArrays(result, {"optimizer": random.choice(OPTIMIZERS)}))
+    print(f"stored {scenario_count} scenarios of {len(data) / 1e6:.1f} MB in {time.perf_counter() - start:.1f} s, "
+          f"library {os.path.getsize(path) / 1e6:.0f} MB")
+
+    searches = (
+        ("newest 1000", {}),
+        ("name prefix", {"name": "plant 012"}),
+        ("one tag", {"tags": ["pilot"]}),
+        ("two tags", {"tags": ["eu", "pilot"]}),
+        ("optimizer and objective", {"optimizer": OPTIMIZERS[0], "target_objective_value": 990000}),
+    )
+    for label, conditions in searches:
+        entries, elapsed = timed(lambda: library.search(**conditions))
+        print(f"{label:>24}: {len(entries):>5} scenarios in {elapsed * 1000:6.1f} ms")
+
+    scenario, elapsed = timed(lambda: library.scenario(scenario_id))
+    print(f"{'open one scenario':>24}: {sum(scenario.row_counts().values())} rows in {elapsed * 1000:6.1f} ms")
+
+    library.close()
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Measure redrawing the objective chart for every result of a fast sweep against throttling it
+
+Usage: python benchmarks/bench_live_chart.py [results] [interval_ms]
+
+Feeds sweep results to a LiveObjectiveChart at a fixed interval, first
+redrawing the whole series for each one and then through a LiveFeed,
+while a 5 ms timer records how late the event loop gets to it. Runs
+headless by default.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from widgets.charts import LiveFeed, LiveObjectiveChart
+
+TICK_MS = 5
+
+
+def run(app, add, result_count, interval_ms):
+    """Pass result_count results to add, one every interval_ms; the tick gaps in seconds"""
+    gaps = []
+    last = [time.perf_counter()]
+    sent = [0]
+
+    def tick():
+        now = time.perf_counter()
+        gaps.append(now - last[0])
+        last[0] = now
+
+    def feed():
+        if sent[0] == result_count:
+            feeder.stop()
+            return
+        capacity = 100.0 + sent[0]
+        add(capacity, float(np.sqrt(capacity) * 10))
+        sent[0] += 1
+
+    ticker = QTimer(interval=TICK_MS, timeout=tick)
+    feeder = QTimer(interval=interval_ms, timeout=feed)
+    ticker.start()
+    feeder.start()
+    while feeder.isActive():
+        app.processEvents()
+    ticker.stop()
+    return gaps
+
+
+def report(label, gaps, started, draws):
+    gaps = sorted(gaps)
+    print(f"{label:>12}: longest stall {gaps[-1] * 1000:.0f} ms, 95th percentile "
+          f"{gaps[int(len(gaps) * 0.95)] * 1000:.0f} ms, {draws} draws, {time.perf_counter() - started:.2f} s in all")
+
+
+def counted(chart):
+    """Count the updates reaching chart"""
+    draws = [0]
+    update_chart = chart.update_chart
+
+    def update(data):
+        draws[0] += 1
+        update_chart(data)
+    chart.update_chart = update
+    return draws
+
+
+def main():
+    result_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    interval_ms = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    app = QApplication(sys.argv[:1])
+
+    chart = LiveObjectiveChart()
+    chart.resize(600, 400)
+    chart.show()
+    app.processEvents()
+    draws = counted(chart)
+    xs, objectives = [], []
+
+    def redraw(x, objective):
+        xs.append(x)
+        objectives.append(objective)
+        chart.update_chart(("Capacity", np.array(xs), np.array(objectives)))
+    started = time.perf_counter()
+    report("every result", run(app, redraw, result_count, interval_ms), started, draws[0])
+    chart.close()
+
+    chart = LiveObjectiveChart()
+    chart.resize(600, 400)
+    chart.show()
+    app.processEvents()
+    draws = counted(chart)
+    feed = LiveFeed(chart)
+    feed.start("Capacity")
+    started = time.perf_counter()
+    gaps = run(app, feed.add, result_count, interval_ms)
+    feed.flush()
+    report("throttled", gaps, started, draws[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compare the model store with the per-row representations it replaces
+
+Usage: python benchmarks/bench_model_store.py [rows ...]
+
+Memory is measured with tracemalloc for resource usage entries held as
+per-row dicts (the old main.py forms) and as store columns. Read time is
+the whole-model read: parsing the app.py table cells versus building the
+API dicts from the store. The store sync column is the per-flush cost of
+refreshing the store from the table text. Runs headless by default.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+from app import (ProductsTableWidget, ResourcesTableWidget, ResourceUsageTableWidget,
+                 DemandConstraintsTableWidget, bulk_update)
+from bench_bulk_load import make_scenario
+from core.model_store import ColumnTable, ScenarioStore
+from widgets.table_text import column_texts
+
+
+def traced(build):
+    """Return (result, bytes still allocated after building it)"""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def dict_rows(scenario, product_ids, resource_ids):
+    return [
+        {
+            "product_id": product_ids[entry["product_name"]],
+            "resource_id": resource_ids[entry["resource_name"]],
+            "usage_per_unit": float(entry["usage_per_unit"])
+        }
+        for entry in scenario["resource_usage"]
+    ]
+
+
+def column_rows(scenario, product_ids, resource_ids):
+    usage = scenario["resource_usage"]
+    rows = ColumnTable(product_id=np.int32, resource_id=np.int32, usage_per_unit=np.float64)
+    rows.extend(
+        product_id=[product_ids[entry["product_name"]] for entry in usage],
+        resource_id=[resource_ids[entry["resource_name"]] for entry in usage],
+        usage_per_unit=[entry["usage_per_unit"] for entry in usage]
+    )
+    return rows
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+    app = QApplication(sys.argv[:1])
+
+    store = ScenarioStore()
+    products_table = ProductsTableWidget(registry=store.product_registry)
+    resources_table = ResourcesTableWidget(registry=store.resource_registry)
+    usage_table = ResourceUsageTableWidget(product_registry=store.product_registry,
+                                           resource_registry=store.resource_registry)
+    demand_table = DemandConstraintsTableWidget(registry=store.product_registry)
+    tables = {
+        "products": products_table,
+        "resources": resources_table,
+        "resource_usage": usage_table,
+        "demand_constraints": demand_table
+    }
+
+    print(f"{'usage rows':>10}  {'dict B/row':>10}  {'store B/row':>11}  "
+          f"{'table read (s)':>14}  {'store read (s)':>14}  {'store sync (s)':>14}")
+    for size in sizes:
+        scenario = make_scenario(size)
+        with bulk_update(*tables.values()):
+            products_table.set_products_data(scenario["products"])
+            resources_table.set_resources_data(scenario["resources"])
+            usage_table.set_resource_usage_data(scenario["resource_usage"])
+            demand_table.set_demand_constraints_data(scenario["demand_constraints"])
+        product_ids = {name: entity_id for entity_id, name in store.product_registry.items()}
+        resource_ids = {name: entity_id for entity_id, name in store.resource_registry.items()}
+
+        _, dict_bytes = traced(lambda: dict_rows(scenario, product_ids, resource_ids))
+        _, store_bytes = traced(lambda: column_rows(scenario, product_ids, resource_ids))
+
+        start = time.perf_counter()
+        products_table.get_products_data()
+        resources_table.get_resources_data()
+        usage_table.get_resource_usage_data()
+        demand_table.get_demand_constraints_data()
+        table_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.load_table_text({
+            key: [column_texts(table, column) for column in range(table.columnCount())]
+            for key, table in tables.items()
+        })
+        sync_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.products_data()
+        store.resources_data()
+        store.resource_usage_data()
+        store.demand_constraints_data()
+        store_time = time.perf_counter() - start
+
+        print(f"{size:>10}  {dict_bytes / size:>10.0f}  {store_bytes / size:>11.1f}  "
+              f"{table_time:>14.3f}  {store_time:>14.3f}  {sync_time:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
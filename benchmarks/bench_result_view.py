@@ -0,0 +1,61 @@
+"""Time showing a large result as pretty-printed JSON text and as a lazy tree
+
+Usage: python benchmarks/bench_result_view.py [products]
+
+Compares appending json.dumps(result, indent=2) to a QTextEdit, as the
+results panel used to, with ResultView: opening the tree, expanding the
+production plan, and making the raw text on demand. Runs headless by
+default.
+"""
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication, QTextEdit
+
+from widgets.result_tree import ResultView
+
+
+def make_result(product_count):
+    return {
+        "status": "optimal",
+        "objective_value": 12345.0,
+        "production_plan": {f"Product {i}": i * 0.5 for i in range(product_count)},
+        "resource_utilization": {f"Resource {i}": {"used": i * 3.0, "available": 500.0} for i in range(200)},
+    }
+
+
+def timed(app, action):
+    start = time.perf_counter()
+    action()
+    app.processEvents()
+    return time.perf_counter() - start
+
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    app = QApplication(sys.argv[:1])
+    result = make_result(product_count)
+
+    text = QTextEdit()
+    text.resize(800, 600)
+    text.show()
+    elapsed = timed(app, lambda: text.append(json.dumps(result, indent=2)))
+    print(f"QTextEdit with indented JSON of {product_count:,} products: {elapsed:.3f} s")
+
+    view = ResultView()
+    view.resize(800, 600)
+    view.show()
+    app.processEvents()
+    print(f"{'tree opened':>28}: {timed(app, lambda: view.set_result(result)):.4f} s")
+    plan = view.model.index(2, 0)
+    print(f"{'production plan expanded':>28}: {timed(app, lambda: view.tree.expand(plan)):.4f} s")
+    print(f"{'raw tab opened':>28}: {timed(app, lambda: view.setCurrentIndex(1)):.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Compare the JSON, binary and MPS scenario formats
+
+Usage: python benchmarks/bench_scenario_formats.py [rows ...]
+
+Writes each synthetic scenario in every format from a model store, then
+times opening the file, getting the first batch of table text and reading
+every section as table text. An MPS file has to be parsed in full before
+any rows are known, so opening it already reads everything.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_bulk_load import make_scenario
+from core.model_store import ScenarioStore
+from core.mps import read_mps_file, write_mps
+from core.scenario_binary import BinaryScenario, save_binary_scenario
+from core.scenario_stream import SECTIONS, ScenarioReader, section_columns, write_scenario
+
+BATCH_ROWS = 2000
+
+
+def make_store(scenario):
+    store = ScenarioStore()
+    for product in scenario["products"]:
+        store.product_registry.add(product["name"])
+    for resource in scenario["resources"]:
+        store.resource_registry.add(resource["name"])
+    store.load_table_text({section: section_columns(section, scenario[section]) for section in SECTIONS})
+    return store
+
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return result, time.perf_counter() - start
+
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def read_json(path):
+    with open(path, "rb") as f:
+        for section, rows in ScenarioReader(f, BATCH_ROWS):
+            section_columns(section, rows)
+
+
+def first_json_batch(path):
+    with open(path, "rb") as f:
+        section, rows = next(iter(ScenarioReader(f, BATCH_ROWS)))
+        return section_columns(section, rows)
+
+
+def read_binary(path):
+    for _ in BinaryScenario(path).text_batches(BATCH_ROWS):
+        pass
+
+
+def read_mps(path):
+    for _ in read_mps_file(path).text_batches(BATCH_ROWS):
+        pass
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+    settings = {"objective": "maximize_profit"}
+    directory = tempfile.mkdtemp()
+    json_path = os.path.join(directory, "scenario.json")
+    binary_path = os.path.join(directory, "scenario.scn")
+    mps_path = os.path.join(directory, "scenario.mps")
+
+    print(f"{'usage rows':>10}  {'format':>6}  {'size (MB)':>9}  {'open (ms)':>9}  "
+          f"{'first batch (ms)':>16}  {'read all (s)':>12}")
+    for size in sizes:
+        store = make_store(make_scenario(size))
+        with open(json_path, "w") as f:
+            write_scenario(f, settings, ((section, store.section_batches(section)) for section in SECTIONS))
+        with open(binary_path, "wb") as f:
+            save_binary_scenario(f, store, settings)
+        with open(mps_path, "w") as f:
+            write_mps(f, store, settings)
+        del store
+
+        # json.load is what opening meant before streaming: the whole document at once
+        _, json_open = timed(lambda: load_json(json_path))
+        _, json_first = timed(lambda: first_json_batch(json_path))
+        _, json_all = timed(lambda: read_json(json_path))
+        _, binary_open = timed(lambda: BinaryScenario(binary_path))
+        _, binary_first = timed(lambda: next(BinaryScenario(binary_path).text_batches(BATCH_ROWS)))
+        _, binary_all = timed(lambda: read_binary(binary_path))
+        _, mps_open = timed(lambda: read_mps_file(mps_path))
+        _, mps_first = timed(lambda: next(read_mps_file(mps_path).text_batches(BATCH_ROWS)))
+        _, mps_all = timed(lambda: read_mps(mps_path))
+
+        for name, path, opened, first, read_all in (("json", json_path, json_open, json_first, json_all),
+                                                    ("binary", binary_path, binary_open, binary_first, binary_all),
+                                                    ("mps", mps_path, mps_open, mps_first, mps_all)):
+            print(f"{size:>10}  {name:>6}  {os.path.getsize(path) / 1e6:>9.1f}  {opened * 1000:>9.1f}  "
+                  f"{first * 1000:>16.1f}  {read_all:>12.2f}")
+
+    os.remove(json_path)
+    os.remove(binary_path)
+    os.remove(mps_path)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Time the capacity consumed heatmap from a result with a dense matrix and with UsageHeatmap
+
+Usage: python benchmarks/bench_usage_heatmap.py [products] [resources] [uses_per_product]
+
+Compares scaling the dense product x resource matrix by the plan and
+summing ranked rows into 400 groups with UsageHeatmap, which scales only
+the stored cells of the sparse usage matrix. Then draws the heatmap on
+a UsageHeatmapChart. Runs headless by default.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+from core.chart_data import rank_order
+from core.result_export import ResultArrays
+from core.usage_heatmap import UsageHeatmap
+from core.usage_matrix import UsageMatrix
+from widgets.charts import UsageHeatmapChart
+
+GROUPS = 400
+
+
+def make_scenario(product_count, resource_count, uses):
+    result = {
+        "production_plan": {f"Product {i}": float(i % 97) for i in range(product_count)},
+        "resource_utilization": {f"Resource {j}": {"used": 0.0, "available": 1000.0 + j} for j in range(resource_count)},
+    }
+    resource_usage = [
+        {"product_name": f"Product {i}", "resource_name": f"Resource {(i * 31 + k * 7) % resource_count}",
+         "usage_per_unit": 0.1 * (k + 1)}
+        for i in range(product_count) for k in range(uses)
+    ]
+    return ResultArrays(result), resource_usage
+
+
+def dense_grid(matrix, quantities, capacities):
+    consumed = matrix.to_dense() * quantities[:, None] / capacities
+    order = rank_order(consumed.sum(axis=1))
+    starts = -(-np.arange(GROUPS) * len(order) // GROUPS)
+    return np.add.reduceat(consumed[order], starts, axis=0)
+
+
+def timed(action):
+    start = time.perf_counter()
+    value = action()
+    return time.perf_counter() - start, value
+
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    resource_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    uses = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    arrays, resource_usage = make_scenario(product_count, resource_count, uses)
+    print(f"{product_count:,} products, {resource_count:,} resources, {len(resource_usage):,} usage entries")
+
+    elapsed, matrix = timed(lambda: UsageMatrix.from_resource_usage(resource_usage, arrays.products,
+                                                                    arrays.resources))
+    print(f"{'usage matrix built':>22}: {elapsed:.3f} s")
+    capacities = arrays.utilization["available"]
+    elapsed, dense = timed(lambda: dense_grid(matrix, arrays.quantities, capacities))
+    print(f"{'dense':>22}: {elapsed:.3f} s")
+    elapsed, heatmap = timed(lambda: UsageHeatmap(matrix, arrays.quantities, capacities))
+    print(f"{'sparse shares':>22}: {elapsed:.3f} s")
+    elapsed, (grid, starts) = timed(lambda: heatmap.grid(GROUPS))
+    print(f"{'sparse grid':>22}: {elapsed:.4f} s, matches dense: {np.allclose(grid, dense)}")
+
+    app = QApplication(sys.argv[:1])
+    chart = UsageHeatmapChart()
+    chart.resize(600, 500)
+    chart.show()
+    app.processEvents()
+    elapsed, _ = timed(lambda: (chart.update_chart((arrays, resource_usage)), app.processEvents()))
+    print(f"{'chart updated':>22}: {elapsed:.3f} s, {chart.rows} rows of about "
+          f"{product_count / chart.rows:,.0f} products")
+
+
+if __name__ == "__main__":
+    main()
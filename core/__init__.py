@@ -0,0 +1 @@
+"""Qt-free model and data helpers shared by both frontends"""
@@ -0,0 +1,65 @@
+from typing import Callable, Dict, List, Set
+
+
+class ChangeBus:
+    """Coalesces change notifications into one flush per event-loop iteration
+
+    Producers mark topics dirty as often as they like. The first mark
+    schedules a flush through the supplied scheduler (the frontends pass
+    QTimer.singleShot with a zero delay), and when it fires every
+    subscriber of a dirty topic runs exactly once, however many edits
+    happened in between.
+    """
+
+    def __init__(self, schedule: Callable[[Callable[[], None]], None]):
+        self._schedule = schedule
+        self._subscribers: Dict[str, List[Callable[[], None]]] = {}
+        self._dirty: Set[str] = set()
+        self._pending = False
+        self._held = 0
+
+    def subscribe(self, topic, callback):
+        """Run callback once per flush in which topic was marked dirty"""
+        self._subscribers.setdefault(topic, []).append(callback)
+
+    def mark(self, topic):
+        """Flag topic as dirty and schedule a flush if none is pending"""
+        self._dirty.add(topic)
+        if not self._pending and not self._held:
+            self._pending = True
+            self._schedule(self.flush)
+
+    def hold(self):
+        """Keep collecting marks without scheduling a flush until release
+
+        Used while a long operation fills tables piecemeal so subscribers
+        run once at the end instead of once per piece. Holds may be nested.
+        """
+        self._held += 1
+
+    def release(self):
+        """End a hold and schedule a flush for anything marked during it"""
+        self._held -= 1
+        if not self._held and self._dirty and not self._pending:
+            self._pending = True
+            self._schedule(self.flush)
+
+    @property
+    def pending(self) -> bool:
+        return self._pending
+
+    def flush(self):
+        """Run the subscribers of all dirty topics now, each at most once"""
+        self._pending = False
+        dirty, self._dirty = self._dirty, set()
+
+        callbacks = []
+        for topic, subscribers in self._subscribers.items():
+            if topic not in dirty:
+                continue
+            for callback in subscribers:
+                if callback not in callbacks:
+                    callbacks.append(callback)
+
+        for callback in callbacks:
+            callback()
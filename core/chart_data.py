@@ -0,0 +1,11 @@
+import numpy as np
+
+
+def rank_order(values: np.ndarray) -> np.ndarray:
+    """Indexes of values from largest to smallest; ties keep their original order"""
+    return np.argsort(-values, kind="stable")
+
+
+def level_count(total, page_size) -> int:
+    """Number of drill-down levels needed to show total items page_size at a time"""
+    return max(1, -(-total // page_size))
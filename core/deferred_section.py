@@ -0,0 +1,60 @@
+from typing import Dict, List
+
+import numpy as np
+
+from core.name_registry import NameRegistry
+
+
+class DeferredSection:
+    """Cell text of an input table held outside its table widget until the rows are shown
+
+    registries maps each name column to the registry its names refer to.
+    Names are resolved to ids once, so renamed and removed products or
+    resources are applied to the text the way the table widgets apply
+    them to their cells. Columns are replaced rather than modified, since
+    the history and the journal keep the lists they were given.
+    """
+
+    def __init__(self, columns: List[List[str]], registries: Dict[int, NameRegistry]):
+        self.columns = columns
+        self.registries = registries
+        self.ids = {}
+        for column, registry in registries.items():
+            names = columns[column]
+            lookup = {name: registry.id_of(name) for name in set(names)}
+            self.ids[column] = np.array([-1 if lookup[name] is None else lookup[name] for name in names],
+                                        dtype=np.int64)
+
+    @property
+    def row_count(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def apply(self, registry, event, entity_id, name):
+        """Apply one "renamed", "removed" or "pruned" registry change to the rows"""
+        for column, column_registry in self.registries.items():
+            if column_registry is not registry:
+                continue
+            if event == "pruned":
+                # Rows naming an id that is no longer registered go; unknown names stay for the validator
+                ids = self.ids[column]
+                self.keep_rows((ids < 0) | np.isin(ids, registry.ids()))
+                continue
+            rows = np.flatnonzero(self.ids[column] == entity_id)
+            if not len(rows):
+                continue
+            if event == "renamed":
+                texts = list(self.columns[column])
+                for row in rows.tolist():
+                    texts[row] = name
+                self.columns = [texts if index == column else cells for index, cells in enumerate(self.columns)]
+            elif event == "removed":
+                # Rows using a removed name go with it
+                self.keep_rows(self.ids[column] != entity_id)
+
+    def keep_rows(self, keep):
+        """Keep only the rows where the boolean array keep is true"""
+        if keep.all():
+            return
+        positions = np.flatnonzero(keep).tolist()
+        self.columns = [[cells[row] for row in positions] for cells in self.columns]
+        self.ids = {index: ids[keep] for index, ids in self.ids.items()}
@@ -0,0 +1,158 @@
+import sys
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Cells per chunk; an edit copies only the chunks it touches
+CHUNK_SIZE = 4096
+
+Chunk = Tuple[str, ...]
+Column = Tuple[Chunk, ...]
+Table = Tuple[Column, ...]
+
+
+class Snapshot(NamedTuple):
+    label: str
+    tables: Dict[str, Table]
+
+
+def _chunk_size(chunk) -> int:
+    return sys.getsizeof(chunk) + sum(map(sys.getsizeof, chunk))
+
+
+def expand(table: Table) -> List[List[str]]:
+    """Turn a stored table back into plain lists of cell text per column"""
+    columns = []
+    for column in table:
+        cells = []
+        for chunk in column:
+            cells.extend(chunk)
+        columns.append(cells)
+    return columns
+
+
+class History:
+    """Undo/redo stack of input table snapshots with structural sharing
+
+    A snapshot stores each column as a tuple of fixed-size chunks. Chunks,
+    columns and tables that did not change are the very same objects as in
+    the previous snapshot, so one edited cell in a 100k-row table costs a
+    single new chunk. Memory is accounted per distinct chunk and the
+    oldest undo steps are dropped once max_bytes is exceeded.
+    """
+
+    def __init__(self, max_bytes=128 * 1024 * 1024, max_steps=200):
+        self.max_bytes = max_bytes
+        self.max_steps = max_steps
+        self._undo: List[Snapshot] = []
+        self._redo: List[Snapshot] = []
+        self._current: Optional[Snapshot] = None
+        # id(chunk) -> [chunk, snapshot reference count, bytes]
+        self._chunks: Dict[int, list] = {}
+        self._bytes = 0
+
+    def _share(self, previous: Optional[Table], columns: Sequence[Sequence[str]]) -> Table:
+        """Build a table reusing every chunk, column and the table itself where unchanged"""
+        new_columns = []
+        for index, cells in enumerate(columns):
+            old_column = previous[index] if previous is not None and index < len(previous) else ()
+            chunks = []
+            for number, start in enumerate(range(0, len(cells), CHUNK_SIZE)):
+                chunk = tuple(cells[start:start + CHUNK_SIZE])
+                if number < len(old_column) and old_column[number] == chunk:
+                    chunk = old_column[number]
+                chunks.append(chunk)
+            column = tuple(chunks)
+            if len(column) == len(old_column) and all(a is b for a, b in zip(column, old_column)):
+                column = old_column
+            new_columns.append(column)
+        table = tuple(new_columns)
+        if previous is not None and len(table) == len(previous) and all(a is b for a, b in zip(table, previous)):
+            return previous
+        return table
+
+    def _retain(self, snapshot, delta):
+        """Adjust chunk reference counts when a snapshot enters or leaves the history"""
+        seen = set()
+        for table in snapshot.tables.values():
+            for column in table:
+                for chunk in column:
+                    key = id(chunk)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    entry = self._chunks.get(key)
+                    if entry is None:
+                        entry = self._chunks[key] = [chunk, 0, _chunk_size(chunk)]
+                        self._bytes += entry[2]
+                    entry[1] += delta
+                    if entry[1] == 0:
+                        self._bytes -= entry[2]
+                        del self._chunks[key]
+
+    def record(self, label, tables: Dict[str, Sequence[Sequence[str]]]) -> bool:
+        """Make the given table contents the current state as one undoable command
+
+        Tables left out keep their contents from the current state.
+        Returns False, recording nothing, when nothing changed.
+        """
+        previous = self._current.tables if self._current else {}
+        shared = {key: self._share(previous.get(key), columns) for key, columns in tables.items()}
+        if self._current and all(shared[key] is previous.get(key) for key in shared):
+            return False
+        shared = {**previous, **shared}
+
+        snapshot = Snapshot(label, shared)
+        self._retain(snapshot, 1)
+        if self._current:
+            self._undo.append(self._current)
+        for dropped in self._redo:
+            self._retain(dropped, -1)
+        self._redo = []
+        self._current = snapshot
+        self._trim()
+        return True
+
+    def _trim(self):
+        """Drop the oldest undo steps until the stack fits its step and memory limits"""
+        while self._undo and (len(self._undo) > self.max_steps or self._bytes > self.max_bytes):
+            self._retain(self._undo.pop(0), -1)
+
+    def undo(self) -> Optional[Snapshot]:
+        """Step back and return the snapshot to restore, or None"""
+        if not self._undo:
+            return None
+        self._redo.append(self._current)
+        self._current = self._undo.pop()
+        return self._current
+
+    def redo(self) -> Optional[Snapshot]:
+        """Step forward again and return the snapshot to restore, or None"""
+        if not self._redo:
+            return None
+        self._undo.append(self._current)
+        self._current = self._redo.pop()
+        return self._current
+
+    @property
+    def current(self) -> Optional[Snapshot]:
+        return self._current
+
+    def undo_label(self) -> Optional[str]:
+        """Label of the command undo would revert"""
+        return self._current.label if self._undo else None
+
+    def redo_label(self) -> Optional[str]:
+        return self._redo[-1].label if self._redo else None
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by all distinct chunks across the stack"""
+        return self._bytes
+
+    def __len__(self):
+        return len(self._undo) + len(self._redo)
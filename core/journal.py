@@ -0,0 +1,263 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+SNAPSHOT_NAME = "snapshot.json"
+JOURNAL_NAME = "journal.jsonl"
+# The journal is folded into a new snapshot once it grows past this
+COMPACT_BYTES = 4 << 20
+SYNC_INTERVAL = 1.0
+# Rows compared per slice when looking for the changed range
+BLOCK_ROWS = 1024
+# Lower estimate of the journaled size of one cell
+CELL_BYTES = 4
+
+Tables = Dict[str, List[List[str]]]
+
+
+def _common_prefix(old: Sequence[List[str]], new: Sequence[List[str]], limit) -> int:
+    """Number of leading rows equal in every column, up to limit"""
+    start = 0
+    while start < limit:
+        stop = min(start + BLOCK_ROWS, limit)
+        if all(a[start:stop] == b[start:stop] for a, b in zip(old, new)):
+            start = stop
+            continue
+        # Slices compare in C; only the first unequal block is walked row by row
+        while all(a[start] == b[start] for a, b in zip(old, new)):
+            start += 1
+        return start
+    return limit
+
+
+def _common_suffix(old: Sequence[List[str]], new: Sequence[List[str]], limit) -> int:
+    """Number of trailing rows equal in every column, up to limit"""
+    old_count, new_count = len(old[0]), len(new[0])
+    count = 0
+    while count < limit:
+        size = min(BLOCK_ROWS, limit - count)
+        if all(a[old_count - count - size:old_count - count] == b[new_count - count - size:new_count - count]
+               for a, b in zip(old, new)):
+            count += size
+            continue
+        while all(a[old_count - count - 1] == b[new_count - count - 1] for a, b in zip(old, new)):
+            count += 1
+        return count
+    return limit
+
+
+def changed_rows(old: Sequence[List[str]], new: Sequence[List[str]]) -> Optional[Tuple[int, int, int]]:
+    """The row range that differs between two versions of a table, or None if nothing changed
+
+    Returns (start, old_stop, new_stop): rows start to old_stop of the
+    old columns were replaced by rows start to new_stop of the new ones.
+    """
+    if not new:
+        return None
+    old_count, new_count = (len(old[0]) if old else 0), len(new[0])
+    if len(old) != len(new):
+        return (0, old_count, new_count) if new_count or old_count else None
+    start = _common_prefix(old, new, min(old_count, new_count))
+    if start == old_count == new_count:
+        return None
+    end = _common_suffix(old, new, min(old_count, new_count) - start)
+    return start, old_count - end, new_count - end
+
+
+def splice(old: Sequence[List[str]], new: Sequence[List[str]]) -> Optional[Tuple[int, int, List[List[str]]]]:
+    """The single row range replacement turning the old columns into the new ones
+
+    Returns (start, delete_count, rows) where rows are the new rows as
+    lists of cell text, or None if nothing changed. An edited cell, an
+    inserted or a removed row each give a splice of about one row.
+    """
+    change = changed_rows(old, new)
+    if change is None:
+        return None
+    start, old_stop, new_stop = change
+    return start, old_stop - start, [list(row) for row in zip(*(column[start:new_stop] for column in new))]
+
+
+def apply_splice(columns: List[List[str]], start, delete_count, rows: List[List[str]]):
+    """Replace delete_count rows from start with rows, in place"""
+    if not columns and rows:
+        columns.extend([] for _ in rows[0])
+    new_columns = list(zip(*rows)) if rows else [()] * len(columns)
+    for column, cells in zip(columns, new_columns):
+        column[start:start + delete_count] = cells
+
+
+class EditJournal:
+    """Append-only journal of input table edits for autosave and crash recovery
+
+    The directory holds a snapshot of every table's cell text plus a
+    journal of the changes made since, one JSON line each. A change is
+    stored as the row range it replaced, so editing one cell of a large
+    table appends a line of a few dozen bytes. Lines are flushed to the
+    operating system as they are written, which survives the app
+    crashing, and fsynced at most every SYNC_INTERVAL seconds, which
+    survives the machine going down. Once the journal passes
+    compact_bytes it is folded into a new snapshot.
+
+    Snapshot and journal carry a generation number; a journal whose
+    generation differs from the snapshot is already part of it and is
+    ignored, so a crash during compaction never replays a change twice.
+    """
+
+    def __init__(self, directory, compact_bytes=COMPACT_BYTES, sync_interval=SYNC_INTERVAL):
+        self.directory = directory
+        self.compact_bytes = compact_bytes
+        self.sync_interval = sync_interval
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_NAME)
+        self.journal_path = os.path.join(directory, JOURNAL_NAME)
+        self.tables: Tables = {}
+        self.settings: Dict[str, Any] = {}
+        self.generation = 0
+        self.journal_bytes = 0
+        self._file = None
+        self._dirty = False
+        self._last_sync = 0.0
+
+    def recoverable(self) -> bool:
+        """Whether a previous session left edits behind"""
+        return os.path.exists(self.snapshot_path) or os.path.exists(self.journal_path)
+
+    def recover(self) -> Optional[Tuple[Tables, Dict[str, Any]]]:
+        """Tables and settings as the previous session last journaled them, or None
+
+        A line cut short by a crash, or one that is not a whole entry, ends
+        the replay; everything before it is kept.
+        """
+        generation, tables, settings = 0, {}, {}
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            generation, tables, settings = snapshot["generation"], snapshot["tables"], snapshot["settings"]
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError):
+            return None
+
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                if isinstance(header, dict) and header.get("generation") == generation:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                            if entry["op"] == "splice":
+                                apply_splice(tables.setdefault(entry["table"], []), entry["start"],
+                                             entry["delete"], entry["rows"])
+                            elif entry["op"] == "settings":
+                                settings = entry["settings"]
+                        except (ValueError, KeyError, TypeError):
+                            break
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            pass
+        return (tables, settings) if tables or settings else None
+
+    def start(self, tables: Tables, settings: Dict[str, Any]):
+        """Begin journaling from the given state, replacing whatever was left behind"""
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                self.generation = int(json.load(f)["generation"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self.generation = 0
+        self.compact(tables, settings)
+
+    def compact(self, tables: Tables, settings: Dict[str, Any]):
+        """Write the state as a new snapshot and start an empty journal after it"""
+        self.tables = dict(tables)
+        self.settings = dict(settings)
+        self.generation += 1
+        temporary = self.snapshot_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            # dumps runs the C encoder; dump would encode in Python
+            f.write(json.dumps({"generation": self.generation, "settings": self.settings, "tables": self.tables},
+                               separators=(",", ":")))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.snapshot_path)
+
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.journal_path, "w", encoding="utf-8")
+        self._write(json.dumps({"generation": self.generation}) + "\n")
+        self.journal_bytes = 0
+        self.sync(force=True)
+
+    def _write(self, line):
+        self._file.write(line)
+        self._file.flush()
+        self._dirty = True
+
+    def record(self, tables: Optional[Tables] = None, settings: Optional[Dict[str, Any]] = None) -> int:
+        """Journal whatever differs from the last recorded state and return the bytes written
+
+        A change too large for the journal is written as a new snapshot
+        instead, which also counts as written bytes. Nothing is recorded
+        before start. The journal keeps the given columns to diff the next
+        call against, so they must not be modified afterwards.
+        """
+        if self._file is None:
+            return 0
+        lines = []
+        if tables is not None:
+            for key, columns in tables.items():
+                old = self.tables.get(key, [])
+                change = changed_rows(old, columns)
+                if change is None:
+                    continue
+                start, old_stop, new_stop = change
+                if (new_stop - start) * len(columns) * CELL_BYTES > self.compact_bytes:
+                    # Bigger than the journal may grow, so skip straight to the snapshot
+                    lines = None
+                    break
+                rows = [list(row) for row in zip(*(column[start:new_stop] for column in columns))]
+                lines.append(json.dumps({"op": "splice", "table": key, "start": start,
+                                         "delete": old_stop - start, "rows": rows}, separators=(",", ":")))
+        if lines is None:
+            self.compact({**self.tables, **tables}, settings if settings is not None else self.settings)
+            return os.path.getsize(self.snapshot_path)
+        if settings is not None and settings != self.settings:
+            lines.append(json.dumps({"op": "settings", "settings": settings}, separators=(",", ":")))
+        if not lines:
+            return 0
+
+        text = "\n".join(lines) + "\n"
+        if self.journal_bytes + len(text) > self.compact_bytes:
+            self.compact({**self.tables, **(tables or {})}, settings if settings is not None else self.settings)
+            return os.path.getsize(self.snapshot_path)
+        self._write(text)
+        self.journal_bytes += len(text)
+        if tables is not None:
+            self.tables.update(tables)
+        if settings is not None:
+            self.settings = dict(settings)
+        if time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+        return len(text)
+
+    def sync(self, force=False):
+        """fsync lines written since the last sync"""
+        if self._file is not None and (self._dirty or force):
+            os.fsync(self._file.fileno())
+            self._dirty = False
+            self._last_sync = time.monotonic()
+
+    def close(self, discard=False):
+        """Stop journaling; discard removes the files so the next start has nothing to recover"""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+        if discard:
+            for path in (self.journal_path, self.snapshot_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
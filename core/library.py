@@ -0,0 +1,317 @@
+import io
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.model_store import ScenarioStore
+from core.mps import is_mps_path, read_mps_file
+from core.result_export import ResultArrays, write_results_binary
+from core.scenario_binary import (ARRAYS, BINARY_SUFFIX, ScenarioArrays, binary_arrays, is_binary_scenario,
+                                  scenario_arrays, write_binary_arrays)
+from core.scenario_stream import SECTION_FIELDS, SECTIONS, ScenarioReader, section_columns
+
+SCENARIO_SUFFIXES = (".json", BINARY_SUFFIX, ".mps", ".mps.gz")
+
+# Blobs live in their own tables so the metadata tables stay a few pages that a search scans quickly
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL COLLATE NOCASE,
+    source TEXT,
+    saved_at REAL NOT NULL,
+    objective TEXT,
+    product_count INTEGER NOT NULL,
+    resource_count INTEGER NOT NULL,
+    usage_count INTEGER NOT NULL,
+    demand_count INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scenarios_name ON scenarios (name);
+CREATE INDEX IF NOT EXISTS scenarios_size ON scenarios (size);
+CREATE INDEX IF NOT EXISTS scenarios_saved_at ON scenarios (saved_at);
+CREATE INDEX IF NOT EXISTS scenarios_source ON scenarios (source);
+CREATE TABLE IF NOT EXISTS scenario_blobs (
+    scenario_id INTEGER PRIMARY KEY REFERENCES scenarios (id) ON DELETE CASCADE,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scenario_tags (
+    tag TEXT NOT NULL COLLATE NOCASE,
+    scenario_id INTEGER NOT NULL REFERENCES scenarios (id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, scenario_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS scenario_tags_scenario ON scenario_tags (scenario_id);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    scenario_id INTEGER NOT NULL REFERENCES scenarios (id) ON DELETE CASCADE,
+    saved_at REAL NOT NULL,
+    optimizer TEXT,
+    status TEXT,
+    objective_value REAL
+);
+CREATE INDEX IF NOT EXISTS results_scenario ON results (scenario_id);
+CREATE INDEX IF NOT EXISTS results_optimizer ON results (optimizer, objective_value);
+CREATE INDEX IF NOT EXISTS results_objective_value ON results (objective_value);
+CREATE TABLE IF NOT EXISTS result_blobs (
+    result_id INTEGER PRIMARY KEY REFERENCES results (id) ON DELETE CASCADE,
+    data BLOB NOT NULL
+);
+"""
+
+_ENTRY_QUERY = """
+SELECT s.id, s.name, (SELECT group_concat(tag, ' ') FROM scenario_tags WHERE scenario_id = s.id), s.source,
+       s.saved_at, s.objective, s.product_count, s.resource_count, s.usage_count, s.demand_count,
+       (SELECT count(*) FROM results WHERE scenario_id = s.id),
+       (SELECT CASE WHEN s.objective LIKE 'minimize%' THEN min(objective_value) ELSE max(objective_value) END
+        FROM results WHERE scenario_id = s.id)
+FROM scenarios s
+"""
+
+
+class LibraryEntry(NamedTuple):
+    id: int
+    name: str
+    tags: Tuple[str, ...]
+    source: Optional[str]
+    saved_at: float
+    objective: Optional[str]
+    product_count: int
+    resource_count: int
+    usage_count: int
+    demand_count: int
+    result_count: int
+    best_objective_value: Optional[float]
+
+
+class ResultEntry(NamedTuple):
+    id: int
+    scenario_id: int
+    saved_at: float
+    optimizer: Optional[str]
+    status: Optional[str]
+    objective_value: Optional[float]
+
+
+def split_tags(text) -> List[str]:
+    """Tags typed as one line, separated by commas or spaces"""
+    return sorted({tag for tag in text.replace(",", " ").lower().split()})
+
+
+def _escape_like(text) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _blob(write, value) -> bytes:
+    buffer = io.BytesIO()
+    write(buffer, value)
+    return buffer.getvalue()
+
+
+def json_scenario_arrays(path) -> Dict[str, np.ndarray]:
+    """Arrays of a scenario JSON file, read through a model store as if loaded into the tables"""
+    columns = {section: [[] for _ in SECTION_FIELDS[section]] for section in SECTIONS}
+    with open(path, "rb") as f:
+        reader = ScenarioReader(f)
+        for section, rows in reader:
+            for column, texts in zip(columns[section], section_columns(section, rows)):
+                column.extend(texts)
+    if not any(columns[section][0] for section in SECTIONS):
+        raise ValueError("Not a scenario: no products, resources or usage")
+    store = ScenarioStore()
+    for registry, names in ((store.product_registry, columns["products"][0]),
+                            (store.resource_registry, columns["resources"][0])):
+        for name in dict.fromkeys(name.strip() for name in names):
+            if name:
+                registry.add(name)
+    store.load_table_text(columns)
+    return scenario_arrays(store, reader.settings)
+
+
+def scenario_file_blob(path) -> bytes:
+    """A scenario file of any supported format as a binary scenario"""
+    if is_mps_path(path):
+        model = read_mps_file(path)
+        return _blob(write_binary_arrays, {name: model[name] for name, _ in ARRAYS})
+    if is_binary_scenario(path):
+        with open(path, "rb") as f:
+            data = f.read()
+        ScenarioArrays(binary_arrays(data))
+        return data
+    return _blob(write_binary_arrays, json_scenario_arrays(path))
+
+
+class ScenarioLibrary:
+    """Scenarios and their optimization results in a local SQLite database
+
+    Each scenario is stored as a binary scenario blob next to indexed
+    metadata: name, tags, table sizes and the best objective value of its
+    results. Searching and listing only read the metadata, so they stay
+    fast however large the stored scenarios are. A library object must be
+    used from the thread that opened it.
+    """
+
+    def __init__(self, path):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def add_scenario(self, name, data: bytes, tags: Iterable[str] = (), source=None) -> int:
+        """Store a binary scenario and return its id"""
+        scenario = ScenarioArrays(binary_arrays(data))
+        counts = scenario.row_counts()
+        with self.connection:
+            scenario_id = self.connection.execute(
+                "INSERT INTO scenarios (name, source, saved_at, objective, product_count, resource_count, "
+                "usage_count, demand_count, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (name, source, time.time(), scenario.settings.get("objective"), counts["products"],
+                 counts["resources"], counts["resource_usage"], counts["demand_constraints"],
+                 sum(counts.values()))
+            ).lastrowid
+            self.connection.execute("INSERT INTO scenario_blobs VALUES (?, ?)", (scenario_id, data))
+            self._insert_tags(scenario_id, tags)
+        return scenario_id
+
+    def add_store(self, name, store, settings: Dict[str, Any], tags: Iterable[str] = ()) -> int:
+        """Store the scenario held in a ScenarioStore"""
+        return self.add_scenario(name, _blob(write_binary_arrays, scenario_arrays(store, settings)), tags)
+
+    def import_files(self, paths: Sequence[str], tags: Iterable[str] = (),
+                     progress: Optional[Callable[[int, int], None]] = None) -> Tuple[int, List[Tuple[str, str]]]:
+        """Add scenario files not stored yet, named after the file
+
+        Returns the number added and (path, error) for each file that
+        could not be read. progress is called with (done, total).
+        """
+        tags = list(tags)
+        added, failed = 0, []
+        for done, path in enumerate(paths, 1):
+            source = os.path.abspath(path)
+            if self.connection.execute("SELECT 1 FROM scenarios WHERE source = ?", (source,)).fetchone() is None:
+                try:
+                    name = os.path.basename(path).split(".")[0]
+                    self.add_scenario(name, scenario_file_blob(path), tags, source)
+                    added += 1
+                except (OSError, ValueError) as e:
+                    failed.append((path, str(e)))
+            if progress is not None:
+                progress(done, len(paths))
+        return added, failed
+
+    def _insert_tags(self, scenario_id, tags):
+        self.connection.executemany("INSERT OR IGNORE INTO scenario_tags VALUES (?, ?)",
+                                    [(tag.lower(), scenario_id) for tag in tags])
+
+    def set_tags(self, scenario_id, tags: Iterable[str]):
+        with self.connection:
+            self.connection.execute("DELETE FROM scenario_tags WHERE scenario_id = ?", (scenario_id,))
+            self._insert_tags(scenario_id, tags)
+
+    def rename(self, scenario_id, name):
+        with self.connection:
+            self.connection.execute("UPDATE scenarios SET name = ? WHERE id = ?", (name, scenario_id))
+
+    def delete(self, scenario_id):
+        """Remove a scenario with its tags and results"""
+        with self.connection:
+            self.connection.execute("DELETE FROM scenarios WHERE id = ?", (scenario_id,))
+
+    def scenario_data(self, scenario_id) -> bytes:
+        row = self.connection.execute("SELECT data FROM scenario_blobs WHERE scenario_id = ?",
+                                      (scenario_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Scenario {scenario_id} is not in the library")
+        return row[0]
+
+    def scenario(self, scenario_id) -> ScenarioArrays:
+        return ScenarioArrays(binary_arrays(self.scenario_data(scenario_id)))
+
+    def add_result(self, scenario_id, result: ResultArrays) -> int:
+        """Store an optimization result of a library scenario as a NumPy archive blob"""
+        objective_value = result.summary.get("objective_value")
+        with self.connection:
+            result_id = self.connection.execute(
+                "INSERT INTO results (scenario_id, saved_at, optimizer, status, objective_value) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (scenario_id, time.time(), result.run.get("optimizer"), result.summary.get("status"),
+                 objective_value if isinstance(objective_value, (int, float)) else None)
+            ).lastrowid
+            self.connection.execute("INSERT INTO result_blobs VALUES (?, ?)",
+                                    (result_id, _blob(write_results_binary, [result])))
+        return result_id
+
+    def results(self, scenario_id) -> List[ResultEntry]:
+        rows = self.connection.execute(
+            "SELECT id, scenario_id, saved_at, optimizer, status, objective_value FROM results "
+            "WHERE scenario_id = ? ORDER BY saved_at DESC", (scenario_id,)
+        )
+        return [ResultEntry(*row) for row in rows]
+
+    def optimizers(self) -> List[str]:
+        """Optimizers that produced a stored result"""
+        rows = self.connection.execute("SELECT DISTINCT optimizer FROM results WHERE optimizer IS NOT NULL ORDER BY 1")
+        return [row[0] for row in rows]
+
+    def tags(self) -> List[Tuple[str, int]]:
+        """Every tag with the number of scenarios carrying it"""
+        return self.connection.execute(
+            "SELECT tag, count(*) FROM scenario_tags GROUP BY tag ORDER BY tag"
+        ).fetchall()
+
+    def search(self, name="", tags: Iterable[str] = (), min_size=None, max_size=None, optimizer=None,
+               target_objective_value=None, limit=1000) -> List[LibraryEntry]:
+        """Scenarios matching every given condition, newest first
+
+        name matches the start of the scenario name ignoring case, each tag
+        must be present, size is the total number of table rows and
+        optimizer and target_objective_value match scenarios with a result
+        that has both; a result reaches the target when its objective value
+        is at least the target, or at most for a minimize objective.
+        """
+        conditions, parameters = [], []
+        if name:
+            conditions.append("s.name LIKE ? ESCAPE '\\'")
+            parameters.append(_escape_like(name) + "%")
+        for tag in tags:
+            conditions.append("s.id IN (SELECT scenario_id FROM scenario_tags WHERE tag = ?)")
+            parameters.append(tag.lower())
+        if min_size is not None:
+            conditions.append("s.size >= ?")
+            parameters.append(min_size)
+        if max_size is not None:
+            conditions.append("s.size <= ?")
+            parameters.append(max_size)
+        if optimizer is not None or target_objective_value is not None:
+            result_conditions = ["scenario_id = s.id"]
+            if optimizer is not None:
+                result_conditions.append("optimizer = ?")
+                parameters.append(optimizer)
+            if target_objective_value is not None:
+                result_conditions.append("CASE WHEN s.objective LIKE 'minimize%' THEN objective_value <= ? "
+                                         "ELSE objective_value >= ? END")
+                parameters += [target_objective_value, target_objective_value]
+            conditions.append(f"EXISTS (SELECT 1 FROM results WHERE {' AND '.join(result_conditions)})")
+        query = _ENTRY_QUERY
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY s.saved_at DESC LIMIT ?"
+        rows = self.connection.execute(query, parameters + [limit])
+        return [LibraryEntry(row[0], row[1], tuple((row[2] or "").split()), *row[3:]) for row in rows]
+
+
+def scenario_files(folder) -> List[str]:
+    """Every scenario file below a folder"""
+    return sorted(
+        os.path.join(directory, file_name)
+        for directory, _, file_names in os.walk(folder)
+        for file_name in file_names
+        if file_name.lower().endswith(SCENARIO_SUFFIXES)
+    )
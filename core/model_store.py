@@ -0,0 +1,274 @@
+import math
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+
+from core.name_registry import NameRegistry
+from core.validation import parse_numeric
+
+# Demand bound that is not set
+NO_BOUND = math.nan
+
+
+class ColumnTable:
+    """Rows held as one typed NumPy array per field
+
+    Arrays grow by doubling, so appends are amortized O(1), and every
+    column is available as a zero-copy view for vectorized reads.
+    """
+
+    def __init__(self, **dtypes):
+        self._dtypes = dtypes
+        self._columns = {name: np.empty(16, dtype=dtype) for name, dtype in dtypes.items()}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._dtypes)
+
+    def column(self, name) -> np.ndarray:
+        """View of one field over the used rows"""
+        return self._columns[name][:self._size]
+
+    def row(self, index) -> Dict[str, Any]:
+        return {name: column[index].item() for name, column in self._columns.items()}
+
+    def _reserve(self, size):
+        capacity = len(next(iter(self._columns.values())))
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def append(self, **values) -> int:
+        """Add one row and return its index"""
+        index = self._size
+        self._reserve(index + 1)
+        for name, column in self._columns.items():
+            column[index] = values[name]
+        self._size += 1
+        return index
+
+    def extend(self, **columns):
+        """Add many rows from equally long sequences, one per field"""
+        count = len(next(iter(columns.values())))
+        start = self._size
+        self._reserve(start + count)
+        for name, column in self._columns.items():
+            column[start:start + count] = columns[name]
+        self._size += count
+
+    def set(self, index, name, value):
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        self._columns[name][index] = value
+
+    def keep(self, mask):
+        """Keep only the rows where mask is true, preserving their order"""
+        count = int(np.count_nonzero(mask))
+        for name, column in self._columns.items():
+            column[:count] = column[:self._size][mask]
+        self._size = count
+
+    def delete(self, index):
+        mask = np.ones(self._size, dtype=bool)
+        mask[index] = False
+        self.keep(mask)
+
+    def clear(self):
+        self._size = 0
+
+    def find(self, **values) -> int:
+        """Index of the first row matching all given field values, or -1"""
+        mask = np.ones(self._size, dtype=bool)
+        for name, value in values.items():
+            mask &= self.column(name) == value
+        matches = np.flatnonzero(mask)
+        return int(matches[0]) if len(matches) else -1
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the rows in use"""
+        return sum(column.itemsize * self._size for column in self._columns.values())
+
+
+class ScenarioStore:
+    """Compact in-memory scenario shared by both frontends
+
+    Names are interned in the product and resource registries and every
+    table stores their integer ids, so a row costs a few fixed-width
+    numbers instead of a dict with string keys. Missing demand bounds
+    are NaN.
+    """
+
+    def __init__(self, product_registry=None, resource_registry=None):
+        self.product_registry = product_registry if product_registry is not None else NameRegistry()
+        self.resource_registry = resource_registry if resource_registry is not None else NameRegistry()
+        self.products = ColumnTable(id=np.int32, profit_per_unit=np.float64, cost_per_unit=np.float64)
+        self.resources = ColumnTable(id=np.int32, available_capacity=np.float64)
+        self.resource_usage = ColumnTable(product_id=np.int32, resource_id=np.int32, usage_per_unit=np.float64)
+        self.demand_constraints = ColumnTable(product_id=np.int32, min_demand=np.float64, max_demand=np.float64)
+
+    @property
+    def nbytes(self) -> int:
+        return (self.products.nbytes + self.resources.nbytes
+                + self.resource_usage.nbytes + self.demand_constraints.nbytes)
+
+    @staticmethod
+    def _ids_for(registry, names) -> np.ndarray:
+        """Resolve a column of names to ids, -1 where the name is not registered"""
+        lookup = {name: registry.id_of(name.strip()) for name in set(names)}
+        return np.array([-1 if lookup[name] is None else lookup[name] for name in names], dtype=np.int64)
+
+    @staticmethod
+    def _amounts(texts) -> np.ndarray:
+        values, blank, _ = parse_numeric(texts)
+        values[blank] = 0.0
+        return values
+
+    def load_table_text(self, tables):
+        """Replace the contents with the cell text of the input tables
+
+        tables maps each section to its columns of text in table order;
+        sections left out keep their rows. Rows with an empty or
+        unregistered name are left out, blank amounts count as 0 and blank
+        demand bounds are not set.
+        """
+        if "products" in tables:
+            names, profits, costs = tables["products"]
+            ids = self._ids_for(self.product_registry, names)
+            keep = ids >= 0
+            self.products.clear()
+            self.products.extend(id=ids[keep], profit_per_unit=self._amounts(profits)[keep],
+                                 cost_per_unit=self._amounts(costs)[keep])
+
+        if "resources" in tables:
+            names, capacities = tables["resources"]
+            ids = self._ids_for(self.resource_registry, names)
+            keep = ids >= 0
+            self.resources.clear()
+            self.resources.extend(id=ids[keep], available_capacity=self._amounts(capacities)[keep])
+
+        if "resource_usage" in tables:
+            products, resources, usages = tables["resource_usage"]
+            product_ids = self._ids_for(self.product_registry, products)
+            resource_ids = self._ids_for(self.resource_registry, resources)
+            keep = (product_ids >= 0) & (resource_ids >= 0)
+            self.resource_usage.clear()
+            self.resource_usage.extend(product_id=product_ids[keep], resource_id=resource_ids[keep],
+                                       usage_per_unit=self._amounts(usages)[keep])
+
+        if "demand_constraints" in tables:
+            products, min_demands, max_demands = tables["demand_constraints"]
+            product_ids = self._ids_for(self.product_registry, products)
+            keep = product_ids >= 0
+            self.demand_constraints.clear()
+            # Unparseable bounds become NaN like blank ones; the validator reports them
+            self.demand_constraints.extend(product_id=product_ids[keep],
+                                           min_demand=parse_numeric(min_demands)[0][keep],
+                                           max_demand=parse_numeric(max_demands)[0][keep])
+
+    def table_text(self) -> Dict[str, List[List[str]]]:
+        """The contents as columns of cell text, in the layout load_table_text reads"""
+        def texts(values):
+            return ["" if math.isnan(value) else repr(value) for value in values.tolist()]
+
+        return {
+            "products": [self.names_for(self.product_registry, self.products.column("id")),
+                         texts(self.products.column("profit_per_unit")),
+                         texts(self.products.column("cost_per_unit"))],
+            "resources": [self.names_for(self.resource_registry, self.resources.column("id")),
+                          texts(self.resources.column("available_capacity"))],
+            "resource_usage": [self.names_for(self.product_registry, self.resource_usage.column("product_id")),
+                               self.names_for(self.resource_registry, self.resource_usage.column("resource_id")),
+                               texts(self.resource_usage.column("usage_per_unit"))],
+            "demand_constraints": [self.names_for(self.product_registry, self.demand_constraints.column("product_id")),
+                                   texts(self.demand_constraints.column("min_demand")),
+                                   texts(self.demand_constraints.column("max_demand"))],
+        }
+
+    def restore_table_text(self, tables):
+        """Replace the contents and the registered names with columns from table_text
+
+        Names the products and resources no longer list are pruned and
+        new ones registered first, so every row of tables resolves.
+        """
+        for registry, names in ((self.product_registry, tables["products"][0]),
+                                (self.resource_registry, tables["resources"][0])):
+            listed = set(names)
+            registry.prune([entity_id for entity_id, name in registry.items() if name not in listed])
+            for name in names:
+                if name not in registry:
+                    registry.add(name)
+        self.load_table_text(tables)
+
+    @staticmethod
+    def names_for(registry, ids) -> List[str]:
+        """Resolve a column of ids to names against one snapshot of the registry"""
+        lookup = dict(registry.items())
+        return [lookup.get(entity_id, "") for entity_id in ids.tolist()]
+
+    @staticmethod
+    def registered(registry, ids) -> np.ndarray:
+        """Mask of the ids in a column that are still registered"""
+        return np.isin(ids, registry.ids())
+
+    def products_data(self, start=0, stop=None) -> List[Dict[str, Any]]:
+        """Products in API format, optionally only rows start to stop"""
+        rows = slice(start, stop)
+        names = self.names_for(self.product_registry, self.products.column("id")[rows])
+        return [
+            {"name": name, "profit_per_unit": profit, "cost_per_unit": cost}
+            for name, profit, cost in zip(names,
+                                          self.products.column("profit_per_unit")[rows].tolist(),
+                                          self.products.column("cost_per_unit")[rows].tolist())
+        ]
+
+    def resources_data(self, start=0, stop=None) -> List[Dict[str, Any]]:
+        """Resources in API format"""
+        rows = slice(start, stop)
+        names = self.names_for(self.resource_registry, self.resources.column("id")[rows])
+        return [
+            {"name": name, "available_capacity": capacity}
+            for name, capacity in zip(names, self.resources.column("available_capacity")[rows].tolist())
+        ]
+
+    def resource_usage_data(self, start=0, stop=None) -> List[Dict[str, Any]]:
+        """Resource usage in API format"""
+        rows = slice(start, stop)
+        products = self.names_for(self.product_registry, self.resource_usage.column("product_id")[rows])
+        resources = self.names_for(self.resource_registry, self.resource_usage.column("resource_id")[rows])
+        return [
+            {"product_name": product, "resource_name": resource, "usage_per_unit": usage}
+            for product, resource, usage in zip(products, resources,
+                                                self.resource_usage.column("usage_per_unit")[rows].tolist())
+        ]
+
+    def demand_constraints_data(self, start=0, stop=None) -> List[Dict[str, Any]]:
+        """Demand constraints in API format; NaN bounds are left out"""
+        rows = slice(start, stop)
+        products = self.names_for(self.product_registry, self.demand_constraints.column("product_id")[rows])
+        constraints = []
+        for product, min_demand, max_demand in zip(products,
+                                                   self.demand_constraints.column("min_demand")[rows].tolist(),
+                                                   self.demand_constraints.column("max_demand")[rows].tolist()):
+            constraint = {"product_name": product}
+            if not math.isnan(min_demand):
+                constraint["min_demand"] = min_demand
+            if not math.isnan(max_demand):
+                constraint["max_demand"] = max_demand
+            constraints.append(constraint)
+        return constraints
+
+    def section_batches(self, section, batch_rows=10000) -> Iterator[List[Dict[str, Any]]]:
+        """Entries of one section in API format, batch_rows at a time"""
+        read = getattr(self, f"{section}_data")
+        for start in range(0, len(getattr(self, section)), batch_rows):
+            yield read(start, start + batch_rows)
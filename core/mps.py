@@ -0,0 +1,291 @@
+import gzip
+import io
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from core.scenario_binary import ScenarioArrays, encode_names, scenario_arrays
+
+# Rows with a fixed meaning; any other L row is a resource
+OBJECTIVE_ROWS = ("PROFIT", "COST")
+TOTAL_ROWS = {"TOTAL_MIN": "min_total", "TOTAL_MAX": "max_total"}
+SECTIONS = {"NAME", "OBJSENSE", "OBJSENSE MAX", "OBJSENSE MIN", "ROWS", "COLUMNS", "RHS", "RANGES", "BOUNDS", "ENDATA"}
+# Bound types that carry a value
+VALUE_BOUNDS = {"UP", "LO", "FX", "LI", "UI", "SC"}
+PROGRESS_LINES = 65536
+
+
+def is_mps_path(path) -> bool:
+    name = path.lower()
+    return name.endswith(".mps") or name.endswith(".mps.gz")
+
+
+def open_mps(path, mode="wt"):
+    """Open an MPS file for writing, gzip-compressed if the name ends in .gz"""
+    if path.lower().endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+class MpsModel(ScenarioArrays):
+    """Product-mix LP read from an MPS file and mapped onto the scenario sections
+
+    warnings lists the parts of the file that have no scenario equivalent
+    and were left out.
+    """
+
+    def __init__(self, arrays, warnings: List[str]):
+        super().__init__(arrays)
+        self.warnings = warnings
+
+
+def read_mps(file, progress: Optional[Callable[[], None]] = None) -> MpsModel:
+    """Read a free- or fixed-format MPS file of a product-mix LP line by line
+
+    Columns become products and L rows resources, with the right-hand side
+    as available capacity. N rows called PROFIT and COST give the per-unit
+    profit and cost; otherwise the objective row is profit when maximizing
+    (or minimizing negated profit) and cost when minimizing. Column bounds
+    become demand bounds, and rows called TOTAL_MIN and TOTAL_MAX the total
+    production constraints. Names may not contain spaces. progress, if
+    given, is called every PROGRESS_LINES lines.
+    """
+    section = None
+    sense = None
+    objective_rows: Dict[str, List[float]] = {}
+    resources: Dict[str, int] = {}
+    total_rows: Dict[str, List[float]] = {}
+    other_rows = set()
+    products: Dict[str, int] = {}
+    usage_products, usage_resources, usage_values = [], [], []
+    capacities: List[float] = []
+    totals: Dict[str, float] = {}
+    min_demands: Dict[int, float] = {}
+    max_demands: Dict[int, float] = {}
+    warnings = []
+    skipped_bounds = set()
+    current_name, current = None, -1
+
+    for number, line in enumerate(file, 1):
+        if progress is not None and not number % PROGRESS_LINES:
+            progress()
+        if not line.strip() or line.startswith("*"):
+            continue
+        tokens = line.split()
+        try:
+            if not line[0].isspace():
+                section = " ".join(tokens[:2]).upper() if tokens[0].upper() == "OBJSENSE" else tokens[0].upper()
+                if section not in SECTIONS:
+                    raise ValueError(f"unknown section {tokens[0]}")
+                if section.startswith("OBJSENSE "):
+                    sense, section = section.split()[1], "OBJSENSE"
+                elif section == "RANGES":
+                    warnings.append("Row ranges were ignored")
+                elif section == "ENDATA":
+                    break
+                continue
+
+            if section == "COLUMNS":
+                if len(tokens) > 2 and tokens[1] == "'MARKER'":
+                    continue
+                if tokens[0] != current_name:
+                    current_name = tokens[0]
+                    current = products.get(current_name)
+                    if current is None:
+                        current = products[current_name] = len(products)
+                        for coefficients in objective_rows.values():
+                            coefficients.append(0.0)
+                for row, value in zip(tokens[1::2], tokens[2::2]):
+                    resource = resources.get(row)
+                    if resource is not None:
+                        usage_products.append(current)
+                        usage_resources.append(resource)
+                        usage_values.append(float(value))
+                    elif row in objective_rows:
+                        objective_rows[row][current] = float(value)
+                    elif row in total_rows:
+                        total_rows[row].append(float(value))
+                    elif row not in other_rows:
+                        raise ValueError(f"unknown row {row}")
+            elif section == "ROWS":
+                row_type, row = tokens[0].upper(), tokens[1]
+                if row_type == "N":
+                    objective_rows[row] = []
+                elif row.upper() in TOTAL_ROWS:
+                    total_rows[row] = []
+                elif row_type == "L":
+                    resources[row] = len(resources)
+                    capacities.append(0.0)
+                else:
+                    other_rows.add(row)
+            elif section == "RHS":
+                # The RHS set name is optional in free MPS
+                for row, value in zip(tokens[len(tokens) % 2::2], tokens[len(tokens) % 2 + 1::2]):
+                    if row in resources:
+                        capacities[resources[row]] = float(value)
+                    elif row in total_rows:
+                        totals[TOTAL_ROWS[row.upper()]] = float(value)
+            elif section == "BOUNDS":
+                bound_type = tokens[0].upper()
+                has_value = bound_type in VALUE_BOUNDS
+                column = tokens[-2] if has_value else tokens[-1]
+                if column not in products:
+                    raise ValueError(f"bound on unknown column {column}")
+                product = products[column]
+                if bound_type in ("LO", "LI", "FX"):
+                    min_demands[product] = float(tokens[-1])
+                if bound_type in ("UP", "UI", "FX"):
+                    max_demands[product] = float(tokens[-1])
+                if bound_type not in ("LO", "LI", "UP", "UI", "FX"):
+                    skipped_bounds.add(bound_type)
+            elif section == "OBJSENSE":
+                sense = tokens[0].upper()
+            elif section is None:
+                raise ValueError("data before the first section")
+        except (ValueError, IndexError) as error:
+            raise ValueError(f"Invalid MPS file, line {number}: {error}") from None
+
+    if other_rows:
+        warnings.append(f"{len(other_rows)} G or E rows other than TOTAL_MIN were ignored")
+    if skipped_bounds:
+        warnings.append(f"Bounds of type {', '.join(sorted(skipped_bounds))} were ignored")
+    for row, coefficients in total_rows.items():
+        if len(coefficients) != len(products) or any(value != 1 for value in coefficients):
+            warnings.append(f"{row} was read as a total even though not every product has coefficient 1")
+
+    product_count = len(products)
+    by_name = {row.upper(): coefficients for row, coefficients in objective_rows.items()}
+    first_row = next(iter(objective_rows), "").upper()
+    if "PROFIT" in by_name or "COST" in by_name:
+        profit = np.array(by_name.get("PROFIT") or np.zeros(product_count), dtype=float)
+        cost = np.array(by_name.get("COST") or np.zeros(product_count), dtype=float)
+        objective = "minimize_cost" if first_row == "COST" else "maximize_profit"
+        extra = [row for row in objective_rows if row.upper() not in OBJECTIVE_ROWS]
+    else:
+        coefficients = np.array(by_name.get(first_row, np.zeros(product_count)), dtype=float)
+        profit, cost = np.zeros(product_count), np.zeros(product_count)
+        if sense is not None and sense.startswith("MAX"):
+            profit, objective = coefficients, "maximize_profit"
+        elif coefficients.any() and (coefficients <= 0).all():
+            profit, objective = -coefficients, "maximize_profit"
+        else:
+            cost, objective = coefficients, "minimize_cost"
+        extra = list(objective_rows)[1:]
+    if extra:
+        warnings.append(f"Objective rows {', '.join(extra)} were ignored")
+
+    usage_products = np.array(usage_products, dtype=np.int64)
+    order = np.argsort(usage_products, kind="stable")
+    indptr = np.zeros(product_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(usage_products, minlength=product_count), out=indptr[1:])
+
+    # A lower bound of 0 and an infinite upper bound are the defaults, not demand constraints
+    constrained = sorted(
+        product for product in set(min_demands) | set(max_demands)
+        if min_demands.get(product, 0) != 0 or np.isfinite(max_demands.get(product, np.inf))
+    )
+    min_demand = np.array([min_demands.get(product, 0) for product in constrained], dtype=float)
+    max_demand = np.array([max_demands.get(product, np.inf) for product in constrained], dtype=float)
+    min_demand[min_demand == 0] = np.nan
+    max_demand[~np.isfinite(max_demand)] = np.nan
+
+    settings: Dict[str, Any] = {"objective": objective}
+    if totals:
+        settings["total_constraints"] = totals
+    arrays = {"settings": np.frombuffer(json.dumps(settings).encode("utf-8"), dtype="u1")}
+    arrays["product_name_offsets"], arrays["product_name_bytes"] = encode_names(products)
+    arrays["profit_per_unit"] = profit
+    arrays["cost_per_unit"] = cost
+    arrays["resource_name_offsets"], arrays["resource_name_bytes"] = encode_names(resources)
+    arrays["available_capacity"] = np.array(capacities, dtype=float)
+    arrays["usage_indptr"] = indptr
+    arrays["usage_resources"] = np.array(usage_resources, dtype=np.int64)[order]
+    arrays["usage_per_unit"] = np.array(usage_values, dtype=float)[order]
+    arrays["demand_products"] = np.array(constrained, dtype=np.int64)
+    arrays["min_demand"] = min_demand
+    arrays["max_demand"] = max_demand
+    return MpsModel(arrays, warnings)
+
+
+
+def read_mps_file(path, progress: Optional[Callable[[float], None]] = None) -> MpsModel:
+    """Read a plain or gzip-compressed MPS file
+
+    progress, if given, is called now and then with the fraction of the
+    file read so far.
+    """
+    with open(path, "rb") as raw:
+        size = os.fstat(raw.fileno()).st_size or 1
+        compressed = raw.read(2) == b"\x1f\x8b"
+        raw.seek(0)
+        with io.TextIOWrapper(gzip.GzipFile(fileobj=raw) if compressed else raw) as text:
+            return read_mps(text, None if progress is None else lambda: progress(raw.tell() / size))
+
+
+def mps_names(names, reserved=()) -> List[str]:
+    """Names usable as MPS fields: whitespace becomes _ and clashes get a numeric suffix"""
+    used = set(reserved)
+    result = []
+    for name in names:
+        base = "_".join(name.split()) or "_"
+        candidate, suffix = base, 2
+        while candidate in used:
+            candidate, suffix = f"{base}_{suffix}", suffix + 1
+        used.add(candidate)
+        result.append(candidate)
+    return result
+
+
+def write_mps(file, store, settings: Dict[str, Any], model_name="PRODMIX"):
+    """Write the model store as a free-format MPS product-mix LP
+
+    The objective row comes first, PROFIT when maximizing profit and COST
+    when minimizing cost, and the other follows as a free row so both
+    survive a round trip. Each product is written as one block of lines.
+    """
+    arrays = ScenarioArrays(scenario_arrays(store, settings))
+    products = mps_names(arrays.names("product"))
+    resources = mps_names(arrays.names("resource"), reserved=OBJECTIVE_ROWS + tuple(TOTAL_ROWS))
+    minimize = settings.get("objective") == "minimize_cost"
+    totals = settings.get("total_constraints", {})
+    total_rows = [(row, totals[key]) for row, key in TOTAL_ROWS.items() if totals.get(key) is not None]
+
+    file.write(f"NAME          {model_name}\nOBJSENSE\n    {'MIN' if minimize else 'MAX'}\nROWS\n")
+    for row in (OBJECTIVE_ROWS[::-1] if minimize else OBJECTIVE_ROWS):
+        file.write(f" N  {row}\n")
+    file.writelines(f" L  {resource}\n" for resource in resources)
+    for row, _ in total_rows:
+        file.write(f" {'G' if row == 'TOTAL_MIN' else 'L'}  {row}\n")
+
+    file.write("COLUMNS\n")
+    indptr = arrays["usage_indptr"].tolist()
+    usage_resources = arrays["usage_resources"].tolist()
+    usage = arrays["usage_per_unit"].tolist()
+    for index, (product, profit, cost) in enumerate(zip(products, arrays["profit_per_unit"].tolist(),
+                                                        arrays["cost_per_unit"].tolist())):
+        lines = [f"    {product}  PROFIT  {profit!r}", f"    {product}  COST  {cost!r}"]
+        lines += [
+            f"    {product}  {resources[resource]}  {value!r}"
+            for resource, value in zip(usage_resources[indptr[index]:indptr[index + 1]],
+                                       usage[indptr[index]:indptr[index + 1]])
+        ]
+        lines += [f"    {product}  {row}  1" for row, _ in total_rows]
+        file.write("\n".join(lines) + "\n")
+
+    file.write("RHS\n")
+    for resource, capacity in zip(resources, arrays["available_capacity"].tolist()):
+        if capacity:
+            file.write(f"    RHS  {resource}  {capacity!r}\n")
+    for row, value in total_rows:
+        file.write(f"    RHS  {row}  {float(value)!r}\n")
+
+    file.write("BOUNDS\n")
+    for product, min_demand, max_demand in zip(arrays["demand_products"].tolist(), arrays["min_demand"].tolist(),
+                                               arrays["max_demand"].tolist()):
+        if min_demand == min_demand:
+            file.write(f" LO BND  {products[product]}  {min_demand!r}\n")
+        if max_demand == max_demand:
+            file.write(f" UP BND  {products[product]}  {max_demand!r}\n")
+    file.write("ENDATA\n")
@@ -0,0 +1,99 @@
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class NameRegistry:
+    """Two-way index between entity names and stable integer ids
+
+    Products and resources are registered once and referenced everywhere
+    else by id, so a duplicate check is a dict lookup and a rename is a
+    single update that listeners repaint from.
+
+    Listeners are called as listener(event, entity_id, name) where event is
+    one of "added", "renamed" or "removed". After several ids are dropped
+    at once the event is "pruned", with no id or name; listeners then drop
+    whatever refers to an id that is no longer registered.
+    """
+
+    def __init__(self):
+        self._names: Dict[int, str] = {}
+        self._ids: Dict[str, int] = {}
+        self._next_id = 1
+        self._listeners: List[Callable[[str, Optional[int], Optional[str]], None]] = []
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def _notify(self, event, entity_id=None, name=None):
+        for listener in self._listeners:
+            listener(event, entity_id, name)
+
+    def add(self, name) -> int:
+        """Register a new name and return its id"""
+        if not name:
+            raise ValueError("Name cannot be empty")
+        if name in self._ids:
+            raise ValueError(f"'{name}' already exists")
+        entity_id = self._next_id
+        self._next_id += 1
+        self._names[entity_id] = name
+        self._ids[name] = entity_id
+        self._notify("added", entity_id, name)
+        return entity_id
+
+    def rename(self, entity_id, new_name):
+        """Give an existing id a new name"""
+        old_name = self._names[entity_id]
+        if new_name == old_name:
+            return
+        if not new_name:
+            raise ValueError("Name cannot be empty")
+        if new_name in self._ids:
+            raise ValueError(f"'{new_name}' already exists")
+        del self._ids[old_name]
+        self._ids[new_name] = entity_id
+        self._names[entity_id] = new_name
+        self._notify("renamed", entity_id, new_name)
+
+    def remove(self, entity_id):
+        name = self._names.pop(entity_id)
+        del self._ids[name]
+        self._notify("removed", entity_id, name)
+
+    def prune(self, entity_ids):
+        """Unregister many ids with a single notification"""
+        removed = False
+        for entity_id in entity_ids:
+            name = self._names.pop(entity_id, None)
+            if name is not None:
+                del self._ids[name]
+                removed = True
+        if removed:
+            self._notify("pruned")
+
+    def clear(self):
+        self.prune(list(self._names))
+
+    def id_of(self, name) -> Optional[int]:
+        return self._ids.get(name)
+
+    def name_of(self, entity_id) -> str:
+        return self._names[entity_id]
+
+    def has_id(self, entity_id) -> bool:
+        return entity_id in self._names
+
+    def items(self) -> Iterator[Tuple[int, str]]:
+        """Iterate (id, name) pairs in registration order"""
+        return iter(self._names.items())
+
+    def names(self) -> List[str]:
+        return list(self._names.values())
+
+    def ids(self) -> List[int]:
+        return list(self._names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __len__(self):
+        return len(self._names)
@@ -0,0 +1,173 @@
+import json
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.scenario_binary import encode_names
+from core.table_csv import write_csv
+
+BATCH_ROWS = 10000
+RESULT_FORMATS = {"json": ".json", "csv": ".csv", "binary": ".npz"}
+TABLE_FIELDS = ("production_plan", "resource_utilization")
+MESSAGE_FIELDS = ("solver_message", "feasibility_warnings", "validation_errors")
+# Long format, so any number of runs and every kind of row share one table
+CSV_HEADER = ("run", "section", "name", "field", "value")
+
+
+class ResultArrays:
+    """One optimization result held as columns, ready to be written in any export format
+
+    run holds metadata about the run itself (optimizer, time, duration)
+    and summary the scalar fields of the result such as status and
+    objective_value. Resource utilization keeps one float array per field;
+    NaN marks a field a resource did not report.
+    """
+
+    def __init__(self, result: Dict[str, Any], run: Optional[Dict[str, Any]] = None):
+        self.run = dict(run or {})
+        self.summary = {
+            key: value for key, value in result.items()
+            if key not in TABLE_FIELDS + MESSAGE_FIELDS and not isinstance(value, (dict, list))
+        }
+        plan = result.get("production_plan") or {}
+        self.products = list(plan)
+        self.quantities = np.fromiter(plan.values(), dtype=float, count=len(plan))
+
+        utilization = result.get("resource_utilization") or {}
+        self.resources = list(utilization)
+        fields = ["used", "available"]
+        for details in utilization.values():
+            fields += [field for field in details if field not in fields]
+        self.utilization = {
+            field: np.array([details.get(field, np.nan) for details in utilization.values()], dtype=float)
+            for field in fields
+        }
+
+        self.messages: List[Tuple[str, str]] = []
+        for field in MESSAGE_FIELDS:
+            value = result.get(field)
+            if isinstance(value, list):
+                self.messages += [(field, str(message)) for message in value]
+            elif value:
+                self.messages.append((field, str(value)))
+
+
+def _batches(count, batch_rows) -> Iterator[Tuple[int, int]]:
+    for start in range(0, count, batch_rows):
+        yield start, min(start + batch_rows, count)
+
+
+def _write_result_json(file, arrays: ResultArrays, indent, batch_rows):
+    """One result object in the shape of the optimizer response, plus its run metadata"""
+    inner = indent + "  "
+    entries = [f"{json.dumps(key)}: {json.dumps(value)}" for key, value in chain([("run", arrays.run)],
+                                                                               arrays.summary.items())]
+    file.write("{\n" + ",\n".join(inner + entry for entry in entries))
+
+    file.write(f",\n{inner}\"production_plan\": {{")
+    separator = "\n"
+    for start, stop in _batches(len(arrays.products), batch_rows):
+        file.write(separator + ",\n".join(
+            f"{inner}  {json.dumps(product)}: {quantity!r}"
+            for product, quantity in zip(arrays.products[start:stop], arrays.quantities[start:stop].tolist())
+        ))
+        separator = ",\n"
+    file.write(f"\n{inner}}}" if arrays.products else "}")
+
+    file.write(f",\n{inner}\"resource_utilization\": {{")
+    fields = list(arrays.utilization)
+    separator = "\n"
+    for start, stop in _batches(len(arrays.resources), batch_rows):
+        columns = [arrays.utilization[field][start:stop].tolist() for field in fields]
+        file.write(separator + ",\n".join(
+            f"{inner}  {json.dumps(resource)}: "
+            + json.dumps({field: value for field, value in zip(fields, values) if value == value})
+            for resource, *values in zip(arrays.resources[start:stop], *columns)
+        ))
+        separator = ",\n"
+    file.write(f"\n{inner}}}" if arrays.resources else "}")
+
+    messages: Dict[str, List[str]] = {}
+    for field, message in arrays.messages:
+        messages.setdefault(field, []).append(message)
+    for field, texts in messages.items():
+        value = texts[0] if field == "solver_message" else texts
+        file.write(f",\n{inner}{json.dumps(field)}: {json.dumps(value)}")
+    file.write(f"\n{indent}}}")
+
+
+def write_results_json(file, results: Sequence[ResultArrays], batch_rows=BATCH_ROWS):
+    """Write one result as a JSON object, or several as an array of them, a batch of rows at a time"""
+    if len(results) == 1:
+        _write_result_json(file, results[0], "", batch_rows)
+    else:
+        file.write("[")
+        for index, arrays in enumerate(results):
+            file.write(",\n  " if index else "\n  ")
+            _write_result_json(file, arrays, "  ", batch_rows)
+        file.write("\n]" if results else "]")
+    file.write("\n")
+
+
+def _csv_rows(arrays: ResultArrays, run_number) -> Iterator[Sequence[Any]]:
+    for key, value in arrays.run.items():
+        yield run_number, "run", "", key, value
+    for key, value in arrays.summary.items():
+        yield run_number, "summary", "", key, value
+    for product, quantity in zip(arrays.products, arrays.quantities.tolist()):
+        yield run_number, "production_plan", product, "quantity", quantity
+    fields = list(arrays.utilization)
+    columns = [arrays.utilization[field].tolist() for field in fields]
+    for resource, *values in zip(arrays.resources, *columns):
+        for field, value in zip(fields, values):
+            if value == value:
+                yield run_number, "resource_utilization", resource, field, value
+    for field, message in arrays.messages:
+        yield run_number, "messages", "", field, message
+
+
+def write_results_csv(file, results: Sequence[ResultArrays], batch_rows=BATCH_ROWS) -> int:
+    """Write results as one long-format CSV table; returns the number of rows written"""
+    rows = chain.from_iterable(_csv_rows(arrays, number) for number, arrays in enumerate(results, 1))
+    return write_csv(file, CSV_HEADER, rows, batch_rows)
+
+
+def write_results_binary(file, results: Sequence[ResultArrays]):
+    """Write results as an uncompressed NumPy .npz archive
+
+    Each run's arrays are stored under a run<n>_ prefix: product and
+    resource names as UTF-8 bytes with offsets, quantities and one array
+    per utilization field as float64, and the run metadata, summary and
+    messages as UTF-8 JSON.
+    """
+    arrays = {}
+    for number, result in enumerate(results, 1):
+        prefix = f"run{number}_"
+        details = {"run": result.run, "summary": result.summary, "messages": result.messages}
+        arrays[prefix + "details"] = np.frombuffer(json.dumps(details).encode("utf-8"), dtype="u1")
+        arrays[prefix + "product_name_offsets"], arrays[prefix + "product_name_bytes"] = encode_names(result.products)
+        arrays[prefix + "quantity"] = result.quantities
+        arrays[prefix + "resource_name_offsets"], arrays[prefix + "resource_name_bytes"] = encode_names(
+            result.resources
+        )
+        for field, values in result.utilization.items():
+            arrays[f"{prefix}utilization_{field}"] = values
+    np.savez(file, **arrays)
+
+
+def write_results(file, results: Iterable[ResultArrays], result_format) -> int:
+    """Write results in one of RESULT_FORMATS and return how many were written
+
+    file must be opened in binary mode for "binary" and in text mode otherwise.
+    """
+    results = list(results)
+    if result_format == "json":
+        write_results_json(file, results)
+    elif result_format == "csv":
+        write_results_csv(file, results)
+    elif result_format == "binary":
+        write_results_binary(file, results)
+    else:
+        raise ValueError(f"Unknown result format {result_format}")
+    return len(results)
@@ -0,0 +1,34 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+def column_order(values, descending=False) -> np.ndarray:
+    """Row numbers putting a column of names or numbers in order; NaN goes last either way"""
+    if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+        return np.argsort(-values if descending else values, kind="stable")
+    order = np.argsort(np.array(values, dtype=str), kind="stable")
+    return order[::-1] if descending else order
+
+
+def matched_changes(names: Sequence[str], values: np.ndarray, previous_names: Optional[Sequence[str]],
+                    previous_values: Optional[np.ndarray]) -> np.ndarray:
+    """Each value minus the previous value of the same name; NaN where the previous result has no such name
+
+    Names are matched by sorting the previous ones and searching them
+    all at once, so a plan of any size is compared in a few array
+    operations.
+    """
+    changes = np.full(len(values), np.nan)
+    if previous_names is None or not len(previous_names) or not len(names):
+        return changes
+    if list(names) == list(previous_names):
+        return values - previous_values
+    current = np.array(names, dtype=str)
+    previous = np.array(previous_names, dtype=str)
+    order = np.argsort(previous, kind="stable")
+    ranked = previous[order]
+    positions = np.searchsorted(ranked, current).clip(max=len(ranked) - 1)
+    found = ranked[positions] == current
+    changes[found] = values[found] - previous_values[order[positions[found]]]
+    return changes
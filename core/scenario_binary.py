@@ -0,0 +1,228 @@
+import json
+import mmap
+import struct
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from core.scenario_stream import SECTIONS
+
+MAGIC = b"PSCN"
+VERSION = 1
+BINARY_SUFFIX = ".scn"
+
+# Every array of the file in order with its element type; the header holds (offset, length) for each
+ARRAYS = (
+    ("settings", np.dtype("u1")),  # UTF-8 JSON with the objective and total constraints
+    ("product_name_offsets", np.dtype("<i8")),
+    ("product_name_bytes", np.dtype("u1")),
+    ("profit_per_unit", np.dtype("<f8")),
+    ("cost_per_unit", np.dtype("<f8")),
+    ("resource_name_offsets", np.dtype("<i8")),
+    ("resource_name_bytes", np.dtype("u1")),
+    ("available_capacity", np.dtype("<f8")),
+    # Resource usage as CSR over products: product i uses entries usage_indptr[i] to usage_indptr[i + 1]
+    ("usage_indptr", np.dtype("<i8")),
+    ("usage_resources", np.dtype("<i4")),
+    ("usage_per_unit", np.dtype("<f8")),
+    ("demand_products", np.dtype("<i4")),
+    ("min_demand", np.dtype("<f8")),  # NaN where no bound is set
+    ("max_demand", np.dtype("<f8")),
+)
+HEADER = struct.Struct("<4sHH" + "QQ" * len(ARRAYS))
+# Arrays start on 8-byte boundaries so they can be viewed in place
+ALIGNMENT = 8
+
+
+def is_binary_scenario(path) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def encode_names(names) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [name.encode("utf-8") for name in names]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    np.cumsum([len(name) for name in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype="u1")
+
+
+def _positions(ids, table_ids) -> np.ndarray:
+    """Position of each id among table_ids, -1 for ids not in the table"""
+    lookup = np.full(max(int(ids.max(initial=-1)), int(table_ids.max(initial=-1))) + 1, -1, dtype=np.int64)
+    lookup[table_ids] = np.arange(len(table_ids))
+    return lookup[ids]
+
+
+def scenario_arrays(store, settings: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Lay out a ScenarioStore and the scenario settings as the arrays of a binary scenario
+
+    Usage and demand rows refer to products and resources by position in
+    their tables. Usage rows are grouped by product, keeping their order
+    within each product.
+    """
+    product_names = store.names_for(store.product_registry, store.products.column("id"))
+    resource_names = store.names_for(store.resource_registry, store.resources.column("id"))
+
+    usage_products = _positions(store.resource_usage.column("product_id"), store.products.column("id"))
+    usage_resources = _positions(store.resource_usage.column("resource_id"), store.resources.column("id"))
+    known = (usage_products >= 0) & (usage_resources >= 0)
+    usage_products, usage_resources = usage_products[known], usage_resources[known]
+    order = np.argsort(usage_products, kind="stable")
+    indptr = np.zeros(len(product_names) + 1, dtype="<i8")
+    np.cumsum(np.bincount(usage_products, minlength=len(product_names)), out=indptr[1:])
+
+    demand_products = _positions(store.demand_constraints.column("product_id"), store.products.column("id"))
+    constrained = demand_products >= 0
+
+    arrays = {"settings": np.frombuffer(json.dumps(settings).encode("utf-8"), dtype="u1")}
+    arrays["product_name_offsets"], arrays["product_name_bytes"] = encode_names(product_names)
+    arrays["profit_per_unit"] = store.products.column("profit_per_unit")
+    arrays["cost_per_unit"] = store.products.column("cost_per_unit")
+    arrays["resource_name_offsets"], arrays["resource_name_bytes"] = encode_names(resource_names)
+    arrays["available_capacity"] = store.resources.column("available_capacity")
+    arrays["usage_indptr"] = indptr
+    arrays["usage_resources"] = usage_resources[order]
+    arrays["usage_per_unit"] = store.resource_usage.column("usage_per_unit")[known][order]
+    arrays["demand_products"] = demand_products[constrained]
+    arrays["min_demand"] = store.demand_constraints.column("min_demand")[constrained]
+    arrays["max_demand"] = store.demand_constraints.column("max_demand")[constrained]
+    return arrays
+
+
+def save_binary_scenario(file, store, settings: Dict[str, Any]):
+    """Write a ScenarioStore and the scenario settings to a seekable binary file"""
+    write_binary_arrays(file, scenario_arrays(store, settings))
+
+
+def write_binary_arrays(file, arrays: Dict[str, np.ndarray]):
+    """Write arrays laid out like scenario_arrays to a seekable binary file"""
+    start = file.tell()
+    file.write(bytes(HEADER.size))
+    entries = []
+    for name, dtype in ARRAYS:
+        file.write(bytes(-(file.tell() - start) % ALIGNMENT))
+        entries += [file.tell() - start, len(arrays[name])]
+        file.write(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+    end = file.tell()
+    file.seek(start)
+    file.write(HEADER.pack(MAGIC, VERSION, 0, *entries))
+    file.seek(end)
+
+
+def _names_at(names, indexes) -> List[str]:
+    if len(indexes) and (indexes.min() < 0 or indexes.max() >= len(names)):
+        raise ValueError("Invalid scenario: row refers to a missing name")
+    return [names[index] for index in indexes.tolist()]
+
+
+def _numbers(values) -> List[str]:
+    return [f"{value:.2f}" for value in values.tolist()]
+
+
+def _bounds(values) -> List[str]:
+    return ["" if value != value else f"{value:.2f}" for value in values.tolist()]
+
+
+class ScenarioArrays:
+    """A scenario held as the arrays laid out by scenario_arrays
+
+    Reads sections back as table cell text in batches. Names are decoded
+    on first use.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self._arrays = arrays
+        counts = self.row_counts()
+        lengths = {
+            "product_name_offsets": counts["products"] + 1,
+            "cost_per_unit": counts["products"],
+            "resource_name_offsets": counts["resources"] + 1,
+            "usage_indptr": counts["products"] + 1,
+            "usage_resources": counts["resource_usage"],
+            "min_demand": counts["demand_constraints"],
+            "max_demand": counts["demand_constraints"]
+        }
+        for name, length in lengths.items():
+            if len(self[name]) != length:
+                raise ValueError(f"Invalid scenario: {name} has {len(self[name])} entries instead of {length}")
+        indptr = self["usage_indptr"]
+        if indptr[0] != 0 or indptr[-1] != counts["resource_usage"]:
+            raise ValueError("Invalid scenario: usage does not match the products")
+        self._names = {}
+
+    def __getitem__(self, name) -> np.ndarray:
+        return self._arrays[name]
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return json.loads(self["settings"].tobytes().decode("utf-8"))
+
+    def names(self, kind) -> List[str]:
+        """Decoded names of the "product" or "resource" table"""
+        if kind not in self._names:
+            offsets = self[f"{kind}_name_offsets"].tolist()
+            data = self[f"{kind}_name_bytes"].tobytes()
+            self._names[kind] = [data[start:stop].decode("utf-8") for start, stop in zip(offsets, offsets[1:])]
+        return self._names[kind]
+
+    def row_counts(self) -> Dict[str, int]:
+        return {
+            "products": len(self["profit_per_unit"]),
+            "resources": len(self["available_capacity"]),
+            "resource_usage": len(self["usage_per_unit"]),
+            "demand_constraints": len(self["demand_products"])
+        }
+
+    def section_columns(self, section, start, stop) -> List[List[str]]:
+        """Rows start to stop of one section as columns of table cell text"""
+        if section == "products":
+            return [self.names("product")[start:stop], _numbers(self["profit_per_unit"][start:stop]),
+                    _numbers(self["cost_per_unit"][start:stop])]
+        if section == "resources":
+            return [self.names("resource")[start:stop], _numbers(self["available_capacity"][start:stop])]
+        if section == "resource_usage":
+            products = np.searchsorted(self["usage_indptr"], np.arange(start, stop), side="right") - 1
+            return [_names_at(self.names("product"), products),
+                    _names_at(self.names("resource"), self["usage_resources"][start:stop]),
+                    _numbers(self["usage_per_unit"][start:stop])]
+        return [_names_at(self.names("product"), self["demand_products"][start:stop]),
+                _bounds(self["min_demand"][start:stop]), _bounds(self["max_demand"][start:stop])]
+
+    def text_batches(self, batch_rows) -> Iterator[Tuple[str, List[List[str]]]]:
+        """Every section in table order as batches of at most batch_rows rows of cell text"""
+        counts = self.row_counts()
+        for section in SECTIONS:
+            for start in range(0, counts[section], batch_rows):
+                yield section, self.section_columns(section, start, min(start + batch_rows, counts[section]))
+
+
+class BinaryScenario(ScenarioArrays):
+    """Read-only view of a binary scenario file through a memory map
+
+    Opening only reads the header; every array is a NumPy view into the
+    map, so pages are read from disk when rows are first touched. The map
+    stays open while any array taken from it is alive.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        super().__init__(binary_arrays(self._map))
+
+
+def binary_arrays(buffer) -> Dict[str, np.ndarray]:
+    """Views of every array in a binary scenario held in a bytes-like buffer, without copying"""
+    if len(buffer) < HEADER.size:
+        raise ValueError("Invalid binary scenario: file is too short")
+    magic, version, _, *entries = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Invalid binary scenario: wrong file type")
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary scenario version {version}")
+
+    arrays = {}
+    for (name, dtype), offset, length in zip(ARRAYS, entries[0::2], entries[1::2]):
+        if offset % ALIGNMENT or offset + length * dtype.itemsize > len(buffer):
+            raise ValueError(f"Invalid binary scenario: {name} lies outside the file")
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=length, offset=offset)
+    return arrays
@@ -0,0 +1,171 @@
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from core.tabular import format_numbers
+
+# Array sections of a scenario, in the order they are written and best read
+SECTIONS = ("products", "resources", "resource_usage", "demand_constraints")
+BATCH_ROWS = 10000
+READ_SIZE = 1 << 20
+# A single value larger than this is taken as a malformed file rather than read to the end
+MAX_VALUE_SIZE = 64 << 20
+
+# Table column order of each section, matching the app.py input tables
+SECTION_FIELDS = {
+    "products": ("name", "profit_per_unit", "cost_per_unit"),
+    "resources": ("name", "available_capacity"),
+    "resource_usage": ("product_name", "resource_name", "usage_per_unit"),
+    "demand_constraints": ("product_name", "min_demand", "max_demand")
+}
+NUMBER_FIELDS = {"profit_per_unit", "cost_per_unit", "available_capacity", "usage_per_unit", "min_demand", "max_demand"}
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+class ScenarioReader:
+    """Incremental parser for scenario JSON files
+
+    Iterating yields (section, rows) with up to batch_rows entries of one
+    array section at a time, in file order. Other top-level values, like
+    objective and total_constraints, are collected in settings. Only the
+    unread part of one read buffer and the current batch are in memory,
+    so peak memory does not grow with the file.
+    """
+
+    def __init__(self, file, batch_rows=BATCH_ROWS, read_size=READ_SIZE):
+        self.file = file
+        self.batch_rows = batch_rows
+        self.read_size = read_size
+        self.bytes_read = 0
+        self.settings: Dict[str, Any] = {}
+        self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read the next block into the buffer; False once the file is exhausted"""
+        if self._eof:
+            return False
+        data = self.file.read(self.read_size)
+        self.bytes_read += len(data)
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        self._buffer += self._text_decoder.decode(data, final=not data)
+        self._eof = not data
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, or "" at the end of the file"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, expected, context):
+        char = self._peek()
+        if char not in expected:
+            found = repr(char) if char else "end of file"
+            raise ValueError(f"Invalid scenario file: expected {' or '.join(map(repr, expected))} {context}, found {found}")
+        self._pos += 1
+        return char
+
+    def _value(self):
+        """Decode one complete JSON value, reading more of the file as needed"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as error:
+                if self._eof:
+                    raise ValueError(f"Invalid scenario file: {error.msg}") from None
+                if len(self._buffer) - self._pos > MAX_VALUE_SIZE:
+                    raise ValueError(f"Invalid scenario file: {error.msg}") from None
+                self._fill()
+                continue
+            # A number at the very end of the buffer may continue in the next block
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _rows(self, section) -> Iterator[Tuple[str, List[Any]]]:
+        self._expect("[", f"for {section}")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        batch = []
+        while True:
+            batch.append(self._value())
+            if len(batch) >= self.batch_rows:
+                yield section, batch
+                batch = []
+            if self._expect(",]", f"between {section} entries") == "]":
+                break
+        if batch:
+            yield section, batch
+
+    def __iter__(self) -> Iterator[Tuple[str, List[Any]]]:
+        self._expect("{", "at the start")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise ValueError("Invalid scenario file: keys must be strings")
+            self._expect(":", f"after {key!r}")
+            if key in SECTIONS:
+                yield from self._rows(key)
+            else:
+                self.settings[key] = self._value()
+            if self._expect(",}", "between sections") == "}":
+                break
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value)
+
+
+def section_columns(section, rows) -> List[List[str]]:
+    """Turn a batch of section entries into columns of table cell text
+
+    Numbers get two decimals like loaded data everywhere else; anything
+    else is kept as text for the table validator to flag. Missing fields
+    are blank.
+    """
+    columns = []
+    for field in SECTION_FIELDS[section]:
+        texts = [_text(row.get(field)) if isinstance(row, dict) else "" for row in rows]
+        columns.append(format_numbers(texts) if field in NUMBER_FIELDS else texts)
+    return columns
+
+
+def write_scenario(file, settings: Dict[str, Any], sections: Iterable[Tuple[str, Iterable[List[Dict[str, Any]]]]]):
+    """Write a scenario as JSON one entry per line, taking each section in batches
+
+    sections yields (section, batches) pairs where batches yields lists of
+    entries, so the whole scenario never has to exist as one object tree.
+    Settings are written first and sections in the order given.
+    """
+    file.write("{")
+    separator = "\n"
+    for key, value in settings.items():
+        file.write(f"{separator}  {json.dumps(key)}: {json.dumps(value)}")
+        separator = ",\n"
+    for section, batches in sections:
+        file.write(f"{separator}  {json.dumps(section)}: [")
+        row_separator = "\n"
+        for batch in batches:
+            if not batch:
+                continue
+            file.write(row_separator + ",\n".join(f"    {json.dumps(row)}" for row in batch))
+            row_separator = ",\n"
+        file.write("\n  ]" if row_separator != "\n" else "]")
+        separator = ",\n"
+    file.write("\n}\n")
@@ -0,0 +1,78 @@
+import csv
+import io
+import os
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core.tabular import detect_delimiter, format_numbers, parse_delimited
+
+BATCH_ROWS = 10000
+
+# Columns written for each result table; resource_utilization adds any other per-resource fields after these
+RESULT_COLUMNS = {
+    "production_plan": ("product", "quantity"),
+    "resource_utilization": ("resource", "used", "available")
+}
+
+
+def read_csv_batches(path, column_count, numeric_columns: Sequence[int] = (), batch_rows=BATCH_ROWS,
+                     progress: Optional[Callable[[float], None]] = None) -> Iterator[List[List[str]]]:
+    """Read a CSV or tab-separated file as batches of columns of table cell text
+
+    Only one batch of lines is in memory at a time. Each batch is split
+    and its numeric columns formatted in vectorized passes, like pasted
+    rows. A header line is dropped if numeric_columns shows it is not
+    data, and the delimiter is taken from the first line. progress, if
+    given, is called after each batch with the fraction of the file read.
+    """
+    with open(path, "rb") as raw:
+        size = os.fstat(raw.fileno()).st_size or 1
+        with io.TextIOWrapper(raw, encoding="utf-8-sig") as text:
+            delimiter = None
+            while True:
+                lines = list(islice(text, batch_rows))
+                if not lines:
+                    break
+                chunk = "".join(lines)
+                if delimiter is None:
+                    if not chunk.strip():
+                        continue
+                    delimiter = detect_delimiter(chunk.lstrip())
+                    columns = parse_delimited(chunk, column_count, numeric_columns, delimiter)
+                else:
+                    columns = parse_delimited(chunk, column_count, delimiter=delimiter)
+                if progress is not None:
+                    progress(raw.tell() / size)
+                if columns[0]:
+                    yield [format_numbers(texts) if column in numeric_columns else texts
+                           for column, texts in enumerate(columns)]
+
+
+def result_rows(result: Dict[str, Any], key) -> Tuple[List[str], Iterator[List[Any]]]:
+    """Header and rows of one result table, production_plan or resource_utilization
+
+    Rows are produced as they are written, so exporting does not build a
+    second copy of a large result.
+    """
+    table = result.get(key) or {}
+    header = list(RESULT_COLUMNS[key])
+    if key == "production_plan":
+        return header, ([product, quantity] for product, quantity in table.items())
+    first = next(iter(table.values()), {})
+    header += [field for field in first if field not in header]
+    fields = header[1:]
+    return header, ([resource] + [details.get(field, "") for field in fields] for resource, details in table.items())
+
+
+def write_csv(file, header: Sequence[str], rows: Iterable[Sequence[Any]], batch_rows=BATCH_ROWS) -> int:
+    """Write a header and rows as CSV a batch at a time; returns the number of rows written"""
+    writer = csv.writer(file)
+    writer.writerow(header)
+    count = 0
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_rows))
+        if not batch:
+            return count
+        writer.writerows(batch)
+        count += len(batch)
@@ -0,0 +1,188 @@
+import re
+from collections import defaultdict
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.validation import parse_numeric
+
+# field, comparison and number, e.g. "usage>5" or "capacity <= 10"
+RANGE_PATTERN = re.compile(r"([a-z_]+)\s*(<=|>=|<|>|=)\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?)", re.IGNORECASE)
+# A quoted phrase or a single word
+TERM_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+_NO_POSITIONS = np.empty(0, dtype=np.int32)
+
+
+class FilterQuery(NamedTuple):
+    prefixes: List[str]
+    substrings: List[str]
+    ranges: List[Tuple[str, str, float]]
+
+    def __bool__(self):
+        return bool(self.prefixes or self.substrings or self.ranges)
+
+
+def parse_filter(text) -> FilterQuery:
+    """Split filter box text into name terms and numeric range conditions
+
+    Words match anywhere in a name, words starting with ^ only at its start
+    and field<op>number keeps rows whose matching numeric column is in range.
+    Quoted phrases are one term and a range without its number is left
+    out. Matching ignores case.
+    """
+    ranges = [(field.lower(), op, float(number)) for field, op, number in RANGE_PATTERN.findall(text)]
+    prefixes, substrings = [], []
+    for quoted, word in TERM_PATTERN.findall(RANGE_PATTERN.sub(" ", text)):
+        term = (quoted or word).strip().lower()
+        if not quoted and any(op in term for op in "<>="):
+            # A range still being typed, like "usage>", filters nothing yet
+            continue
+        if term.startswith("^"):
+            if term[1:]:
+                prefixes.append(term[1:])
+        elif term:
+            substrings.append(term)
+    return FilterQuery(prefixes, substrings, ranges)
+
+
+class NameColumn:
+    """Distinct lowercase names of one column in sorted order
+
+    Prefix matches are a binary search over the sorted names and substring
+    matches intersect trigram posting lists, so a query touches the names
+    that can match rather than every row. Results are masks over the
+    distinct names; row_names maps them back to rows.
+    """
+
+    def __init__(self, texts: Sequence[str]):
+        lowered = np.char.lower(np.char.strip(np.array(texts, dtype=str)))
+        self.names, self.row_names = np.unique(lowered, return_inverse=True)
+        self.row_names = self.row_names.reshape(-1)
+        self._name_list = None
+        self._trigrams = None
+
+    def prefix(self, term) -> np.ndarray:
+        start = np.searchsorted(self.names, term, side="left")
+        stop = np.searchsorted(self.names, term + "\U0010ffff", side="left")
+        hits = np.zeros(len(self.names), dtype=bool)
+        hits[start:stop] = True
+        return hits
+
+    def _trigram_index(self):
+        if self._trigrams is None:
+            self._name_list = self.names.tolist()
+            postings = defaultdict(list)
+            for position, name in enumerate(self._name_list):
+                for gram in {name[i:i + 3] for i in range(len(name) - 2)}:
+                    postings[gram].append(position)
+            self._trigrams = {gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()}
+        return self._trigrams
+
+    def contains(self, term) -> np.ndarray:
+        if len(term) < 3:
+            # Too short for trigrams; the distinct names are still far fewer than the rows
+            return np.char.find(self.names, term) >= 0
+        trigrams = self._trigram_index()
+        postings = sorted((trigrams.get(term[i:i + 3], _NO_POSITIONS) for i in range(len(term) - 2)), key=len)
+        candidates = postings[0]
+        for positions in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, positions, assume_unique=True)
+        hits = np.zeros(len(self.names), dtype=bool)
+        # Sharing every trigram does not guarantee they are adjacent
+        hits[[position for position in candidates.tolist() if term in self._name_list[position]]] = True
+        return hits
+
+
+class NumberColumn:
+    """Values of one numeric column sorted once, so a range is two binary searches"""
+
+    def __init__(self, texts: Sequence[str]):
+        values = parse_numeric(texts)[0]
+        # NaN, for blank and invalid cells, sorts last and never matches a range
+        self.order = np.argsort(values, kind="stable")
+        self.sorted_values = values[self.order][:np.count_nonzero(~np.isnan(values))]
+
+    def within(self, op, bound) -> np.ndarray:
+        values = self.sorted_values
+        start, stop = 0, len(values)
+        if op in (">", "="):
+            start = np.searchsorted(values, bound, side="right" if op == ">" else "left")
+        elif op == ">=":
+            start = np.searchsorted(values, bound, side="left")
+        if op in ("<=", "="):
+            stop = np.searchsorted(values, bound, side="right")
+        elif op == "<":
+            stop = np.searchsorted(values, bound, side="left")
+        rows = np.zeros(len(self.order), dtype=bool)
+        rows[self.order[start:stop]] = True
+        return rows
+
+
+class TableIndex:
+    """Filter index over the cell text of one input table
+
+    Columns are indexed the first time a query needs them and the index
+    is rebuilt from new text rather than updated, so it is meant to be
+    built once per table change and queried on every keystroke.
+    """
+
+    def __init__(self, columns: Sequence[Sequence[str]], headers: Sequence[str],
+                 name_columns: Sequence[int], numeric_columns: Sequence[int]):
+        self.columns = columns
+        self.headers = headers
+        self.name_columns = tuple(name_columns)
+        self.numeric_columns = tuple(numeric_columns)
+        self.row_count = len(columns[0]) if columns else 0
+        self._names = {}
+        self._numbers = {}
+
+    def names(self, column) -> NameColumn:
+        if column not in self._names:
+            self._names[column] = NameColumn(self.columns[column])
+        return self._names[column]
+
+    def numbers(self, column) -> NumberColumn:
+        if column not in self._numbers:
+            self._numbers[column] = NumberColumn(self.columns[column])
+        return self._numbers[column]
+
+    def field_column(self, field) -> int:
+        """Numeric column whose header has a word starting with field"""
+        matches = [
+            column for column in self.numeric_columns
+            if any(word.startswith(field) for word in self.headers[column].lower().split())
+        ]
+        exact = [column for column in matches if field in self.headers[column].lower().split()]
+        if len(matches) == 1 or len(exact) == 1:
+            return (exact or matches)[0]
+        if matches:
+            raise ValueError(f"'{field}' could mean {', '.join(self.headers[column] for column in matches)}")
+        fields = ", ".join(self.headers[column] for column in self.numeric_columns)
+        raise ValueError(f"No numeric column called '{field}'; try one of {fields}")
+
+    def _any_name(self, match, term) -> np.ndarray:
+        rows = np.zeros(self.row_count, dtype=bool)
+        for column in self.name_columns:
+            names = self.names(column)
+            rows |= match(names, term)[names.row_names]
+        return rows
+
+    def match(self, text) -> Optional[np.ndarray]:
+        """Mask of the rows matching every term in the filter text, or None for an empty filter
+
+        Raises ValueError when a range names no numeric column.
+        """
+        query = parse_filter(text)
+        if not query:
+            return None
+        rows = np.ones(self.row_count, dtype=bool)
+        for term in query.prefixes:
+            rows &= self._any_name(NameColumn.prefix, term)
+        for term in query.substrings:
+            rows &= self._any_name(NameColumn.contains, term)
+        for field, op, bound in query.ranges:
+            rows &= self.numbers(self.field_column(field)).within(op, bound)
+        return rows
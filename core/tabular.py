@@ -0,0 +1,98 @@
+import csv
+from typing import List, Sequence
+
+import numpy as np
+
+from core.validation import parse_numeric
+
+# Lines split per vectorized pass; a ragged line only sends its own chunk down the slow path
+CHUNK_ROWS = 10000
+
+
+def detect_delimiter(text) -> str:
+    """Tab if the first line has one (spreadsheet clipboard), otherwise comma"""
+    first_line = text.split("\n", 1)[0]
+    return "\t" if "\t" in first_line else ","
+
+
+def _split_chunk(lines, delimiter, column_count) -> np.ndarray:
+    """Split a chunk of lines into a (rows, column_count) array of cell text"""
+    counts = [line.count(delimiter) for line in lines]
+    width = max(counts) + 1
+    if min(counts) + 1 == width:
+        # Every line has the same number of fields, so one split and a reshape does it
+        fields = delimiter.join(lines).split(delimiter)
+        cells = np.array(fields, dtype=object).reshape(len(lines), width)
+    else:
+        cells = np.full((len(lines), width), "", dtype=object)
+        for row, line in enumerate(lines):
+            values = line.split(delimiter)
+            cells[row, :len(values)] = values
+    return _fit_columns(cells, column_count)
+
+
+def _fit_columns(cells, column_count) -> np.ndarray:
+    """Pad missing trailing columns with empty text and drop extra ones"""
+    if cells.shape[1] < column_count:
+        padding = np.full((cells.shape[0], column_count - cells.shape[1]), "", dtype=object)
+        cells = np.hstack([cells, padding])
+    return cells[:, :column_count]
+
+
+def _is_header(first_row, numeric_columns) -> bool:
+    """A first row whose numeric columns hold text rather than numbers is a header"""
+    if not numeric_columns:
+        return False
+    _, blank, bad = parse_numeric([first_row[column] for column in numeric_columns])
+    return bool(np.any(bad)) and not np.any(~blank & ~bad)
+
+
+def parse_delimited(text, column_count, numeric_columns: Sequence[int] = (), delimiter=None) -> List[List[str]]:
+    """Parse tab- or comma-separated text into column_count columns of stripped cell text
+
+    Blank lines are ignored and a header row is dropped when numeric_columns
+    shows the first line is not data. Quoted CSV goes through the csv module.
+    The delimiter is detected from the first line unless given.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = [line for line in text.split("\n") if line.strip()]
+    if not lines:
+        return [[] for _ in range(column_count)]
+    delimiter = delimiter or detect_delimiter(lines[0])
+
+    if '"' in text:
+        rows = list(csv.reader(lines, delimiter=delimiter))
+        width = max(len(row) for row in rows)
+        cells = np.full((len(rows), width), "", dtype=object)
+        for row, values in enumerate(rows):
+            cells[row, :len(values)] = values
+        chunks = [_fit_columns(cells, column_count)]
+    else:
+        chunks = [
+            _split_chunk(lines[start:start + CHUNK_ROWS], delimiter, column_count)
+            for start in range(0, len(lines), CHUNK_ROWS)
+        ]
+
+    cells = np.vstack(chunks).astype(str)
+    cells = np.char.strip(cells)
+    if _is_header(cells[0], numeric_columns):
+        cells = cells[1:]
+    return [cells[:, column].tolist() for column in range(column_count)]
+
+
+def format_numbers(texts) -> List[str]:
+    """Format parseable numbers with two decimals, leaving blank and invalid text as it is"""
+    values, blank, bad = parse_numeric(texts)
+    keep = (blank | bad).tolist()
+    return [text if kept else f"{value:.2f}" for text, value, kept in zip(texts, values.tolist(), keep)]
+
+
+def parse_amounts(texts):
+    """Parse a pasted column of non-negative amounts where blank means 0
+
+    Returns (values, valid) as lists; text that is not a number has value 0.
+    """
+    values, blank, bad = parse_numeric(texts)
+    values = np.where(blank | bad, 0.0, values)
+    valid = ~bad & (values >= 0)
+    return values.tolist(), valid.tolist()
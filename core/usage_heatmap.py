@@ -0,0 +1,70 @@
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from core.chart_data import rank_order
+from core.result_export import ResultArrays
+from core.usage_matrix import UsageMatrix
+
+
+class UsageHeatmap:
+    """Share of each resource's capacity that each product of a plan consumes
+
+    The sparse usage matrix is scaled row by row by the dense production
+    quantities and column by column by one over the capacities, so only
+    the stored cells are ever computed. Products are ranked by the total
+    share they consume; grid sums consecutive ranks into groups, which
+    is the product of a sparse group indicator matrix with the shares.
+    """
+
+    def __init__(self, matrix: UsageMatrix, quantities: np.ndarray, capacities: np.ndarray):
+        self.product_names = matrix.product_names
+        self.resource_names = matrix.resource_names
+        product_count, resource_count = matrix.shape
+        indptr, columns, values = matrix.to_csr()
+        rows = np.repeat(np.arange(product_count), np.diff(indptr))
+
+        # Names only the usage refers to are produced in quantity 0 and have no known capacity
+        plan = np.zeros(product_count)
+        plan[:len(quantities)] = quantities
+        capacity = np.full(resource_count, np.nan)
+        capacity[:len(capacities)] = capacities
+        # Resources without a positive capacity show as missing rather than as a share
+        self.known = capacity > 0
+        scale = np.zeros(resource_count)
+        np.divide(1.0, capacity, out=scale, where=self.known)
+        shares = values * plan[rows] * scale[columns]
+
+        # Products from the largest consumer to the smallest
+        self.order = rank_order(np.bincount(rows, weights=shares, minlength=product_count))
+        ranks = np.empty(product_count, dtype=np.int64)
+        ranks[self.order] = np.arange(product_count)
+        self.ranks = ranks[rows]
+        self.columns = columns
+        self.shares = shares
+
+    @classmethod
+    def from_result(cls, arrays: ResultArrays, resource_usage: List[Dict[str, Any]]):
+        """Heatmap of a result, given the resource usage in API format it was solved with"""
+        matrix = UsageMatrix.from_resource_usage(resource_usage, arrays.products, arrays.resources)
+        return cls(matrix, arrays.quantities, arrays.utilization["available"])
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.product_names), len(self.resource_names)
+
+    def grid(self, max_rows) -> Tuple[np.ndarray, np.ndarray]:
+        """Shares with consecutive ranks summed into at most max_rows rows, and the first rank of each row
+
+        Every row holds the same number of products, give or take one.
+        Columns of resources without a capacity are NaN.
+        """
+        product_count, resource_count = self.shape
+        groups = max(1, min(product_count, max_rows))
+        grid = np.bincount(self.ranks * groups // max(product_count, 1) * resource_count + self.columns,
+                           weights=self.shares, minlength=groups * resource_count)
+        # Counting no cells at all gives integers
+        grid = grid.astype(float, copy=False).reshape(groups, resource_count)
+        grid[:, ~self.known] = np.nan
+        starts = -(-np.arange(groups) * product_count // groups)
+        return grid, starts
@@ -0,0 +1,130 @@
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class UsageMatrix:
+    """Sparse product x resource matrix of usage_per_unit values
+
+    Only explicitly entered cells are stored, keyed by (row, column), so a
+    matrix with hundreds of products and dozens of resources costs memory
+    in proportion to the entries that actually exist.
+    """
+
+    def __init__(self, product_names=None, resource_names=None):
+        self.product_names = list(product_names or [])
+        self.resource_names = list(resource_names or [])
+        self._product_index = {name: i for i, name in enumerate(self.product_names)}
+        self._resource_index = {name: i for i, name in enumerate(self.resource_names)}
+        self._cells: Dict[Tuple[int, int], float] = {}
+
+    @classmethod
+    def from_resource_usage(cls, resource_usage, product_names, resource_names):
+        """Build a matrix from the API's resource_usage list
+
+        Names referenced by an entry but missing from product_names or
+        resource_names are appended so that no entry is dropped.
+        """
+        matrix = cls(product_names, resource_names)
+        rows = [matrix._product_row(entry["product_name"]) for entry in resource_usage]
+        cols = [matrix._resource_column(entry["resource_name"]) for entry in resource_usage]
+        values = [float(entry["usage_per_unit"]) for entry in resource_usage]
+        matrix._cells = dict(zip(zip(rows, cols), values))
+        return matrix
+
+    def _product_row(self, name):
+        row = self._product_index.get(name)
+        if row is None:
+            row = len(self.product_names)
+            self.product_names.append(name)
+            self._product_index[name] = row
+        return row
+
+    def _resource_column(self, name):
+        col = self._resource_index.get(name)
+        if col is None:
+            col = len(self.resource_names)
+            self.resource_names.append(name)
+            self._resource_index[name] = col
+        return col
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.product_names), len(self.resource_names)
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored cells"""
+        return len(self._cells)
+
+    def get(self, row, col) -> Optional[float]:
+        """Return the value of a cell, or None if it was never entered"""
+        return self._cells.get((row, col))
+
+    def set(self, row, col, value):
+        """Set a cell; a value of None clears it"""
+        if value is None:
+            self._cells.pop((row, col), None)
+        else:
+            self._cells[(row, col)] = float(value)
+
+    def set_block(self, top, left, values: Sequence[Sequence[Optional[float]]]):
+        """Write a 2D block of values with its top-left corner at (top, left)
+
+        Cells falling outside the matrix are ignored. Returns the
+        (bottom, right) corner of the block that was actually written.
+        """
+        n_rows, n_cols = self.shape
+        bottom, right = top - 1, left - 1
+        for i, row_values in enumerate(values):
+            row = top + i
+            if row >= n_rows:
+                break
+            bottom = row
+            for j, value in enumerate(row_values):
+                col = left + j
+                if col >= n_cols:
+                    break
+                right = max(right, col)
+                self.set(row, col, value)
+        return bottom, right
+
+    def fill(self, top, left, bottom, right, value):
+        """Set every cell in the inclusive rectangle to value"""
+        for row in range(top, bottom + 1):
+            for col in range(left, right + 1):
+                self.set(row, col, value)
+
+    def to_coo(self):
+        """Return (rows, cols, values) arrays ordered by row, then column"""
+        if not self._cells:
+            return (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32),
+                    np.empty(0, dtype=np.float64))
+        keys = np.array(list(self._cells.keys()), dtype=np.int32)
+        values = np.fromiter(self._cells.values(), dtype=np.float64, count=len(self._cells))
+        order = np.lexsort((keys[:, 1], keys[:, 0]))
+        return keys[order, 0], keys[order, 1], values[order]
+
+    def to_csr(self):
+        """Return (indptr, indices, values) in compressed sparse row form"""
+        rows, cols, values = self.to_coo()
+        indptr = np.zeros(len(self.product_names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(self.product_names)), out=indptr[1:])
+        return indptr, cols, values
+
+    def to_dense(self):
+        """Return a dense float array with unset cells as 0"""
+        dense = np.zeros(self.shape, dtype=np.float64)
+        rows, cols, values = self.to_coo()
+        dense[rows, cols] = values
+        return dense
+
+    def to_resource_usage(self) -> List[Dict[str, Any]]:
+        """Return the entries in the API's resource_usage format"""
+        rows, cols, values = self.to_coo()
+        products = self.product_names
+        resources = self.resource_names
+        return [
+            {"product_name": products[row], "resource_name": resources[col], "usage_per_unit": value}
+            for row, col, value in zip(rows.tolist(), cols.tolist(), values.tolist())
+        ]
@@ -0,0 +1,152 @@
+from typing import Collection, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+TABLE_TITLES = {
+    "products": "Products",
+    "resources": "Resources",
+    "resource_usage": "Resource Usage",
+    "demand_constraints": "Demand Constraints",
+}
+
+
+class CellError(NamedTuple):
+    table: str
+    row: int
+    column: int
+    message: str
+
+
+class ValidationReport:
+    """All problems found in one validation pass, addressed by table, row and column"""
+
+    def __init__(self, errors=None):
+        self.errors: List[CellError] = list(errors or [])
+
+    def __bool__(self):
+        return bool(self.errors)
+
+    def __len__(self):
+        return len(self.errors)
+
+    def for_table(self, table) -> Dict[Tuple[int, int], str]:
+        """Map (row, column) to message for one table; several problems in a cell are joined"""
+        cells: Dict[Tuple[int, int], str] = {}
+        for error in self.errors:
+            if error.table == table:
+                key = (error.row, error.column)
+                cells[key] = f"{cells[key]}; {error.message}" if key in cells else error.message
+        return cells
+
+    def summary(self) -> str:
+        if not self.errors:
+            return "No input problems found"
+        counts: Dict[str, int] = {}
+        for error in self.errors:
+            counts[error.table] = counts.get(error.table, 0) + 1
+        parts = [f"{TABLE_TITLES.get(table, table)}: {count}" for table, count in counts.items()]
+        return f"{len(self.errors)} input problem(s) - " + ", ".join(parts)
+
+
+def parse_numeric(texts: Sequence[str]):
+    """Parse a column of cell texts in one pass
+
+    Returns (values, blank, bad) where values holds NaN for blank or
+    unparseable cells and blank/bad are boolean masks.
+    """
+    stripped = np.char.strip(np.asarray(texts, dtype=str)) if len(texts) else np.empty(0, dtype=str)
+    blank = stripped == ""
+    values = np.full(len(stripped), np.nan)
+    filled = ~blank
+    try:
+        values[filled] = stripped[filled].astype(np.float64)
+    except ValueError:
+        # Slow path only when the column actually contains bad text
+        for i in np.flatnonzero(filled):
+            try:
+                values[i] = float(stripped[i])
+            except ValueError:
+                pass
+    bad = filled & ~np.isfinite(values)
+    values[bad] = np.nan
+    return values, blank, bad
+
+
+def _duplicates(keys: np.ndarray) -> np.ndarray:
+    """Mask of entries whose key already appeared earlier in the column"""
+    if len(keys) == 0:
+        return np.zeros(0, dtype=bool)
+    _, first = np.unique(keys, return_index=True)
+    duplicate = np.ones(len(keys), dtype=bool)
+    duplicate[first] = False
+    return duplicate
+
+
+def _names(texts: Sequence[str]) -> np.ndarray:
+    return np.char.strip(np.asarray(texts, dtype=str)) if len(texts) else np.empty(0, dtype=str)
+
+
+def validate_scenario(products, resources, resource_usage, demand_constraints,
+                      previous: Optional[ValidationReport] = None,
+                      tables: Collection[str] = tuple(TABLE_TITLES)) -> ValidationReport:
+    """Validate whole input tables at once
+
+    Each argument is a sequence of columns of cell text in table order:
+    products (name, profit, cost), resources (name, capacity),
+    resource_usage (product, resource, usage) and demand_constraints
+    (product, min, max). Rows with an empty name are treated as unused.
+    Only the tables named in tables are checked; the problems of the
+    others are taken over from the previous report.
+    """
+    errors: List[CellError] = [error for error in previous.errors if error.table not in tables] if previous else []
+
+    def flag(table, mask, column, message):
+        errors.extend(CellError(table, int(row), column, message) for row in np.flatnonzero(mask))
+
+    def check_numbers(table, texts, column, allow_blank):
+        values, blank, bad = parse_numeric(texts)
+        flag(table, bad, column, "Not a number")
+        if not allow_blank:
+            flag(table, blank, column, "Value required")
+        flag(table, values < 0, column, "Must not be negative")
+        return values
+
+    product_names = _names(products[0])
+    product_used = product_names != ""
+    if "products" in tables:
+        flag("products", _duplicates(product_names) & product_used, 0, "Duplicate product name")
+        for column in (1, 2):
+            check_numbers("products", products[column], column, allow_blank=True)
+
+    resource_names = _names(resources[0])
+    resource_used = resource_names != ""
+    if "resources" in tables:
+        flag("resources", _duplicates(resource_names) & resource_used, 0, "Duplicate resource name")
+        check_numbers("resources", resources[1], 1, allow_blank=True)
+
+    known_products = product_names[product_used]
+    known_resources = resource_names[resource_used]
+
+    if "resource_usage" in tables:
+        usage_products = _names(resource_usage[0])
+        usage_resources = _names(resource_usage[1])
+        usage_used = (usage_products != "") & (usage_resources != "")
+        flag("resource_usage", usage_used & ~np.isin(usage_products, known_products), 0, "Unknown product")
+        flag("resource_usage", usage_used & ~np.isin(usage_resources, known_resources), 1, "Unknown resource")
+        pairs = np.char.add(np.char.add(usage_products, "\x1f"), usage_resources)
+        flag("resource_usage", usage_used & _duplicates(pairs), 0, "Duplicate product/resource pair")
+        check_numbers("resource_usage", resource_usage[2], 2, allow_blank=True)
+
+    if "demand_constraints" in tables:
+        demand_products = _names(demand_constraints[0])
+        demand_used = demand_products != ""
+        flag("demand_constraints", demand_used & ~np.isin(demand_products, known_products), 0, "Unknown product")
+        flag("demand_constraints", demand_used & _duplicates(demand_products), 0, "Duplicate demand constraint")
+        min_demand = check_numbers("demand_constraints", demand_constraints[1], 1, allow_blank=True)
+        max_demand = check_numbers("demand_constraints", demand_constraints[2], 2, allow_blank=True)
+        with np.errstate(invalid="ignore"):
+            flag("demand_constraints", min_demand > max_demand, 2, "Max demand is below min demand")
+
+    table_order = list(TABLE_TITLES)
+    errors.sort(key=lambda error: (table_order.index(error.table), error.row, error.column))
+    return ValidationReport(errors)
@@ -1,27 +1,51 @@
 import os
 import sys
-import json
+import math
 import requests
 from typing import Dict, List, Any, Optional
 
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                               QHBoxLayout, QLabel, QComboBox, QPushButton, 
-                              QTableWidget, QTableWidgetItem, QTabWidget, 
+                              QTableWidget, QTableWidgetItem, QTableView, QTabWidget, 
                               QFormLayout, QLineEdit, QSpinBox, QDoubleSpinBox, 
                               QScrollArea, QSplitter, QGroupBox, QMessageBox,
                               QTextEdit, QHeaderView, QFrame, QCheckBox,
-                              QRadioButton, QButtonGroup)
-from PySide6.QtCore import Qt, Signal, Slot, QSize
-from PySide6.QtGui import QFont, QIcon, QPixmap, QColor
+                              QRadioButton, QButtonGroup, QDialog)
+from PySide6.QtCore import Qt, Signal, Slot, QSize, QTimer
+from PySide6.QtGui import QFont, QIcon, QPixmap, QColor, QKeySequence
+
+from core.change_bus import ChangeBus
+from core.history import History, expand
+from core.model_store import NO_BOUND, ScenarioStore
+from core.name_registry import NameRegistry
+from core.result_export import ResultArrays
+from core.tabular import parse_amounts, parse_delimited
+from core.usage_matrix import UsageMatrix
+from widgets.result_tables import ResultTableModel, production_columns, utilization_columns
+from widgets.result_tree import ResultView
+from widgets.table_paste import add_paste_action
+from widgets.usage_matrix_editor import UsageMatrixDialog
 
 # Base URL for API endpoints
 API_BASE_URL = "http://localhost:5000/production"
 
+def report_paste(parent, label, added, total):
+    """Warn once about pasted rows that could not be added"""
+    if added < total:
+        QMessageBox.warning(
+            parent,
+            "Paste",
+            f"Added {added} of {total} pasted {label}. Rows with invalid numbers, "
+            f"unknown or duplicate names were skipped."
+        )
+
 class OptimizationResultWidget(QWidget):
     """Widget to display optimization results"""
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Columns of the last result shown, for the change columns of the next one
+        self.previous_result: Optional[ResultArrays] = None
         self.init_ui()
         
     def init_ui(self):
@@ -47,9 +71,8 @@ class OptimizationResultWidget(QWidget):
         plan_group = QGroupBox("Production Plan")
         plan_layout = QVBoxLayout()
         
-        self.production_table = QTableWidget()
-        self.production_table.setAlternatingRowColors(True)
-        self.production_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.production_model = ResultTableModel(self)
+        self.production_table = self.create_result_table(self.production_model)
         
         plan_layout.addWidget(self.production_table)
         plan_group.setLayout(plan_layout)
@@ -58,9 +81,8 @@ class OptimizationResultWidget(QWidget):
         resource_group = QGroupBox("Resource Utilization")
         resource_layout = QVBoxLayout()
         
-        self.resource_table = QTableWidget()
-        self.resource_table.setAlternatingRowColors(True)
-        self.resource_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.resource_model = ResultTableModel(self)
+        self.resource_table = self.create_result_table(self.resource_model)
         
         resource_layout.addWidget(self.resource_table)
         resource_group.setLayout(resource_layout)
@@ -75,11 +97,31 @@ class OptimizationResultWidget(QWidget):
         messages_layout.addWidget(self.messages_text)
         messages_group.setLayout(messages_layout)
         
+        # Full result as a tree expanded on demand, and as raw JSON made when its tab is opened
+        details_group = QGroupBox("Result Details")
+        details_layout = QVBoxLayout()
+        
+        self.result_view = ResultView()
+        
+        details_layout.addWidget(self.result_view)
+        details_group.setLayout(details_layout)
+        
         # Add all sections to main layout
         layout.addWidget(summary_group)
         layout.addWidget(plan_group)
         layout.addWidget(resource_group)
         layout.addWidget(messages_group)
+        layout.addWidget(details_group)
+        
+    def create_result_table(self, model):
+        """Sortable view over a result model; it starts out in the order of the result"""
+        table = QTableView()
+        table.setModel(model)
+        table.setAlternatingRowColors(True)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        table.setSortingEnabled(True)
+        return table
         
     def display_results(self, result_data: Dict[str, Any], objective_type: str):
         """Display optimization results in the UI"""
@@ -99,40 +141,11 @@ class OptimizationResultWidget(QWidget):
         self.objective_value_label.setText(f"{value_prefix}{result_data.get('objective_value', 0):.2f}")
         self.solve_time_label.setText(f"{result_data.get('solve_time', 0):.4f} seconds")
         
-        # Update production plan table
-        production_plan = result_data.get("production_plan", {})
-        self.production_table.clear()
-        
-        if production_plan:
-            self.production_table.setColumnCount(2)
-            self.production_table.setHorizontalHeaderLabels(["Product", "Quantity"])
-            self.production_table.setRowCount(len(production_plan))
-            
-            for row, (product, quantity) in enumerate(production_plan.items()):
-                self.production_table.setItem(row, 0, QTableWidgetItem(product))
-                quantity_item = QTableWidgetItem(f"{quantity:.2f}")
-                quantity_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                self.production_table.setItem(row, 1, quantity_item)
-        
-        # Update resource utilization table
-        resource_usage = result_data.get("resource_utilization", {})
-        self.resource_table.clear()
-        
-        if resource_usage:
-            self.resource_table.setColumnCount(3)
-            self.resource_table.setHorizontalHeaderLabels(["Resource", "Used", "Available"])
-            self.resource_table.setRowCount(len(resource_usage))
-            
-            for row, (resource, usage) in enumerate(resource_usage.items()):
-                self.resource_table.setItem(row, 0, QTableWidgetItem(resource))
-                
-                used_item = QTableWidgetItem(f"{usage.get('used', 0):.2f}")
-                used_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                self.resource_table.setItem(row, 1, used_item)
-                
-                available_item = QTableWidgetItem(f"{usage.get('available', 0):.2f}")
-                available_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                self.resource_table.setItem(row, 2, available_item)
+        # Update the result tables; they only format the rows on screen
+        arrays = ResultArrays(result_data)
+        self.production_model.set_columns(production_columns(arrays, self.previous_result))
+        self.resource_model.set_columns(utilization_columns(arrays, self.previous_result))
+        self.previous_result = arrays
         
         # Update messages
         messages = []
@@ -154,6 +167,8 @@ class OptimizationResultWidget(QWidget):
                 messages.append(f"  • {constraint}: {info}")
         
         self.messages_text.setText("\n".join(messages))
+        
+        self.result_view.set_result(result_data)
 
 
 class ResourceInputForm(QWidget):
@@ -161,9 +176,12 @@ class ResourceInputForm(QWidget):
     
     resource_changed = Signal()
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, store=None):
         super().__init__(parent)
-        self.resources = []
+        self.store = store if store is not None else ScenarioStore()
+        # Rows live in the shared store as (id, available_capacity) columns
+        self.resources = self.store.resources
+        self.registry = self.store.resource_registry
         self.init_ui()
         
     def init_ui(self):
@@ -177,6 +195,7 @@ class ResourceInputForm(QWidget):
         ])
         self.resources_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.resources_table.setAlternatingRowColors(True)
+        add_paste_action(self.resources_table, self.paste_rows)
         
         # Controls for adding resources
         input_layout = QHBoxLayout()
@@ -224,14 +243,24 @@ class ResourceInputForm(QWidget):
         if row >= len(self.resources):
             return
             
-        resource = self.resources[row]
+        resource_id = int(self.resources.column("id")[row])
         
         # Based on which column was edited, update the correct field
         if col == 0:  # Resource name
-            resource["name"] = item.text()
+            name = item.text().strip()
+            if not name:
+                QMessageBox.warning(self, "Input Error", "Resource name cannot be empty")
+                self.update_table()
+                return
+            if name != self.registry.name_of(resource_id) and name in self.registry:
+                QMessageBox.warning(self, "Input Error", f"Resource '{name}' already exists")
+                self.update_table()
+                return
+            # Dependent forms reference the id, so this renames it everywhere
+            self.registry.rename(resource_id, name)
         elif col == 1:  # Available capacity
             try:
-                resource["available_capacity"] = float(item.text())
+                self.resources.set(row, "available_capacity", float(item.text()))
             except ValueError:
                 pass
         
@@ -245,7 +274,8 @@ class ResourceInputForm(QWidget):
         ]
         
         for resource in sample_resources:
-            self.resources.append(resource)
+            self.resources.append(id=self.registry.add(resource["name"]),
+                                  available_capacity=resource["available_capacity"])
             
         self.update_table()
         self.resource_changed.emit()
@@ -258,23 +288,36 @@ class ResourceInputForm(QWidget):
             return
             
         # Check for duplicate resource names
-        names = [r["name"] for r in self.resources]
-        if resource_name in names:
+        if resource_name in self.registry:
             QMessageBox.warning(self, "Input Error", f"Resource '{resource_name}' already exists")
             return
             
-        resource = {
-            "name": resource_name,
-            "available_capacity": self.available_capacity.value()
-        }
-        
-        self.resources.append(resource)
+        self.resources.append(id=self.registry.add(resource_name),
+                              available_capacity=self.available_capacity.value())
         self.update_table()
         self.resource_changed.emit()
         
         # Clear inputs for next resource
         self.resource_name.clear()
         
+    def paste_rows(self, text):
+        """Append resources pasted as tab- or comma-separated rows"""
+        names, capacities = parse_delimited(text, 2, (1,))
+        capacities, valid = parse_amounts(capacities)
+        
+        ids, accepted = [], []
+        for name, capacity, ok in zip(names, capacities, valid):
+            if not ok or not name or name in self.registry:
+                continue
+            ids.append(self.registry.add(name))
+            accepted.append(capacity)
+        self.resources.extend(id=ids, available_capacity=accepted)
+        added = len(ids)
+            
+        self.update_table()
+        self.resource_changed.emit()
+        report_paste(self, "resources", added, len(names))
+        
     def remove_selected_resource(self):
         """Remove the selected resource from the table"""
         selected_rows = self.resources_table.selectedIndexes()
@@ -283,7 +326,9 @@ class ResourceInputForm(QWidget):
             
         row = selected_rows[0].row()
         if 0 <= row < len(self.resources):
-            del self.resources[row]
+            resource_id = int(self.resources.column("id")[row])
+            self.resources.delete(row)
+            self.registry.remove(resource_id)
             self.update_table()
             self.resource_changed.emit()
     
@@ -295,11 +340,13 @@ class ResourceInputForm(QWidget):
         except TypeError:
             pass
         self.resources_table.setRowCount(len(self.resources))
+        names = self.store.names_for(self.registry, self.resources.column("id"))
+        capacities = self.resources.column("available_capacity").tolist()
         
-        for row, resource in enumerate(self.resources):
-            self.resources_table.setItem(row, 0, QTableWidgetItem(resource["name"]))
+        for row, (name, capacity) in enumerate(zip(names, capacities)):
+            self.resources_table.setItem(row, 0, QTableWidgetItem(name))
             
-            capacity_item = QTableWidgetItem(f"{resource['available_capacity']:.2f}")
+            capacity_item = QTableWidgetItem(f"{capacity:.2f}")
             capacity_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
             self.resources_table.setItem(row, 1, capacity_item)
         
@@ -308,15 +355,18 @@ class ResourceInputForm(QWidget):
     
     def get_resources_data(self) -> List[Dict[str, Any]]:
         """Get the resources data in a format suitable for the API"""
-        return self.resources
+        return self.store.resources_data()
 
 
 class ProductInputForm(QWidget):
     """Form for entering products and their properties"""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, store=None):
         super().__init__(parent)
-        self.products = []
+        self.store = store if store is not None else ScenarioStore()
+        # Rows live in the shared store as (id, profit_per_unit, cost_per_unit) columns
+        self.products = self.store.products
+        self.registry = self.store.product_registry
         self.init_ui()
         
     def init_ui(self):
@@ -330,6 +380,7 @@ class ProductInputForm(QWidget):
         ])
         self.products_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.products_table.setAlternatingRowColors(True)
+        add_paste_action(self.products_table, self.paste_rows)
         
         # Controls for adding products
         input_layout = QHBoxLayout()
@@ -382,23 +433,33 @@ class ProductInputForm(QWidget):
         if row >= len(self.products):
             return
             
-        product = self.products[row]
+        product_id = int(self.products.column("id")[row])
         
         # Based on which column was edited, update the correct field
         if col == 0:  # Product name
-            product["name"] = item.text()
+            name = item.text().strip()
+            if not name:
+                QMessageBox.warning(self, "Input Error", "Product name cannot be empty")
+                self.update_table()
+                return
+            if name != self.registry.name_of(product_id) and name in self.registry:
+                QMessageBox.warning(self, "Input Error", f"Product '{name}' already exists")
+                self.update_table()
+                return
+            # Dependent forms reference the id, so this renames it everywhere
+            self.registry.rename(product_id, name)
         elif col == 1:  # Profit per unit
             try:
                 # Strip the "$" and convert to float
                 profit_text = item.text().replace("$", "").strip()
-                product["profit_per_unit"] = float(profit_text)
+                self.products.set(row, "profit_per_unit", float(profit_text))
             except ValueError:
                 pass
         elif col == 2:  # Cost per unit
             try:
                 # Strip the "$" and convert to float
                 cost_text = item.text().replace("$", "").strip()
-                product["cost_per_unit"] = float(cost_text)
+                self.products.set(row, "cost_per_unit", float(cost_text))
             except ValueError:
                 pass
                 
@@ -411,7 +472,9 @@ class ProductInputForm(QWidget):
         ]
         
         for product in sample_products:
-            self.products.append(product)
+            self.products.append(id=self.registry.add(product["name"]),
+                                 profit_per_unit=product["profit_per_unit"],
+                                 cost_per_unit=product["cost_per_unit"])
             
         self.update_table()
     
@@ -423,23 +486,37 @@ class ProductInputForm(QWidget):
             return
             
         # Check for duplicate product names
-        names = [p["name"] for p in self.products]
-        if product_name in names:
+        if product_name in self.registry:
             QMessageBox.warning(self, "Input Error", f"Product '{product_name}' already exists")
             return
             
-        product = {
-            "name": product_name,
-            "profit_per_unit": self.profit_per_unit.value(),
-            "cost_per_unit": self.cost_per_unit.value()
-        }
-        
-        self.products.append(product)
+        self.products.append(id=self.registry.add(product_name),
+                             profit_per_unit=self.profit_per_unit.value(),
+                             cost_per_unit=self.cost_per_unit.value())
         self.update_table()
         
         # Clear inputs for next product
         self.product_name.clear()
         
+    def paste_rows(self, text):
+        """Append products pasted as tab- or comma-separated rows"""
+        names, profits, costs = parse_delimited(text, 3, (1, 2))
+        profits, profits_valid = parse_amounts(profits)
+        costs, costs_valid = parse_amounts(costs)
+        
+        ids, accepted_profits, accepted_costs = [], [], []
+        for name, profit, cost, profit_ok, cost_ok in zip(names, profits, costs, profits_valid, costs_valid):
+            if not (profit_ok and cost_ok) or not name or name in self.registry:
+                continue
+            ids.append(self.registry.add(name))
+            accepted_profits.append(profit)
+            accepted_costs.append(cost)
+        self.products.extend(id=ids, profit_per_unit=accepted_profits, cost_per_unit=accepted_costs)
+        added = len(ids)
+            
+        self.update_table()
+        report_paste(self, "products", added, len(names))
+        
     def remove_selected_product(self):
         """Remove the selected product from the table"""
         selected_rows = self.products_table.selectedIndexes()
@@ -448,7 +525,9 @@ class ProductInputForm(QWidget):
             
         row = selected_rows[0].row()
         if 0 <= row < len(self.products):
-            del self.products[row]
+            product_id = int(self.products.column("id")[row])
+            self.products.delete(row)
+            self.registry.remove(product_id)
             self.update_table()
     
     def update_table(self):
@@ -459,15 +538,18 @@ class ProductInputForm(QWidget):
         except TypeError:
             pass
         self.products_table.setRowCount(len(self.products))
+        names = self.store.names_for(self.registry, self.products.column("id"))
+        profits = self.products.column("profit_per_unit").tolist()
+        costs = self.products.column("cost_per_unit").tolist()
         
-        for row, product in enumerate(self.products):
-            self.products_table.setItem(row, 0, QTableWidgetItem(product["name"]))
+        for row, (name, profit, cost) in enumerate(zip(names, profits, costs)):
+            self.products_table.setItem(row, 0, QTableWidgetItem(name))
             
-            profit_item = QTableWidgetItem(f"{product['profit_per_unit']:.2f}")
+            profit_item = QTableWidgetItem(f"{profit:.2f}")
             profit_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
             self.products_table.setItem(row, 1, profit_item)
             
-            cost_item = QTableWidgetItem(f"{product['cost_per_unit']:.2f}")
+            cost_item = QTableWidgetItem(f"{cost:.2f}")
             cost_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
             self.products_table.setItem(row, 2, cost_item)
         
@@ -476,17 +558,27 @@ class ProductInputForm(QWidget):
     
     def get_products_data(self) -> List[Dict[str, Any]]:
         """Get the products data in a format suitable for the API"""
-        return self.products
+        return self.store.products_data()
 
 
 class ResourceUsageForm(QWidget):
     """Form for defining which resources each product uses and how much"""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, store=None):
         super().__init__(parent)
         self.products = []
         self.resources = []
-        self.resource_usage = []
+        self.store = store if store is not None else ScenarioStore()
+        # Entries reference products and resources by registry id
+        self.resource_usage = self.store.resource_usage
+        self.product_registry = self.store.product_registry
+        self.resource_registry = self.store.resource_registry
+        self.product_registry.add_listener(
+            lambda event, entity_id, name: self.on_registry_changed("product_id", self.product_combo, event, entity_id, name)
+        )
+        self.resource_registry.add_listener(
+            lambda event, entity_id, name: self.on_registry_changed("resource_id", self.resource_combo, event, entity_id, name)
+        )
         self.init_ui()
         
     def init_ui(self):
@@ -495,6 +587,7 @@ class ResourceUsageForm(QWidget):
         # Resource usage table
         self.usage_table = QTableWidget()
         self.usage_table.setAlternatingRowColors(True)
+        add_paste_action(self.usage_table, self.paste_rows)
         
         # Controls for adding resource usage
         form_layout = QFormLayout()
@@ -519,9 +612,13 @@ class ResourceUsageForm(QWidget):
         remove_button = QPushButton("Remove Selected")
         remove_button.clicked.connect(self.remove_selected_usage)
         
+        matrix_button = QPushButton("Edit as Matrix")
+        matrix_button.clicked.connect(self.edit_as_matrix)
+        
         buttons_layout = QHBoxLayout()
         buttons_layout.addWidget(add_button)
         buttons_layout.addWidget(remove_button)
+        buttons_layout.addWidget(matrix_button)
         
         layout.addLayout(form_layout)
         layout.addLayout(buttons_layout)
@@ -542,15 +639,34 @@ class ResourceUsageForm(QWidget):
         if row >= len(self.resource_usage):
             return
             
-        usage = self.resource_usage[row]
-        
         # Only usage per unit is editable (column 2)
         if col == 2:  # Usage per unit
             try:
-                usage["usage_per_unit"] = float(item.text())
+                self.resource_usage.set(row, "usage_per_unit", float(item.text()))
             except ValueError:
                 pass
     
+    def on_registry_changed(self, key, combo, event, entity_id, name):
+        """Repaint or prune entries after products or resources are renamed or removed"""
+        if event == "added":
+            return
+        index = combo.findData(entity_id)
+        if event == "renamed":
+            if index >= 0:
+                combo.setItemText(index, name)
+        elif event == "removed":
+            if index >= 0:
+                combo.removeItem(index)
+            self.resource_usage.keep(self.resource_usage.column(key) != entity_id)
+        elif event == "pruned":
+            registry = self.product_registry if key == "product_id" else self.resource_registry
+            for index in reversed(range(combo.count())):
+                if not registry.has_id(combo.itemData(index)):
+                    combo.removeItem(index)
+            # Entries whose names are still registered keep their rows
+            self.resource_usage.keep(self.store.registered(registry, self.resource_usage.column(key)))
+        self.update_table()
+    
     def update_products_and_resources(self, products, resources):
         """Update the available products and resources"""
         self.products = products
@@ -561,10 +677,10 @@ class ResourceUsageForm(QWidget):
         self.resource_combo.clear()
         
         for product in products:
-            self.product_combo.addItem(product["name"])
+            self.product_combo.addItem(product["name"], self.product_registry.id_of(product["name"]))
             
         for resource in resources:
-            self.resource_combo.addItem(resource["name"])
+            self.resource_combo.addItem(resource["name"], self.resource_registry.id_of(resource["name"]))
         
         # Update table headers
         self.update_table()
@@ -577,24 +693,19 @@ class ResourceUsageForm(QWidget):
             
         product_name = self.product_combo.currentText()
         resource_name = self.resource_combo.currentText()
+        key = (self.product_combo.currentData(), self.resource_combo.currentData())
         
         # Check if this product-resource combination already exists
-        for usage in self.resource_usage:
-            if usage["product_name"] == product_name and usage["resource_name"] == resource_name:
-                QMessageBox.warning(
-                    self, 
-                    "Input Error", 
-                    f"Resource usage for {product_name} - {resource_name} already exists"
-                )
-                return
+        if self.resource_usage.find(product_id=key[0], resource_id=key[1]) >= 0:
+            QMessageBox.warning(
+                self, 
+                "Input Error", 
+                f"Resource usage for {product_name} - {resource_name} already exists"
+            )
+            return
                 
-        usage = {
-            "product_name": product_name,
-            "resource_name": resource_name,
-            "usage_per_unit": self.usage_per_unit.value()
-        }
-        
-        self.resource_usage.append(usage)
+        self.resource_usage.append(product_id=key[0], resource_id=key[1],
+                                   usage_per_unit=self.usage_per_unit.value())
         self.update_table()
         
     def remove_selected_usage(self):
@@ -605,19 +716,64 @@ class ResourceUsageForm(QWidget):
             
         row = selected_rows[0].row()
         if 0 <= row < len(self.resource_usage):
-            del self.resource_usage[row]
+            self.resource_usage.delete(row)
             self.update_table()
     
+    def paste_rows(self, text):
+        """Append usage entries pasted as product, resource, usage rows"""
+        products, resources, usages = parse_delimited(text, 3, (2,))
+        usages, valid = parse_amounts(usages)
+        # Pasted names repeat a lot, so resolve each distinct one once
+        product_ids = {name: self.product_registry.id_of(name) for name in set(products)}
+        resource_ids = {name: self.resource_registry.id_of(name) for name in set(resources)}
+        
+        existing = set(zip(self.resource_usage.column("product_id").tolist(),
+                           self.resource_usage.column("resource_id").tolist()))
+        
+        accepted_products, accepted_resources, accepted_usages = [], [], []
+        for product, resource, usage, ok in zip(products, resources, usages, valid):
+            key = (product_ids[product], resource_ids[resource])
+            if not ok or None in key or key in existing:
+                continue
+            existing.add(key)
+            accepted_products.append(key[0])
+            accepted_resources.append(key[1])
+            accepted_usages.append(usage)
+        self.resource_usage.extend(product_id=accepted_products, resource_id=accepted_resources,
+                                   usage_per_unit=accepted_usages)
+        added = len(accepted_usages)
+            
+        self.update_table()
+        report_paste(self, "usage entries", added, len(products))
+    
+    def edit_as_matrix(self):
+        """Edit all resource usage entries as a product x resource grid"""
+        matrix = UsageMatrix.from_resource_usage(
+            self.get_resource_usage_data(),
+            [p["name"] for p in self.products],
+            [r["name"] for r in self.resources]
+        )
+        dialog = UsageMatrixDialog(matrix, self)
+        if dialog.exec() == QDialog.Accepted:
+            self.set_resource_usage_data(dialog.matrix().to_resource_usage())
+    
+    def set_resource_usage_data(self, resource_usage):
+        """Replace all entries from API-format dicts, skipping unknown names"""
+        self.resource_usage.clear()
+        for entry in resource_usage:
+            product_id = self.product_registry.id_of(entry["product_name"])
+            resource_id = self.resource_registry.id_of(entry["resource_name"])
+            if product_id is not None and resource_id is not None:
+                self.resource_usage.append(product_id=product_id, resource_id=resource_id,
+                                           usage_per_unit=entry["usage_per_unit"])
+        self.update_table()
+    
     def add_sample_data(self):
         """Add sample resource usage data"""
         # Clear existing data
-        self.resource_usage = []
-        
-        # Get product and resource names
-        product_names = [p["name"] for p in self.products]
-        resource_names = [r["name"] for r in self.resources]
+        self.resource_usage.clear()
         
-        if not product_names or not resource_names:
+        if not self.products or not self.resources:
             return
         
         # Create sample usage data for each product-resource combination
@@ -630,12 +786,8 @@ class ResourceUsageForm(QWidget):
             {"product_name": "Product C", "resource_name": "Raw Material", "usage_per_unit": 4.0},
         ]
         
-        # Only add entries if both product and resource exist
-        for entry in sample_data:
-            if entry["product_name"] in product_names and entry["resource_name"] in resource_names:
-                self.resource_usage.append(entry)
-        
-        self.update_table()
+        # Only entries whose product and resource both exist are kept
+        self.set_resource_usage_data(sample_data)
     
     def update_table(self):
         """Update the resource usage table"""
@@ -648,13 +800,16 @@ class ResourceUsageForm(QWidget):
             "Product", "Resource", "Usage Per Unit"
         ])
         self.usage_table.setRowCount(len(self.resource_usage))
+        products = self.store.names_for(self.product_registry, self.resource_usage.column("product_id"))
+        resources = self.store.names_for(self.resource_registry, self.resource_usage.column("resource_id"))
+        usages = self.resource_usage.column("usage_per_unit").tolist()
         
         # Fill in the table
-        for row, usage in enumerate(self.resource_usage):
-            self.usage_table.setItem(row, 0, QTableWidgetItem(usage["product_name"]))
-            self.usage_table.setItem(row, 1, QTableWidgetItem(usage["resource_name"]))
+        for row, (product, resource, usage) in enumerate(zip(products, resources, usages)):
+            self.usage_table.setItem(row, 0, QTableWidgetItem(product))
+            self.usage_table.setItem(row, 1, QTableWidgetItem(resource))
             
-            usage_item = QTableWidgetItem(f"{usage['usage_per_unit']:.2f}")
+            usage_item = QTableWidgetItem(f"{usage:.2f}")
             usage_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
             self.usage_table.setItem(row, 2, usage_item)
         
@@ -675,16 +830,20 @@ class ResourceUsageForm(QWidget):
     
     def get_resource_usage_data(self) -> List[Dict[str, Any]]:
         """Get the resource usage data in a format suitable for the API"""
-        return self.resource_usage
+        return self.store.resource_usage_data()
 
 
 class DemandConstraintsForm(QWidget):
     """Form for entering demand constraints for products"""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, store=None):
         super().__init__(parent)
         self.products = []
-        self.demand_constraints = []
+        self.store = store if store is not None else ScenarioStore()
+        # Constraints reference products by registry id; a bound of 0 is stored as NO_BOUND
+        self.demand_constraints = self.store.demand_constraints
+        self.registry = self.store.product_registry
+        self.registry.add_listener(self.on_registry_changed)
         self.init_ui()
         
     def init_ui(self):
@@ -706,6 +865,7 @@ class DemandConstraintsForm(QWidget):
         ])
         self.constraints_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.constraints_table.setAlternatingRowColors(True)
+        add_paste_action(self.constraints_table, self.paste_rows)
         
         # Controls for adding constraints
         form_layout = QFormLayout()
@@ -760,21 +920,19 @@ class DemandConstraintsForm(QWidget):
         if row >= len(self.demand_constraints):
             return
             
-        constraint = self.demand_constraints[row]
-        
         # Based on which column was edited, update the correct field
         if col == 1:  # Min demand
             try:
-                constraint["min_demand"] = float(item.text())
+                self.demand_constraints.set(row, "min_demand", float(item.text()) or NO_BOUND)
             except ValueError:
                 pass
         elif col == 2:  # Max demand
             try:
                 text = item.text()
                 if text == "No maximum":
-                    constraint["max_demand"] = 0
+                    self.demand_constraints.set(row, "max_demand", NO_BOUND)
                 else:
-                    constraint["max_demand"] = float(text)
+                    self.demand_constraints.set(row, "max_demand", float(text) or NO_BOUND)
             except ValueError:
                 pass
     
@@ -790,9 +948,30 @@ class DemandConstraintsForm(QWidget):
             )
             
             if reply == QMessageBox.Yes:
-                self.demand_constraints = []
+                self.demand_constraints.clear()
                 self.update_table()
     
+    def on_registry_changed(self, event, entity_id, name):
+        """Repaint or prune constraints after a product is renamed or removed"""
+        if event == "added":
+            return
+        index = self.product_combo.findData(entity_id)
+        if event == "renamed":
+            if index >= 0:
+                self.product_combo.setItemText(index, name)
+        elif event == "removed":
+            if index >= 0:
+                self.product_combo.removeItem(index)
+            self.demand_constraints.keep(self.demand_constraints.column("product_id") != entity_id)
+        elif event == "pruned":
+            for index in reversed(range(self.product_combo.count())):
+                if not self.registry.has_id(self.product_combo.itemData(index)):
+                    self.product_combo.removeItem(index)
+            # Constraints on products that are still registered stay
+            self.demand_constraints.keep(self.store.registered(self.registry,
+                                                               self.demand_constraints.column("product_id")))
+        self.update_table()
+    
     def update_products(self, products):
         """Update the available products"""
         self.products = products
@@ -800,7 +979,7 @@ class DemandConstraintsForm(QWidget):
         # Update combo box
         self.product_combo.clear()
         for product in products:
-            self.product_combo.addItem(product["name"])
+            self.product_combo.addItem(product["name"], self.registry.id_of(product["name"]))
         
         # Update table headers
         self.update_table()
@@ -812,16 +991,16 @@ class DemandConstraintsForm(QWidget):
             return
             
         product_name = self.product_combo.currentText()
+        product_id = self.product_combo.currentData()
         
         # Check if this product already has constraints
-        for constraint in self.demand_constraints:
-            if constraint["product_name"] == product_name:
-                QMessageBox.warning(
-                    self, 
-                    "Input Error", 
-                    f"Demand constraints for {product_name} already exist"
-                )
-                return
+        if self.demand_constraints.find(product_id=product_id) >= 0:
+            QMessageBox.warning(
+                self, 
+                "Input Error", 
+                f"Demand constraints for {product_name} already exist"
+            )
+            return
         
         # Only add if at least one constraint is non-zero
         min_demand = self.min_demand.value()
@@ -835,14 +1014,35 @@ class DemandConstraintsForm(QWidget):
             )
             return
                 
-        constraint = {
-            "product_name": product_name,
-            "min_demand": min_demand,
-            "max_demand": max_demand
-        }
+        self.demand_constraints.append(product_id=product_id, min_demand=min_demand or NO_BOUND,
+                                       max_demand=max_demand or NO_BOUND)
+        self.update_table()
         
-        self.demand_constraints.append(constraint)
+    def paste_rows(self, text):
+        """Append constraints pasted as product, min, max rows; 0 or blank means no bound"""
+        products, min_demands, max_demands = parse_delimited(text, 3, (1, 2))
+        min_demands, min_valid = parse_amounts(min_demands)
+        max_demands, max_valid = parse_amounts(max_demands)
+        product_id = self.registry.id_of
+        constrained = set(self.demand_constraints.column("product_id").tolist())
+        
+        ids, accepted_min, accepted_max = [], [], []
+        for product, min_demand, max_demand, min_ok, max_ok in zip(
+                products, min_demands, max_demands, min_valid, max_valid):
+            entity_id = product_id(product)
+            if not (min_ok and max_ok) or entity_id is None or entity_id in constrained:
+                continue
+            if min_demand == 0 and max_demand == 0:
+                continue
+            constrained.add(entity_id)
+            ids.append(entity_id)
+            accepted_min.append(min_demand or NO_BOUND)
+            accepted_max.append(max_demand or NO_BOUND)
+        self.demand_constraints.extend(product_id=ids, min_demand=accepted_min, max_demand=accepted_max)
+        added = len(ids)
+            
         self.update_table()
+        report_paste(self, "constraints", added, len(products))
         
     def remove_selected_constraint(self):
         """Remove the selected demand constraint entry"""
@@ -852,18 +1052,15 @@ class DemandConstraintsForm(QWidget):
             
         row = selected_rows[0].row()
         if 0 <= row < len(self.demand_constraints):
-            del self.demand_constraints[row]
+            self.demand_constraints.delete(row)
             self.update_table()
     
     def add_sample_data(self):
         """Add sample demand constraints"""
         # Clear existing data
-        self.demand_constraints = []
-        
-        # Get product names
-        product_names = [p["name"] for p in self.products]
+        self.demand_constraints.clear()
         
-        if not product_names:
+        if not self.products:
             return
         
         # Create sample constraints
@@ -874,8 +1071,11 @@ class DemandConstraintsForm(QWidget):
         
         # Only add entries if product exists
         for entry in sample_data:
-            if entry["product_name"] in product_names:
-                self.demand_constraints.append(entry)
+            product_id = self.registry.id_of(entry["product_name"])
+            if product_id is not None:
+                self.demand_constraints.append(product_id=product_id,
+                                               min_demand=entry["min_demand"] or NO_BOUND,
+                                               max_demand=entry["max_demand"] or NO_BOUND)
         
         self.update_table()
     
@@ -890,18 +1090,19 @@ class DemandConstraintsForm(QWidget):
             "Product", "Min Demand", "Max Demand"
         ])
         self.constraints_table.setRowCount(len(self.demand_constraints))
+        products = self.store.names_for(self.registry, self.demand_constraints.column("product_id"))
+        min_values = self.demand_constraints.column("min_demand").tolist()
+        max_values = self.demand_constraints.column("max_demand").tolist()
         
         # Fill in the table
-        for row, constraint in enumerate(self.demand_constraints):
-            self.constraints_table.setItem(row, 0, QTableWidgetItem(constraint["product_name"]))
+        for row, (product, min_value, max_value) in enumerate(zip(products, min_values, max_values)):
+            self.constraints_table.setItem(row, 0, QTableWidgetItem(product))
             
-            min_value = constraint["min_demand"]
-            min_item = QTableWidgetItem("No minimum" if min_value == 0 else f"{min_value:.2f}")
+            min_item = QTableWidgetItem("No minimum" if math.isnan(min_value) else f"{min_value:.2f}")
             min_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
             self.constraints_table.setItem(row, 1, min_item)
             
-            max_value = constraint["max_demand"]
-            max_item = QTableWidgetItem("No maximum" if max_value == 0 else f"{max_value:.2f}")
+            max_item = QTableWidgetItem("No maximum" if math.isnan(max_value) else f"{max_value:.2f}")
             max_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
             self.constraints_table.setItem(row, 2, max_item)
         
@@ -919,10 +1120,15 @@ class DemandConstraintsForm(QWidget):
     
     def get_demand_constraints(self) -> List[Dict[str, Any]]:
         """Get the demand constraints data in a format suitable for the API"""
-        # Filter constraints to remove any with both min and max as 0
+        # The API takes 0 for a missing bound; constraints without any bound are left out
         return [
-            constraint for constraint in self.demand_constraints
-            if constraint["min_demand"] > 0 or constraint["max_demand"] > 0
+            {
+                "product_name": constraint["product_name"],
+                "min_demand": constraint.get("min_demand", 0),
+                "max_demand": constraint.get("max_demand", 0)
+            }
+            for constraint in self.store.demand_constraints_data()
+            if constraint.get("min_demand", 0) > 0 or constraint.get("max_demand", 0) > 0
         ]
 
 
@@ -977,6 +1183,17 @@ class OptimizationPanel(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.optimizer_types = []
+        # Shared name indexes; every form refers to products and resources by id
+        self.product_registry = NameRegistry()
+        self.resource_registry = NameRegistry()
+        # Typed columns holding the scenario that all forms read and write
+        self.store = ScenarioStore(self.product_registry, self.resource_registry)
+        # Edits only mark forms dirty; dependent forms refresh once per event-loop pass
+        self.change_bus = ChangeBus(lambda flush: QTimer.singleShot(0, flush))
+        # Undo history of the store as cell text; one entry per change-bus flush
+        self.history = History()
+        self.history.record("Initial state", self.store.table_text())
+        self.pending_command = None
         self.init_ui()
         self.fetch_optimizer_types()
         
@@ -1019,6 +1236,16 @@ class OptimizationPanel(QWidget):
         self.run_button.clicked.connect(self.run_optimization)
         optimizer_layout.addWidget(self.run_button)
         
+        # Undo and redo whole commands, however many cells or rows they touched
+        self.undo_button = QPushButton("Undo")
+        self.undo_button.setShortcut(QKeySequence.Undo)
+        self.undo_button.clicked.connect(self.undo)
+        optimizer_layout.addWidget(self.undo_button)
+        self.redo_button = QPushButton("Redo")
+        self.redo_button.setShortcut(QKeySequence.Redo)
+        self.redo_button.clicked.connect(self.redo)
+        optimizer_layout.addWidget(self.redo_button)
+        
         input_layout.addWidget(objective_group)
         input_layout.addLayout(optimizer_layout)
         
@@ -1026,15 +1253,15 @@ class OptimizationPanel(QWidget):
         input_tabs = QTabWidget()
         
         # Products tab
-        self.product_form = ProductInputForm()
+        self.product_form = ProductInputForm(store=self.store)
         input_tabs.addTab(self.product_form, "Products")
         
         # Resources tab
-        self.resource_form = ResourceInputForm()
+        self.resource_form = ResourceInputForm(store=self.store)
         input_tabs.addTab(self.resource_form, "Resources")
         
         # Resource Usage tab
-        self.usage_form = ResourceUsageForm()
+        self.usage_form = ResourceUsageForm(store=self.store)
         input_tabs.addTab(self.usage_form, "Resource Usage")
         
     # Constraints tab
@@ -1053,7 +1280,7 @@ class OptimizationPanel(QWidget):
         # Demand constraints group
         demand_constraints_group = QGroupBox("Product Demand Constraints")
         demand_constraints_layout = QVBoxLayout(demand_constraints_group)
-        self.demand_constraints_form = DemandConstraintsForm()
+        self.demand_constraints_form = DemandConstraintsForm(store=self.store)
         demand_constraints_layout.addWidget(self.demand_constraints_form)
         constraints_layout.addWidget(demand_constraints_group)
         
@@ -1082,19 +1309,33 @@ class OptimizationPanel(QWidget):
         main_layout.addWidget(splitter)
         
         # Connect signals to update forms when products/resources change
-        self.product_form.products_table.itemChanged.connect(self.update_forms)
-        self.resource_form.resource_changed.connect(self.update_forms)
-        
-        # Add sample data after initial setup
+        self.product_form.products_table.itemChanged.connect(lambda item: self.change_bus.mark("products"))
+        self.resource_form.resource_changed.connect(lambda: self.change_bus.mark("resources"))
+        self.change_bus.subscribe("products", self.update_forms)
+        self.change_bus.subscribe("resources", self.update_forms)
+        
+        # Every form repaints its table from the store after a change, so table updates mark the history
+        for table in (self.product_form.products_table, self.resource_form.resources_table,
+                      self.usage_form.usage_table, self.demand_constraints_form.constraints_table):
+            table.model().dataChanged.connect(lambda *args: self.change_bus.mark("history"))
+            table.model().rowsInserted.connect(lambda *args: self.change_bus.mark("history"))
+            table.model().rowsRemoved.connect(lambda *args: self.change_bus.mark("history"))
+        self.change_bus.subscribe("history", self.record_history)
+        
+        # Add sample data after initial setup; the sample rows of every form are one undo step
         self.add_sample_data()
+        self.pending_command = "Load sample data"
+        self.change_bus.mark("history")
         # Status indicator for which endpoint will be used
         self.endpoint_indicator = QLabel("Using basic production model")
         self.endpoint_indicator.setStyleSheet("color: blue; font-style: italic;")
         optimizer_layout.addWidget(self.endpoint_indicator)
         
         # Connect demand constraints form to update endpoint indicator
-        self.demand_constraints_form.constraints_table.model().rowsInserted.connect(self.update_endpoint_indicator)
-        self.demand_constraints_form.constraints_table.model().rowsRemoved.connect(self.update_endpoint_indicator)
+        demand_model = self.demand_constraints_form.constraints_table.model()
+        demand_model.rowsInserted.connect(lambda *args: self.change_bus.mark("demand"))
+        demand_model.rowsRemoved.connect(lambda *args: self.change_bus.mark("demand"))
+        self.change_bus.subscribe("demand", self.update_endpoint_indicator)
         
     def update_endpoint_indicator(self):
         """Update the indicator showing which endpoint will be used"""
@@ -1118,6 +1359,45 @@ class OptimizationPanel(QWidget):
         # Update demand constraints form
         self.demand_constraints_form.update_products(products)
     
+    def record_history(self):
+        """Record the store as one undo step if it changed since the last one"""
+        self.history.record(self.pending_command or "Edit", self.store.table_text())
+        self.pending_command = None
+        self.update_history_buttons()
+        
+    def undo(self):
+        """Restore the scenario as it was before the last command"""
+        self.restore_history(self.history.undo)
+        
+    def redo(self):
+        """Re-apply the last undone command"""
+        self.restore_history(self.history.redo)
+        
+    def restore_history(self, step):
+        """Move through the history with step and show the resulting snapshot in every form"""
+        # Record edits still waiting for a flush before moving through the history
+        if self.change_bus.pending:
+            self.change_bus.flush()
+        snapshot = step()
+        if snapshot is None:
+            return
+        self.store.restore_table_text({key: expand(table) for key, table in snapshot.tables.items()})
+        self.product_form.update_table()
+        self.resource_form.update_table()
+        self.update_forms()
+        self.update_endpoint_indicator()
+        # The repainted tables mark the history, but the store equals the snapshot so nothing new is recorded
+        self.update_history_buttons()
+        
+    def update_history_buttons(self):
+        """Enable undo and redo when there is a command to move across, named in the tooltips"""
+        undo_label = self.history.undo_label()
+        redo_label = self.history.redo_label()
+        self.undo_button.setEnabled(undo_label is not None)
+        self.undo_button.setToolTip(f"Undo {undo_label}" if undo_label else "")
+        self.redo_button.setEnabled(redo_label is not None)
+        self.redo_button.setToolTip(f"Redo {redo_label}" if redo_label else "")
+        
     def add_sample_data(self):
         """Add sample data to all forms"""
         # Get current products and resources
@@ -1228,10 +1508,6 @@ class OptimizationPanel(QWidget):
         QApplication.processEvents()
         
         try:
-            # Debug output
-            print("Sending optimization request with data:")
-            print(json.dumps(request_data, indent=2))
-            
             # Make API request
             response = requests.post(
                 f"{API_BASE_URL}/optimize/{optimizer_type}{endpoint_suffix}", 
@@ -1241,8 +1517,6 @@ class OptimizationPanel(QWidget):
             
             if response.status_code == 200:
                 result_data = response.json()
-                print("Received optimization results:")
-                print(json.dumps(result_data, indent=2))
                 self.results_widget.display_results(result_data, objective)
             else:
                 try:
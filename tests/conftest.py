@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+import app
+
+qt_app = QApplication.instance() or QApplication([])
+
+
+def refuse(*args, **kwargs):
+    raise app.requests.ConnectionError("no server in tests")
+
+
+@pytest.fixture
+def make_window(tmp_path, monkeypatch):
+    """Open main windows autosaving under tmp_path, without an API server; closed after the test"""
+    monkeypatch.setattr(app, "AUTOSAVE_DIR", str(tmp_path / "autosave"))
+    monkeypatch.setattr(app.requests, "get", refuse)
+    monkeypatch.setattr(app.QMessageBox, "warning", staticmethod(lambda *args, **kwargs: None))
+    windows = []
+
+    def make():
+        window = app.MainWindow()
+        windows.append(window)
+        # Starts the journal
+        qt_app.processEvents()
+        return window
+
+    yield make
+    for window in windows:
+        window.close()
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+from PyQt5.QtWidgets import QApplication
+
+import app
+
+SCENARIO = {
+    "objective": "maximize_profit",
+    "products": [{"name": "A", "profit_per_unit": 5.0, "cost_per_unit": 1.0},
+                 {"name": "B", "profit_per_unit": 4.0, "cost_per_unit": 1.0}],
+    "resources": [{"name": "R", "available_capacity": 10.0}],
+    "resource_usage": [{"product_name": "A", "resource_name": "R", "usage_per_unit": 2.0},
+                       {"product_name": "B", "resource_name": "R", "usage_per_unit": 3.0}],
+    "demand_constraints": [{"product_name": "A", "min_demand": 1.0},
+                           {"product_name": "B", "max_demand": 4.0}],
+}
+
+
+@pytest.fixture
+def window(make_window):
+    window = make_window()
+    window.set_input_data(SCENARIO)
+    QApplication.processEvents()
+    return window
+
+
+def import_csv(window, monkeypatch, path, key):
+    monkeypatch.setattr(app.QFileDialog, "getOpenFileName", staticmethod(lambda *args, **kwargs: (str(path), "")))
+    window.import_csv(key)
+    deadline = time.monotonic() + 10
+    while window.load_thread is not None and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.001)
+    QApplication.processEvents()
+
+
+def test_importing_products_keeps_the_usage_and_demand_of_products_still_listed(window, monkeypatch, tmp_path):
+    path = tmp_path / "products.csv"
+    path.write_text("name,profit,cost\nA,7,2\nC,3,1\n")
+
+    import_csv(window, monkeypatch, path, "products")
+
+    data = window.get_input_data()
+    assert [product["name"] for product in data["products"]] == ["A", "C"]
+    assert data["resource_usage"] == [{"product_name": "A", "resource_name": "R", "usage_per_unit": 2.0}]
+    assert data["demand_constraints"] == [{"product_name": "A", "min_demand": 1.0}]
+    assert "removed 2 rows" in window.statusBar().currentMessage()
+
+
+def test_importing_the_same_products_keeps_every_row(window, monkeypatch, tmp_path):
+    path = tmp_path / "products.csv"
+    path.write_text("B,1,1\nA,2,1\n")
+
+    import_csv(window, monkeypatch, path, "products")
+
+    data = window.get_input_data()
+    assert data["resource_usage"] == SCENARIO["resource_usage"]
+    assert data["demand_constraints"] == SCENARIO["demand_constraints"]
+    # Renames still reach the rows, so the names kept their ids
+    window.products_table.item(0, 0).setText("B2")
+    assert window.resource_usage_table.item(1, 0).text() == "B2"
+
+
+def test_an_import_that_fails_unexpectedly_unlocks_the_window(window, monkeypatch, tmp_path):
+    path = tmp_path / "products.csv"
+    path.write_text("name,profit_per_unit,cost_per_unit\nA,5,1\n")
+    warnings = []
+    monkeypatch.setattr(app.QMessageBox, "warning", staticmethod(lambda parent, title, text: warnings.append(text)))
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("reader broke")
+
+    monkeypatch.setattr(app, "read_csv_batches", broken)
+    import_csv(window, monkeypatch, path, "products")
+
+    assert window.load_thread is None
+    assert window.tab_widget.widget(0).isEnabled()
+    assert len(warnings) == 1 and warnings[0].endswith("RuntimeError: reader broke")
@@ -0,0 +1,66 @@
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+import app
+
+
+def broken(*args, **kwargs):
+    raise RuntimeError("reader broke")
+
+
+def record_warnings(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(app.QMessageBox, "warning", staticmethod(lambda parent, title, text: warnings.append(text)))
+    return warnings
+
+
+def wait_for_load(window):
+    deadline = time.monotonic() + 10
+    while window.load_thread is not None and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.001)
+
+
+def test_a_load_that_fails_unexpectedly_unlocks_the_window(make_window, monkeypatch):
+    window = make_window()
+    warnings = record_warnings(monkeypatch)
+    monkeypatch.setattr(app, "ScenarioReader", broken)
+
+    window.load_scenario_file("example_basic_optimization.json", "example")
+    wait_for_load(window)
+
+    assert window.load_thread is None
+    assert window.tab_widget.widget(0).isEnabled()
+    assert window.open_button.isEnabled()
+    assert warnings == ["Failed to load example: RuntimeError: reader broke"]
+
+
+class PickedScenario:
+    selected_id = 1
+    selected_name = "broken"
+
+    def __init__(self, *args):
+        pass
+
+    def exec(self):
+        return app.QDialog.Accepted
+
+
+def test_a_library_load_that_fails_unexpectedly_unlocks_the_window(make_window, monkeypatch, tmp_path):
+    window = make_window()
+    warnings = record_warnings(monkeypatch)
+    library_path = tmp_path / "library.sqlite"
+    library_path.touch()
+    window.library = object()
+    monkeypatch.setattr(app, "LIBRARY_PATH", str(library_path))
+    monkeypatch.setattr(app, "LibraryDialog", PickedScenario)
+    monkeypatch.setattr(app, "ScenarioLibrary", broken)
+
+    window.open_library()
+    wait_for_load(window)
+
+    assert window.load_thread is None
+    assert window.tab_widget.widget(0).isEnabled()
+    assert window.library_button.isEnabled()
+    assert warnings == ["Failed to load broken from the library: RuntimeError: reader broke"]
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+import app
+
+SCENARIO = {
+    "objective": "maximize_profit",
+    "products": [{"name": "A", "profit_per_unit": 5.0, "cost_per_unit": 1.0}],
+    "resources": [{"name": "R", "available_capacity": 10.0}],
+    "resource_usage": [{"product_name": "A", "resource_name": "R", "usage_per_unit": 2.0}],
+}
+
+
+@pytest.fixture
+def questions(monkeypatch):
+    """Recovery questions asked, each answered yes"""
+    asked = []
+
+    def answer(*args, **kwargs):
+        asked.append(args[1])
+        return app.QMessageBox.Yes
+
+    monkeypatch.setattr(app.QMessageBox, "question", staticmethod(answer))
+    return asked
+
+
+def test_a_second_window_leaves_the_running_session_alone(make_window, questions):
+    first = make_window()
+    first.set_input_data(SCENARIO)
+    QApplication.processEvents()
+
+    second = make_window()
+
+    assert questions == []
+    assert second.session_path != first.session_path
+    assert first.journal.recover()[0]["products"][0] == ["A"]
+
+
+def test_a_session_left_behind_is_offered_and_removed(make_window, questions):
+    crashed = make_window()
+    crashed.set_input_data(SCENARIO)
+    QApplication.processEvents()
+    # As if the process had died: the journal stays and its lock is free
+    crashed.journal.close()
+    crashed.journal = None
+    crashed.session_lock.unlock()
+    crashed.session_lock = None
+
+    window = make_window()
+
+    assert len(questions) == 1
+    assert [product["name"] for product in window.get_input_data()["products"]] == ["A"]
+    assert not os.path.exists(crashed.session_path)
+    name = os.path.basename(window.session_path)
+    assert sorted(os.listdir(app.AUTOSAVE_DIR)) == [name, name + ".lock"]
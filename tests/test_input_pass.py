@@ -0,0 +1,48 @@
+import app
+
+
+def fail(*args):
+    raise RuntimeError("validator broke")
+
+
+def test_an_input_pass_that_fails_is_reported(make_window, monkeypatch):
+    window = make_window()
+    monkeypatch.setattr(app, "INPUT_PASS_ROWS", 0)
+    monkeypatch.setattr(app, "validate_scenario", fail)
+    window.products_table.add_empty_row()
+    window.products_table.setItem(0, 0, app.QTableWidgetItem("A"))
+    window.change_bus.flush()
+    assert window.input_pass is not None
+
+    window.finish_input_pass()
+
+    assert window.input_pass is None
+    assert "validator broke" in window.statusBar().currentMessage()
+
+
+def test_an_edit_reads_and_stores_only_what_it_changed(make_window):
+    window = make_window()
+    window.set_input_data({
+        "products": [{"name": "A", "profit_per_unit": 5.0, "cost_per_unit": 1.0}],
+        "resources": [{"name": "R", "available_capacity": 10.0}],
+        "resource_usage": [{"product_name": "A", "resource_name": "R", "usage_per_unit": 2.0}],
+        "demand_constraints": [],
+    })
+    window.finish_input_pass()
+    before = window.flushed_columns
+
+    window.products_table.item(0, 1).setText("7")
+    window.change_bus.flush()
+
+    after = window.flushed_columns
+    assert after["products"][1] == ["7.00"]
+    assert after["products"][0] is before["products"][0]
+    assert after["resource_usage"] is before["resource_usage"]
+    assert window.store.products.column("profit_per_unit").tolist() == [7.0]
+
+    window.products_table.item(0, 0).setText("B")
+    window.change_bus.flush()
+
+    assert window.flushed_columns["resource_usage"][0] == ["B"]
+    assert window.store.resource_usage.column("product_id").tolist() == [window.product_registry.id_of("B")]
+    assert window.flushed_columns == window.input_columns()
@@ -0,0 +1,35 @@
+from core.journal import EditJournal
+
+
+def test_recover_replays_the_recorded_edits(tmp_path):
+    journal = EditJournal(str(tmp_path))
+    journal.start({"products": [["A"], ["1"]]}, {"objective": "maximize_profit"})
+    journal.record({"products": [["A", "B"], ["1", "2"]]}, {"objective": "minimize_cost"})
+    journal.close()
+
+    tables, settings = EditJournal(str(tmp_path)).recover()
+    assert tables == {"products": [["A", "B"], ["1", "2"]]}
+    assert settings == {"objective": "minimize_cost"}
+
+
+def test_lines_that_are_not_whole_entries_end_the_replay(tmp_path):
+    journal = EditJournal(str(tmp_path))
+    journal.start({"products": [["A"], ["1"]]}, {})
+    journal.record({"products": [["A", "B"], ["1", "2"]]})
+    journal.close()
+    with open(journal.journal_path, "a", encoding="utf-8") as f:
+        f.write('12\n{"op":"splice","table":"products"}\n')
+        f.write('{"op":"splice","table":"products","start":0,"delete":2,"rows":[]}\n')
+
+    tables, _ = EditJournal(str(tmp_path)).recover()
+    assert tables == {"products": [["A", "B"], ["1", "2"]]}
+
+
+def test_a_snapshot_that_is_not_an_object_recovers_nothing(tmp_path):
+    journal = EditJournal(str(tmp_path))
+    with open(journal.snapshot_path, "w", encoding="utf-8") as f:
+        f.write("[1, 2]")
+    assert journal.recover() is None
+    journal.start({"products": [["A"], ["1"]]}, {})
+    journal.close()
+    assert EditJournal(str(tmp_path)).recover() == ({"products": [["A"], ["1"]]}, {})
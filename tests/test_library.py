@@ -0,0 +1,32 @@
+from core.library import ScenarioLibrary
+from core.model_store import ScenarioStore
+from core.result_export import ResultArrays
+
+
+def make_store():
+    store = ScenarioStore()
+    store.product_registry.add("A")
+    store.resource_registry.add("R")
+    store.load_table_text({
+        "products": [["A"], ["5"], ["1"]],
+        "resources": [["R"], ["10"]],
+        "resource_usage": [["A"], ["R"], ["2"]],
+        "demand_constraints": [[], [], []],
+    })
+    return store
+
+
+def test_best_objective_follows_the_objective(tmp_path):
+    library = ScenarioLibrary(str(tmp_path / "library.sqlite"))
+    profit = library.add_store("profit", make_store(), {"objective": "maximize_profit"})
+    cost = library.add_store("cost", make_store(), {"objective": "minimize_cost"})
+    for scenario_id in (profit, cost):
+        for value in (10.0, 30.0, 20.0):
+            library.add_result(scenario_id, ResultArrays({"objective_value": value}, {"optimizer": "basic-production"}))
+
+    best = {entry.name: entry.best_objective_value for entry in library.search()}
+    assert best == {"profit": 30.0, "cost": 10.0}
+    # A profit of 30 reaches 5 but not 35; a cost of 10 reaches 35 but not 5
+    assert [entry.name for entry in library.search(target_objective_value=5.0)] == ["profit"]
+    assert [entry.name for entry in library.search(target_objective_value=35.0)] == ["cost"]
+    library.close()
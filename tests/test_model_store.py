@@ -0,0 +1,22 @@
+from core.model_store import ScenarioStore
+
+TABLES = {
+    "products": [["A", "B"], ["5.0", "4.5"], ["1.0", "0.1"]],
+    "resources": [["R"], ["10.0"]],
+    "resource_usage": [["A", "B"], ["R", "R"], ["2.0", "3.0"]],
+    "demand_constraints": [["B"], [""], ["4.0"]],
+}
+
+
+def test_restoring_table_text_brings_back_names_and_rows():
+    store = ScenarioStore()
+    store.restore_table_text(TABLES)
+    assert store.table_text() == TABLES
+
+    store.product_registry.rename(store.product_registry.id_of("A"), "Alpha")
+    store.resource_registry.add("S")
+    store.restore_table_text(TABLES)
+
+    assert store.table_text() == TABLES
+    assert sorted(name for _, name in store.product_registry.items()) == ["A", "B"]
+    assert [name for _, name in store.resource_registry.items()] == ["R"]
@@ -0,0 +1,23 @@
+from core.name_registry import NameRegistry
+
+
+def test_prune_keeps_the_ids_of_the_other_names():
+    registry = NameRegistry()
+    events = []
+    registry.add_listener(lambda event, entity_id, name: events.append(event))
+    a, b, c = registry.add("A"), registry.add("B"), registry.add("C")
+
+    registry.prune([b, c])
+
+    assert registry.id_of("A") == a
+    assert registry.names() == ["A"]
+    assert not registry.has_id(b)
+    assert events[-1] == "pruned" and events.count("pruned") == 1
+
+
+def test_prune_of_nothing_registered_does_not_notify():
+    registry = NameRegistry()
+    events = []
+    registry.add_listener(lambda event, entity_id, name: events.append(event))
+    registry.prune([7])
+    assert events == []
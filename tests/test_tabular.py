@@ -0,0 +1,21 @@
+from core.tabular import parse_delimited
+
+
+def test_even_rows():
+    assert parse_delimited("A\t1\t2\nB\t3\t4\n", 3, (1, 2)) == [["A", "B"], ["1", "3"], ["2", "4"]]
+
+
+def test_ragged_rows_keep_their_cells():
+    # The field total matches three full rows, but no row may borrow cells from another
+    columns = parse_delimited("A\t1\t2\nB\t3\t4\t5\nC\t6\n", 3, (1, 2))
+    assert columns == [["A", "B", "C"], ["1", "3", "6"], ["2", "4", ""]]
+
+
+def test_short_rows_are_padded():
+    columns = parse_delimited("A,1\nB\nC,2,3\n", 3, (1, 2))
+    assert columns == [["A", "B", "C"], ["1", "", "2"], ["", "", "3"]]
+
+
+def test_header_is_dropped():
+    columns = parse_delimited("Name,Amount\nA,1\n", 2, (1,))
+    assert columns == [["A"], ["1"]]
@@ -0,0 +1,31 @@
+import pytest
+
+from PyQt5.QtWidgets import QApplication
+
+from core.usage_matrix import UsageMatrix
+from widgets.usage_matrix_editor import UsageMatrixEditor, parse_cell
+
+
+@pytest.mark.parametrize("text", ["-1", "-0.5", "nan", "inf", "x"])
+def test_a_cell_must_be_a_usage_of_zero_or_more(text):
+    with pytest.raises(ValueError):
+        parse_cell(text)
+
+
+def test_negative_usage_is_neither_typed_nor_pasted_into_the_matrix():
+    editor = UsageMatrixEditor(UsageMatrix(["A"], ["R", "S"]))
+    model = editor.model()
+    assert model.setData(model.index(0, 0), "2")
+    assert not model.setData(model.index(0, 0), "-3")
+    assert model.setData(model.index(0, 0), "0")
+
+    messages = []
+    editor.status_message.connect(messages.append)
+    editor.setCurrentIndex(model.index(0, 0))
+    QApplication.clipboard().setText("1.5\t-2")
+    editor.paste_from_clipboard()
+
+    assert editor.matrix.to_resource_usage() == [
+        {"product_name": "A", "resource_name": "R", "usage_per_unit": 1.5},
+    ]
+    assert messages == ["Skipped 1 cell(s) that are not a usage of 0 or more"]
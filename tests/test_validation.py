@@ -0,0 +1,17 @@
+from core.validation import validate_scenario
+
+PRODUCTS = [["A", "A"], ["1", "x"], ["1", "1"]]
+RESOURCES = [["R"], ["5"]]
+USAGE = [["A", "B"], ["R", "R"], ["1", "-1"]]
+DEMAND = [[], [], []]
+
+
+def test_tables_left_out_keep_the_problems_of_the_previous_report():
+    full = validate_scenario(PRODUCTS, RESOURCES, USAGE, DEMAND)
+    fixed_usage = [["A"], ["R"], ["1"]]
+
+    partial = validate_scenario(PRODUCTS, RESOURCES, fixed_usage, DEMAND, full, {"resource_usage"})
+
+    assert [error.table for error in full.errors].count("resource_usage") == 2
+    assert partial.errors == [error for error in full.errors if error.table == "products"]
+    assert partial.errors == validate_scenario(PRODUCTS, RESOURCES, fixed_usage, DEMAND).errors
@@ -0,0 +1,761 @@
+"""Matplotlib charts of optimization results
+
+Imported on first use rather than at startup, since loading matplotlib
+takes longer than building the rest of the window.
+
+Each chart is a plot mixed into a canvas: ResourceUsageChart,
+ProductionChart, LiveObjectiveChart and UsageHeatmapChart draw on the
+GUI thread, while ResourceUsageImage, ProductionImage,
+LiveObjectiveImage and UsageHeatmapImage draw on a ChartRenderThread
+and a RenderedChart paints the finished images.
+"""
+import threading
+import time
+
+import matplotlib.style
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.backend_bases import MouseEvent, ResizeEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from matplotlib.ticker import AutoLocator, PercentFormatter, ScalarFormatter
+
+from core.chart_data import level_count, rank_order
+from core.usage_heatmap import UsageHeatmap
+from widgets.qt_compat import QtCore, QtGui, QtWidgets, Signal
+
+Qt = QtCore.Qt
+
+# Bars a chart shows per drill-down level; the rest are summed into one "Other" bar
+CHART_TOP_N = 20
+OTHER_COLOR = '#94a3b8'
+# Most times a second a live chart is redrawn, however fast results arrive
+LIVE_FRAME_RATE = 10
+# Most products or resources named along a heatmap axis; past that they are numbered
+HEATMAP_NAMED = 30
+MISSING_COLOR = '#e2e8f0'
+
+
+class BlitChart:
+    """Chart redrawing its data artists by blitting, mixed into the canvas class it draws on
+
+    The canvas calls setup_chart once it has its figure.
+
+    Data artists are animated. A full draw renders everything else, keeps
+    it as the background and paints the artists, and any overlays such
+    as the legend, over it; an update that only changes their data
+    restores the background and blits them.
+    """
+    def setup_chart(self):
+        self.fig = self.figure
+        self.axes = self.fig.add_subplot(111)
+        self.axes.set_facecolor('#f8f9fa')
+        self.fig.tight_layout()
+        
+        self.artists = []
+        self.overlays = []
+        self.background = None
+        self.mpl_connect("draw_event", self.on_draw)
+        
+    def on_draw(self, event):
+        """Keep everything but the animated artists after a full draw, then paint them"""
+        self.background = self.copy_from_bbox(self.fig.bbox)
+        self.draw_animated()
+        
+    def draw_animated(self):
+        for artist in self.artists + self.overlays:
+            self.fig.draw_artist(artist)
+            
+    def set_animated(self, artists, overlays=()):
+        """Draw artists, and overlays above them, by blitting from now on"""
+        self.artists = list(artists)
+        self.overlays = list(overlays)
+        for artist in self.artists + self.overlays:
+            artist.set_animated(True)
+            
+    def clear_chart(self):
+        self.axes.clear()
+        self.artists = []
+        self.overlays = []
+        
+    def fit_limits(self, get_limits, set_limits, values, from_zero=True, margin=0.05):
+        """Widen an axis to hold values, or narrow it when they use less than half; True if it changed
+
+        Bar charts keep zero on the axis; from_zero=False fits the values
+        alone. margin is the share of their span left free at each end.
+        """
+        values = values[np.isfinite(values)]
+        if from_zero:
+            low, high = min(0.0, float(values.min(initial=0.0))), max(0.0, float(values.max(initial=0.0)))
+        elif len(values):
+            low, high = float(values.min()), float(values.max())
+        else:
+            return False
+        space = (high - low) * margin or max(abs(high) * margin, 1.0)
+        low = 0 if from_zero and low >= 0 else low - space
+        high += space
+        current_low, current_high = get_limits()
+        if low >= current_low and high <= current_high and (high - low) * 2 > current_high - current_low:
+            return False
+        set_limits(low, high)
+        return True
+        
+    def redraw(self, full):
+        """Draw everything, or only the animated artists over the kept background"""
+        if full or self.background is None:
+            self.draw()
+            return
+        self.restore_region(self.background)
+        self.draw_animated()
+        self.blit(self.fig.bbox)
+
+
+class BarChart(BlitChart):
+    """Ranked bar chart
+
+    The canvas provides show_hint to tell the user how to move between
+    levels. Layout runs on resize and when the categories change.
+    
+    Charts show CHART_TOP_N items per level plus an "Other" bar summing
+    the rest, so drawing costs the same for any number of items. The
+    value axis fits the named items; an Other bar past its end is cut off
+    there and labelled with its total. Clicking Other or scrolling up
+    shows the next level; right-clicking or scrolling down goes back.
+    """
+    def setup_chart(self):
+        super().setup_chart()
+        # Categories the bars were built for, in drawing order
+        self.categories = None
+        self.bars = []
+        
+        # Drill-down level, and whether the last bar sums the items of the levels below
+        self.level = 0
+        self.item_count = 0
+        self.has_other = False
+        self.other_labels = []
+        # Ranking of the current values, kept while drilling through the levels
+        self.order = None
+        self.mpl_connect("button_press_event", self.on_click)
+        self.mpl_connect("scroll_event", self.on_scroll)
+        
+    def set_bars(self, bars, overlays=()):
+        self.bars = list(bars)
+        self.set_animated(self.bars, overlays)
+        
+    def clear_chart(self):
+        super().clear_chart()
+        self.categories = None
+        self.bars = []
+        self.other_labels = []
+        
+    def add_other_label(self, horizontal):
+        """Create the label giving the totals of the Other bars, drawn over them"""
+        self.other_labels = [self.axes.text(0, 0, "", rotation=0 if horizontal else 90, va="center", ha="center",
+                                            fontsize=8, clip_on=True)]
+        return self.other_labels
+        
+    def place_other_label(self, text, end, position, horizontal):
+        """Put the Other label at the end of its bars, inside the axis when they are cut off there"""
+        label = self.other_labels[0]
+        limit = (self.axes.get_xlim() if horizontal else self.axes.get_ylim())[1]
+        cut_off = end > limit
+        end = limit if cut_off else end
+        label.set_text(f" {text} ")
+        label.set_color('#ffffff' if cut_off else '#1e293b')
+        if horizontal:
+            label.set_position((end, position))
+            label.set_ha("right" if cut_off else "left")
+        else:
+            label.set_position((position, end))
+            label.set_va("top" if cut_off else "bottom")
+        
+    def bar_index(self, event):
+        """Position of the bar under a mouse event along the category axis"""
+        return int(round(event.xdata))
+        
+    def on_click(self, event):
+        if event.inaxes is not self.axes:
+            return
+        if event.button == 1 and self.has_other and self.bar_index(event) == len(self.categories) - 1:
+            self.drill(1)
+        elif event.button == 3:
+            self.drill(-1)
+            
+    def on_scroll(self, event):
+        if event.inaxes is self.axes:
+            self.drill(1 if event.button == "up" else -1)
+            
+    def drill(self, step):
+        """Show the level step levels down, or up for a negative step"""
+        level = self.level + step
+        if level < 0 or level >= level_count(self.item_count, CHART_TOP_N):
+            return
+        self.level = level
+        self.show_level()
+        
+    def level_window(self, values):
+        """Indexes of the items shown on the current level and of those summed into Other"""
+        if self.order is None:
+            self.order = rank_order(values)
+        self.item_count = len(values)
+        self.level = min(self.level, level_count(self.item_count, CHART_TOP_N) - 1)
+        start = self.level * CHART_TOP_N
+        shown, rest = self.order[start:start + CHART_TOP_N], self.order[start + CHART_TOP_N:]
+        self.has_other = len(rest) > 0
+        if self.item_count > CHART_TOP_N:
+            self.show_hint("Click Other or scroll up for the next items; right-click or scroll down to go back")
+        else:
+            self.show_hint("")
+        return shown, rest
+        
+    def level_title(self, title, shown):
+        """The chart title, with the ranks shown when the items span several levels"""
+        if self.item_count <= CHART_TOP_N:
+            return title
+        first = self.level * CHART_TOP_N + 1
+        return f"{title} ({first:,}-{first + len(shown) - 1:,} of {self.item_count:,})"
+        
+
+
+class ResourceUsagePlot(BarChart):
+    """Widget for displaying resource utilization charts, ranked by capacity used"""
+    def update_chart(self, resource_utilization):
+        if not resource_utilization:
+            self.clear_chart()
+            self.item_count = 0
+            return
+            
+        self.resources = list(resource_utilization)
+        self.order = None
+        self.used_values = np.array([details['used'] for details in resource_utilization.values()], dtype=float)
+        self.available_values = np.array([details['available'] for details in resource_utilization.values()],
+                                         dtype=float)
+        self.show_level()
+        
+    def show_level(self):
+        shown, rest = self.level_window(self.used_values)
+        resources = [self.resources[index] for index in shown.tolist()]
+        used_values = self.used_values[shown]
+        available_values = self.available_values[shown]
+        if self.has_other:
+            resources.append(f"Other ({len(rest):,})")
+            used_values = np.append(used_values, self.used_values[rest].sum())
+            available_values = np.append(available_values, self.available_values[rest].sum())
+        
+        # The axis fits the named resources; Other may be cut off
+        named = np.concatenate([used_values[:len(shown)], available_values[:len(shown)]])
+        if resources == self.categories:
+            # Same resources: resize the existing bars
+            for bar, value in zip(self.bars, np.concatenate([used_values, available_values]).tolist()):
+                bar.set_height(value)
+            rescaled = self.fit_limits(self.axes.get_ylim, self.axes.set_ylim, named)
+            self.label_other(used_values, available_values)
+            self.redraw(rescaled)
+            return
+            
+        self.clear_chart()
+        x = np.arange(len(resources))
+        width = 0.35
+        
+        # Use modern colors; the Other bars are grey
+        used_colors = ['#3b82f6'] * len(resources)
+        available_colors = ['#8b5cf6'] * len(resources)
+        if self.has_other:
+            used_colors[-1] = available_colors[-1] = OTHER_COLOR
+        used_bars = self.axes.bar(x - width/2, used_values, width, label='Used', color=used_colors)
+        available_bars = self.axes.bar(x + width/2, available_values, width, label='Available',
+                                       color=available_colors)
+        
+        self.axes.set_ylabel('Capacity', color='#1e293b')
+        self.axes.set_title(self.level_title('Resource Utilization', shown), color='#1e293b', fontweight='bold')
+        self.axes.set_xticks(x)
+        self.axes.set_xticklabels(resources, rotation=45, ha='right', color='#1e293b')
+        self.axes.tick_params(axis='y', colors='#1e293b')
+        self.axes.spines['bottom'].set_color('#cbd5e1')
+        self.axes.spines['top'].set_color('#cbd5e1')
+        self.axes.spines['left'].set_color('#cbd5e1')
+        self.axes.spines['right'].set_color('#cbd5e1')
+        legend = self.axes.legend(facecolor='#ffffff', edgecolor='#cbd5e1')
+        
+        other_labels = self.add_other_label(horizontal=False) if self.has_other else []
+        self.set_bars(list(used_bars) + list(available_bars), [legend] + other_labels)
+        self.categories = resources
+        self.fit_limits(self.axes.get_ylim, self.axes.set_ylim, named)
+        self.label_other(used_values, available_values)
+        self.fig.tight_layout()
+        self.redraw(True)
+        
+    def label_other(self, used_values, available_values):
+        if self.has_other:
+            self.place_other_label(f"{used_values[-1]:,.0f} / {available_values[-1]:,.0f}",
+                                   max(used_values[-1], available_values[-1]), len(self.categories) - 1,
+                                   horizontal=False)
+
+
+class ProductionPlot(BarChart):
+    """Widget for displaying production plan charts, largest quantities first"""
+    def update_chart(self, production_plan):
+        if not production_plan:
+            self.clear_chart()
+            self.item_count = 0
+            return
+            
+        self.products = list(production_plan)
+        self.order = None
+        self.quantities = np.fromiter(production_plan.values(), dtype=float, count=len(self.products))
+        self.show_level()
+        
+    def bar_index(self, event):
+        return int(round(event.ydata))
+        
+    def show_level(self):
+        shown, rest = self.level_window(self.quantities)
+        products = [self.products[index] for index in shown.tolist()]
+        quantities = self.quantities[shown]
+        if self.has_other:
+            products.append(f"Other ({len(rest):,})")
+            quantities = np.append(quantities, self.quantities[rest].sum())
+        
+        if self.categories is not None and len(products) == len(self.categories) \
+                and set(products) == set(self.categories):
+            # Same products: resize the existing bars, relabelling them if the order changed
+            for bar, quantity in zip(self.bars, quantities.tolist()):
+                bar.set_width(quantity)
+            relabelled = products != self.categories
+            if relabelled:
+                self.axes.set_yticklabels(products, color='#1e293b')
+                self.categories = products
+            rescaled = self.fit_limits(self.axes.get_xlim, self.axes.set_xlim, quantities[:len(shown)])
+            self.label_other(quantities)
+            self.redraw(relabelled or rescaled)
+            return
+            
+        self.clear_chart()
+        y_pos = np.arange(len(products))
+        
+        colors = ['#3b82f6'] * len(products)
+        if self.has_other:
+            colors[-1] = OTHER_COLOR
+        bars = self.axes.barh(y_pos, quantities, align='center', color=colors)
+        self.axes.set_yticks(y_pos)
+        self.axes.set_yticklabels(products, color='#1e293b')
+        self.axes.invert_yaxis()  # labels read top-to-bottom
+        self.axes.set_xlabel('Production Quantity', color='#1e293b')
+        self.axes.set_title(self.level_title('Production Plan', shown), color='#1e293b', fontweight='bold')
+        self.axes.tick_params(axis='x', colors='#1e293b')
+        self.axes.spines['bottom'].set_color('#cbd5e1')
+        self.axes.spines['top'].set_color('#cbd5e1')
+        self.axes.spines['left'].set_color('#cbd5e1')
+        self.axes.spines['right'].set_color('#cbd5e1')
+        
+        self.set_bars(bars, self.add_other_label(horizontal=True) if self.has_other else [])
+        self.categories = products
+        # The axis fits the named products; Other may be cut off
+        self.fit_limits(self.axes.get_xlim, self.axes.set_xlim, quantities[:len(shown)])
+        self.label_other(quantities)
+        self.fig.tight_layout()
+        self.redraw(True)
+        
+    def label_other(self, quantities):
+        if self.has_other:
+            self.place_other_label(f"{quantities[-1]:,.0f}", quantities[-1], len(self.categories) - 1,
+                                   horizontal=True)
+
+
+class LivePlot(BlitChart):
+    """Objective of a series of results as they arrive, with its running minimum, maximum and mean
+
+    update_chart takes (label, xs, objectives) holding every result of
+    the series so far, xs being run numbers or the swept parameter that
+    label names; the title follows it, as in "Objective by Run". The
+    lines are updated in place and blitted; only a new series or a
+    change of axis limits draws the whole chart.
+    """
+    def setup_chart(self):
+        super().setup_chart()
+        # x axis label of the series the lines were built for
+        self.label = None
+        
+    def update_chart(self, series):
+        label, xs, objectives = series
+        if label != self.label:
+            self.clear_chart()
+            self.label = label
+            self.lines = [
+                self.axes.plot([], [], 'o', color='#3b82f6', markersize=3, label='Objective')[0],
+                self.axes.plot([], [], color='#ef4444', linewidth=1, label='Running min')[0],
+                self.axes.plot([], [], color='#22c55e', linewidth=1, label='Running max')[0],
+                self.axes.plot([], [], '--', color='#8b5cf6', linewidth=1, label='Running mean')[0],
+            ]
+            self.axes.set_xlabel(label, color='#1e293b')
+            self.axes.set_ylabel('Objective', color='#1e293b')
+            self.axes.set_title(f'Objective by {label}', color='#1e293b', fontweight='bold')
+            self.axes.tick_params(colors='#1e293b')
+            for spine in self.axes.spines.values():
+                spine.set_color('#cbd5e1')
+            legend = self.axes.legend(loc='upper left', fontsize=8, facecolor='#ffffff', edgecolor='#cbd5e1')
+            self.set_animated(self.lines, [legend])
+            self.fig.tight_layout()
+            
+        # Results without an objective are NaN and left out of the running values
+        finite = np.isfinite(objectives)
+        counts = np.cumsum(finite)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            running_mean = np.cumsum(np.where(finite, objectives, 0.0)) / counts
+        for line, values in zip(self.lines, (objectives, np.fmin.accumulate(objectives),
+                                             np.fmax.accumulate(objectives), running_mean)):
+            line.set_data(xs, values)
+        # Room for a quarter more runs, so a growing series seldom moves the x axis
+        x_changed = self.fit_limits(self.axes.get_xlim, self.axes.set_xlim, xs, from_zero=False, margin=0.25)
+        y_changed = self.fit_limits(self.axes.get_ylim, self.axes.set_ylim, objectives, from_zero=False)
+        self.redraw(self.background is None or x_changed or y_changed)
+
+
+class UsageHeatmapPlot(BlitChart):
+    """Share of each resource's capacity consumed by each product, drawn as one image
+
+    update_chart takes a ResultArrays and the resource usage in API
+    format it was solved with. Rows are products from the largest
+    consumer down. When there are more products than the image has pixel
+    rows, consecutive ones are summed into one row per pixel, so drawing
+    costs the same for any number of products; a resize regroups them.
+    """
+    def setup_chart(self):
+        super().setup_chart()
+        self.heatmap = None
+        self.image = None
+        # Pixel rows the products were last grouped for
+        self.rows = 0
+        self.mpl_connect("resize_event", self.on_resize)
+        
+    def update_chart(self, data):
+        arrays, resource_usage = data
+        self.heatmap = UsageHeatmap.from_result(arrays, resource_usage)
+        if self.image is None:
+            colormap = colormaps['Blues'].with_extremes(bad=MISSING_COLOR)
+            self.image = self.axes.imshow(np.zeros((1, 1)), cmap=colormap, aspect='auto', interpolation='nearest')
+            colorbar = self.fig.colorbar(self.image, ax=self.axes, format=PercentFormatter(1.0))
+            colorbar.set_label('Share of Capacity', color='#1e293b')
+            colorbar.outline.set_edgecolor('#cbd5e1')
+            self.axes.set_title('Capacity Consumed', color='#1e293b', fontweight='bold')
+            self.axes.tick_params(colors='#1e293b')
+            for spine in self.axes.spines.values():
+                spine.set_color('#cbd5e1')
+                
+        product_count, resource_count = self.heatmap.shape
+        if resource_count <= HEATMAP_NAMED:
+            self.axes.set_xticks(np.arange(resource_count))
+            self.axes.set_xticklabels(self.heatmap.resource_names, rotation=90, fontsize=8)
+            self.axes.set_xlabel('')
+        else:
+            self.axes.xaxis.set_major_locator(AutoLocator())
+            self.axes.xaxis.set_major_formatter(ScalarFormatter())
+            self.axes.set_xlabel(f'Resources ({resource_count:,})', color='#1e293b')
+        self.rows = 0
+        self.show_rows()
+        self.fig.tight_layout()
+        self.redraw(True)
+        
+    def on_resize(self, event):
+        # Lay out for the new size first so the rows are counted in the axes as drawn; the canvas draws after a resize
+        if min(self.get_width_height()) > 0:
+            self.fig.tight_layout()
+        self.show_rows()
+        
+    def show_rows(self):
+        """Group the products into the pixel rows the axes have, unless they already are"""
+        if self.heatmap is None:
+            return
+        rows = max(1, int(self.axes.get_window_extent().height))
+        product_count, resource_count = self.heatmap.shape
+        if rows == self.rows or (self.rows >= product_count and rows >= product_count):
+            return
+        self.rows = rows
+        grid, starts = self.heatmap.grid(rows)
+        if not product_count or not resource_count:
+            grid = np.full((1, 1), np.nan)
+        self.image.set_data(grid)
+        self.image.set_extent((-0.5, max(resource_count, 1) - 0.5, max(product_count, 1), 0))
+        top = np.nanmax(grid, initial=0.0)
+        self.image.set_clim(0.0, top if top > 0 else 1.0)
+        
+        if len(starts) < product_count:
+            self.show_hint(f"Each row sums about {product_count / len(starts):,.0f} products, "
+                           "ranked by the capacity they consume")
+        else:
+            self.show_hint("")
+        if product_count <= HEATMAP_NAMED and len(starts) == product_count:
+            self.axes.set_yticks(np.arange(product_count) + 0.5)
+            self.axes.set_yticklabels([self.heatmap.product_names[index] for index in self.heatmap.order.tolist()],
+                                      fontsize=8)
+            self.axes.set_ylabel('')
+        else:
+            self.axes.yaxis.set_major_locator(AutoLocator())
+            self.axes.yaxis.set_major_formatter(ScalarFormatter())
+            self.axes.set_ylabel(f'Products by Rank ({product_count:,})', color='#1e293b')
+
+
+def chart_figure(width, height, dpi):
+    """An empty figure in the chart style"""
+    matplotlib.style.use('default')
+    figure = Figure(figsize=(width, height), dpi=dpi)
+    figure.patch.set_facecolor('#ffffff')
+    return figure
+
+
+class ModernFigureCanvas(FigureCanvas):
+    """Qt canvas drawing its chart on the GUI thread"""
+    def __init__(self, parent=None, width=5, height=4, dpi=100):
+        super().__init__(chart_figure(width, height, dpi))
+        self.setParent(parent)
+        self.setup_chart()
+        
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # A canvas added to a shown window is resized to nothing first
+        if self.width() > 0 and self.height() > 0:
+            self.fig.tight_layout()
+            
+    def show_hint(self, text):
+        self.setToolTip(text)
+
+
+class ResourceUsageChart(ResourceUsagePlot, ModernFigureCanvas):
+    """Resource utilization chart drawn on the GUI thread"""
+
+
+class ProductionChart(ProductionPlot, ModernFigureCanvas):
+    """Production plan chart drawn on the GUI thread"""
+
+
+class LiveObjectiveChart(LivePlot, ModernFigureCanvas):
+    """Live objective chart drawn on the GUI thread"""
+
+
+class UsageHeatmapChart(UsageHeatmapPlot, ModernFigureCanvas):
+    """Capacity consumed heatmap drawn on the GUI thread"""
+
+
+class ImageCanvas(FigureCanvasAgg):
+    """Agg canvas drawing its chart on a ChartRenderThread
+
+    Draws asked for while a batch of changes is applied are held back
+    and done once by render. Only the render thread touches the canvas.
+    """
+    def __init__(self, width=5, height=4, dpi=100):
+        super().__init__(chart_figure(width, height, dpi))
+        self.base_dpi = dpi
+        self.hint = ""
+        self.needs_draw = True
+        self.setup_chart()
+        
+    def show_hint(self, text):
+        self.hint = text
+        
+    def draw(self):
+        # Dropping the background makes later bar updates in the batch ask for a full draw too
+        self.needs_draw = True
+        self.background = None
+        
+    def resize_chart(self, width, height, ratio):
+        """Size the figure to width by height logical pixels on a screen with the given pixel ratio"""
+        self.fig.set_dpi(self.base_dpi * ratio)
+        self.fig.set_size_inches(max(width, 1) / self.base_dpi, max(height, 1) / self.base_dpi)
+        if width > 0 and height > 0:
+            self.fig.tight_layout()
+        self.callbacks.process("resize_event", ResizeEvent("resize_event", self))
+        self.draw()
+        
+    def render(self):
+        """Do a held-back draw and return the chart as a QImage"""
+        if self.needs_draw:
+            self.needs_draw = False
+            super().draw()
+        width, height = self.get_width_height(physical=True)
+        image = QtGui.QImage(bytes(self.buffer_rgba()), width, height, width * 4,
+                             QtGui.QImage.Format_RGBA8888).copy()
+        image.setDevicePixelRatio(self.fig.dpi / self.base_dpi)
+        return image
+
+
+class ResourceUsageImage(ResourceUsagePlot, ImageCanvas):
+    """Resource utilization chart drawn on a ChartRenderThread"""
+
+
+class ProductionImage(ProductionPlot, ImageCanvas):
+    """Production plan chart drawn on a ChartRenderThread"""
+
+
+class LiveObjectiveImage(LivePlot, ImageCanvas):
+    """Live objective chart drawn on a ChartRenderThread"""
+
+
+class UsageHeatmapImage(UsageHeatmapPlot, ImageCanvas):
+    """Capacity consumed heatmap drawn on a ChartRenderThread"""
+
+
+class ChartRenderThread(QtCore.QThread):
+    """Thread drawing charts with Agg off the GUI thread, one at a time
+
+    Charts get changes through submit: new data, a new size, or a mouse
+    press or scroll to act on. Data still pending when newer data comes
+    is dropped, so a result superseded before its turn is never drawn,
+    and all the changes pending for a chart give one image. Matplotlib
+    is not thread-safe, so the charts share this one thread. Each image
+    comes with the seconds spent applying the changes and drawing it.
+    """
+    rendered = Signal(str, object, str, float)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.condition = threading.Condition()
+        self.canvas_classes = {}
+        # Changes waiting for each chart, oldest first
+        self.pending = {}
+        self.stopping = False
+        
+    def add_chart(self, key, canvas_class):
+        """Draw the chart named key on a canvas_class, an ImageCanvas subclass, made on this thread"""
+        self.canvas_classes[key] = canvas_class
+        
+    def submit(self, key, kind, value):
+        """Queue a "data", "size", "press" or "scroll" change; data and size replace pending ones"""
+        with self.condition:
+            changes = self.pending.setdefault(key, [])
+            if kind in ("data", "size"):
+                changes[:] = [change for change in changes if change[0] != kind]
+            changes.append((kind, value))
+            self.condition.notify()
+            
+    def stop(self):
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+        self.wait()
+        
+    def run(self):
+        canvases = {}
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopping:
+                    self.condition.wait()
+                if self.stopping:
+                    return
+                # Oldest chart first, so one busy chart cannot starve the other
+                key = next(iter(self.pending))
+                changes = self.pending.pop(key)
+            if key not in canvases:
+                canvases[key] = self.canvas_classes[key]()
+            canvas = canvases[key]
+            started = time.perf_counter()
+            for kind, value in changes:
+                if kind == "data":
+                    canvas.update_chart(value)
+                elif kind == "size":
+                    canvas.resize_chart(*value)
+                elif kind == "press":
+                    x, y, button = value
+                    canvas.callbacks.process("button_press_event",
+                                             MouseEvent("button_press_event", canvas, x, y, button))
+                elif kind == "scroll":
+                    x, y, step = value
+                    canvas.callbacks.process("scroll_event",
+                                             MouseEvent("scroll_event", canvas, x, y, "up" if step > 0 else "down",
+                                                        step=step))
+            image = canvas.render()
+            self.rendered.emit(key, image, canvas.hint, time.perf_counter() - started)
+
+
+class RenderedChart(QtWidgets.QWidget):
+    """Widget painting the images a ChartRenderThread draws of one chart
+
+    Takes update_chart like the Qt canvases. Sizes, mouse presses and
+    wheel turns are passed on to the thread, which draws the result.
+    """
+    def __init__(self, render_thread, key, canvas_class, parent=None):
+        super().__init__(parent)
+        self.render_thread = render_thread
+        self.key = key
+        self.image = None
+        render_thread.add_chart(key, canvas_class)
+        render_thread.rendered.connect(self.on_rendered)
+        
+    def sizeHint(self):
+        # The size the Qt canvas asks for at its default figure size
+        return QtCore.QSize(500, 400)
+        
+    def update_chart(self, data):
+        self.render_thread.submit(self.key, "data", data)
+        
+    def on_rendered(self, key, image, hint, seconds):
+        if key != self.key:
+            return
+        self.image = image
+        self.setToolTip(hint)
+        self.update()
+        
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), QtGui.QColor('#ffffff'))
+        if self.image is not None:
+            painter.drawImage(0, 0, self.image)
+        painter.end()
+        
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.render_thread.submit(self.key, "size", (self.width(), self.height(), self.devicePixelRatioF()))
+        
+    def figure_point(self, position):
+        """Figure pixel coordinates of a widget position; matplotlib counts y from the bottom"""
+        ratio = self.devicePixelRatioF()
+        return position.x() * ratio, (self.height() - position.y()) * ratio
+        
+    def mousePressEvent(self, event):
+        button = {Qt.LeftButton: 1, Qt.MiddleButton: 2, Qt.RightButton: 3}.get(event.button())
+        if button is not None:
+            self.render_thread.submit(self.key, "press", (*self.figure_point(event.pos()), button))
+            
+    def wheelEvent(self, event):
+        step = event.angleDelta().y() / 120
+        if step:
+            self.render_thread.submit(self.key, "scroll", (*self.figure_point(event.position()), step))
+
+
+class LiveFeed(QtCore.QObject):
+    """Results collected for a live chart and passed on at most LIVE_FRAME_RATE times a second
+
+    The first result after a quiet spell is shown at once; results that
+    come faster are gathered and shown together on the next frame.
+    """
+    def __init__(self, chart, parent=None):
+        super().__init__(parent)
+        self.chart = chart
+        self.label = None
+        self.xs = []
+        self.objectives = []
+        self.last_frame = 0.0
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+        
+    def start(self, label):
+        """Begin a new series with label on the x axis"""
+        self.label = label
+        self.xs = []
+        self.objectives = []
+        self.flush()
+        
+    def add(self, x, objective):
+        self.xs.append(x)
+        self.objectives.append(objective)
+        if not self.timer.isActive():
+            wait = self.last_frame + 1 / LIVE_FRAME_RATE - time.monotonic()
+            self.timer.start(max(0, int(wait * 1000)))
+            
+    def flush(self):
+        self.timer.stop()
+        self.last_frame = time.monotonic()
+        # None objectives become NaN
+        self.chart.update_chart((self.label, np.array(self.xs, dtype=float),
+                                 np.array(self.objectives, dtype=float)))
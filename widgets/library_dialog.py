@@ -0,0 +1,252 @@
+import sqlite3
+import time
+
+from widgets.qt_compat import QtCore, QtWidgets, Signal
+
+from core.library import ScenarioLibrary, scenario_files, split_tags
+
+Qt = QtCore.Qt
+
+COLUMNS = ("Name", "Tags", "Products", "Resources", "Usage Rows", "Results", "Best Objective", "Saved")
+
+
+class LibraryImportThread(QtCore.QThread):
+    """Thread adding every scenario file below a folder to the library
+
+    It opens its own connection, since SQLite connections stay on the
+    thread that made them.
+    """
+    progress = Signal(int, int)
+    imported = Signal(int, list)
+
+    def __init__(self, library_path, folder, tags):
+        super().__init__()
+        self.library_path = library_path
+        self.folder = folder
+        self.tags = tags
+
+    def run(self):
+        try:
+            library = ScenarioLibrary(self.library_path)
+            try:
+                added, failed = library.import_files(scenario_files(self.folder), self.tags, self.progress.emit)
+            finally:
+                library.close()
+        except sqlite3.Error as e:
+            added, failed = 0, [(self.folder, str(e))]
+        self.imported.emit(added, failed)
+
+
+class LibraryDialog(QtWidgets.QDialog):
+    """Dialog for searching the scenario library and opening, tagging or deleting its scenarios
+
+    save_current, if given, is called with a name and a list of tags to
+    add the scenario being edited. selected_id holds the scenario to open
+    once the dialog is accepted.
+    """
+
+    def __init__(self, library, save_current=None, parent=None):
+        super().__init__(parent)
+        self.library = library
+        self.save_current = save_current
+        self.selected_id = None
+        self.selected_name = None
+        self.import_thread = None
+        self.entries = []
+        self.setWindowTitle("Scenario Library")
+        self.resize(1000, 600)
+
+        layout = QtWidgets.QVBoxLayout(self)
+
+        search_layout = QtWidgets.QHBoxLayout()
+        self.name_edit = QtWidgets.QLineEdit()
+        self.name_edit.setPlaceholderText("Name starts with...")
+        self.tags_edit = QtWidgets.QLineEdit()
+        self.tags_edit.setPlaceholderText("Tags, e.g. eu 2024")
+        self.optimizer_combo = QtWidgets.QComboBox()
+        self.min_size_spin = QtWidgets.QSpinBox()
+        self.max_size_spin = QtWidgets.QSpinBox()
+        for spin in (self.min_size_spin, self.max_size_spin):
+            spin.setRange(0, 2 ** 31 - 1)
+            spin.setSpecialValueText("Any")
+            spin.setGroupSeparatorShown(True)
+        search_layout.addWidget(self.name_edit, 2)
+        search_layout.addWidget(self.tags_edit, 2)
+        search_layout.addWidget(QtWidgets.QLabel("Optimizer:"))
+        search_layout.addWidget(self.optimizer_combo, 1)
+        search_layout.addWidget(QtWidgets.QLabel("Rows from:"))
+        search_layout.addWidget(self.min_size_spin)
+        search_layout.addWidget(QtWidgets.QLabel("to:"))
+        search_layout.addWidget(self.max_size_spin)
+        layout.addLayout(search_layout)
+
+        self.table = QtWidgets.QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.doubleClicked.connect(self.open_selected)
+        layout.addWidget(self.table)
+
+        self.status_label = QtWidgets.QLabel("")
+        layout.addWidget(self.status_label)
+
+        buttons_layout = QtWidgets.QHBoxLayout()
+        self.save_button = QtWidgets.QPushButton("Save Current Scenario")
+        self.save_button.clicked.connect(self.save_scenario)
+        self.save_button.setEnabled(save_current is not None)
+        self.import_button = QtWidgets.QPushButton("Import Folder")
+        self.import_button.clicked.connect(self.import_folder)
+        self.tags_button = QtWidgets.QPushButton("Edit Tags")
+        self.tags_button.clicked.connect(self.edit_tags)
+        self.delete_button = QtWidgets.QPushButton("Delete")
+        self.delete_button.clicked.connect(self.delete_selected)
+        self.open_button = QtWidgets.QPushButton("Open")
+        self.open_button.setDefault(True)
+        self.open_button.clicked.connect(self.open_selected)
+        close_button = QtWidgets.QPushButton("Close")
+        close_button.clicked.connect(self.reject)
+        for button in (self.save_button, self.import_button, self.tags_button, self.delete_button):
+            buttons_layout.addWidget(button)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(self.open_button)
+        buttons_layout.addWidget(close_button)
+        layout.addLayout(buttons_layout)
+
+        self.refresh_optimizers()
+        for edit in (self.name_edit, self.tags_edit):
+            edit.textChanged.connect(self.search)
+        self.optimizer_combo.currentIndexChanged.connect(self.search)
+        for spin in (self.min_size_spin, self.max_size_spin):
+            spin.valueChanged.connect(self.search)
+        self.table.itemSelectionChanged.connect(self.update_buttons)
+        self.search()
+
+    def refresh_optimizers(self):
+        current = self.optimizer_combo.currentText()
+        self.optimizer_combo.blockSignals(True)
+        self.optimizer_combo.clear()
+        self.optimizer_combo.addItem("Any")
+        self.optimizer_combo.addItems(self.library.optimizers())
+        index = self.optimizer_combo.findText(current)
+        self.optimizer_combo.setCurrentIndex(max(index, 0))
+        self.optimizer_combo.blockSignals(False)
+
+    def search(self):
+        """List the scenarios matching the search fields"""
+        start = time.perf_counter()
+        self.entries = self.library.search(
+            name=self.name_edit.text().strip(),
+            tags=split_tags(self.tags_edit.text()),
+            min_size=self.min_size_spin.value() or None,
+            max_size=self.max_size_spin.value() or None,
+            optimizer=self.optimizer_combo.currentText() if self.optimizer_combo.currentIndex() > 0 else None
+        )
+        elapsed = time.perf_counter() - start
+
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(self.entries))
+        for row, entry in enumerate(self.entries):
+            best = "" if entry.best_objective_value is None else f"{entry.best_objective_value:.2f}"
+            texts = (entry.name, " ".join(entry.tags), f"{entry.product_count:,}", f"{entry.resource_count:,}",
+                     f"{entry.usage_count:,}", str(entry.result_count), best,
+                     time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.saved_at)))
+            for column, text in enumerate(texts):
+                item = QtWidgets.QTableWidgetItem(text)
+                if 2 <= column <= 6:
+                    item.setTextAlignment(int(Qt.AlignRight | Qt.AlignVCenter))
+                if entry.source:
+                    item.setToolTip(entry.source)
+                self.table.setItem(row, column, item)
+        self.table.setUpdatesEnabled(True)
+        self.status_label.setText(f"{len(self.entries)} scenarios found in {elapsed * 1000:.0f} ms")
+        self.update_buttons()
+
+    def selected_entry(self):
+        rows = self.table.selectionModel().selectedRows()
+        return self.entries[rows[0].row()] if rows else None
+
+    def update_buttons(self):
+        selected = self.selected_entry() is not None
+        for button in (self.tags_button, self.delete_button, self.open_button):
+            button.setEnabled(selected)
+
+    def open_selected(self):
+        entry = self.selected_entry()
+        if entry is not None:
+            self.selected_id = entry.id
+            self.selected_name = entry.name
+            self.accept()
+
+    def save_scenario(self):
+        """Add the scenario being edited under a name and tags typed by the user"""
+        name, ok = QtWidgets.QInputDialog.getText(self, "Save Current Scenario", "Name:")
+        if not ok or not name.strip():
+            return
+        tags, ok = QtWidgets.QInputDialog.getText(self, "Save Current Scenario", "Tags (optional):")
+        if not ok:
+            return
+        self.save_current(name.strip(), split_tags(tags))
+        self.search()
+
+    def edit_tags(self):
+        entry = self.selected_entry()
+        if entry is None:
+            return
+        tags, ok = QtWidgets.QInputDialog.getText(self, "Edit Tags", f"Tags of {entry.name}:",
+                                                  text=" ".join(entry.tags))
+        if ok:
+            self.library.set_tags(entry.id, split_tags(tags))
+            self.search()
+
+    def delete_selected(self):
+        entry = self.selected_entry()
+        if entry is None:
+            return
+        answer = QtWidgets.QMessageBox.question(
+            self, "Delete Scenario", f"Delete {entry.name} and its {entry.result_count} results from the library?"
+        )
+        if answer == QtWidgets.QMessageBox.Yes:
+            self.library.delete(entry.id)
+            self.search()
+
+    def import_folder(self):
+        """Add every scenario file below a folder on a worker thread"""
+        folder = QtWidgets.QFileDialog.getExistingDirectory(self, "Import Folder")
+        if not folder:
+            return
+        tags, ok = QtWidgets.QInputDialog.getText(self, "Import Folder", "Tags for the imported scenarios (optional):")
+        if not ok:
+            return
+        self.import_button.setEnabled(False)
+        self.status_label.setText(f"Looking for scenarios in {folder}...")
+        self.import_thread = LibraryImportThread(self.library.path, folder, split_tags(tags))
+        self.import_thread.progress.connect(
+            lambda done, total: self.status_label.setText(f"Importing scenario {done} of {total}...")
+        )
+        self.import_thread.imported.connect(self.finish_import)
+        self.import_thread.start()
+
+    def finish_import(self, added, failed):
+        if self.import_thread is not None:
+            self.import_thread.wait()
+        self.import_thread = None
+        self.import_button.setEnabled(True)
+        self.refresh_optimizers()
+        self.search()
+        message = f"Imported {added} scenarios"
+        if failed:
+            message += f"; {len(failed)} files could not be read"
+            details = "\n".join(f"{path}: {error}" for path, error in failed[:10])
+            if len(failed) > 10:
+                details += f"\n... and {len(failed) - 10} more"
+            QtWidgets.QMessageBox.warning(self, "Import Folder", f"{message}:\n\n{details}")
+        self.status_label.setText(message)
+
+    def done(self, result):
+        # The import thread writes through its own connection and must finish before the dialog goes
+        if self.import_thread is not None:
+            self.import_thread.wait()
+        super().done(result)
@@ -0,0 +1,25 @@
+"""Qt binding shim for widgets shared by both frontends
+
+app.py is built on PyQt5 and main.py on PySide6. Shared widgets import Qt
+through this module so they bind to whichever one the running frontend
+has already loaded.
+"""
+import sys
+
+if "PySide6" in sys.modules:
+    from PySide6 import QtCore, QtGui, QtWidgets
+    Signal = QtCore.Signal
+    Slot = QtCore.Slot
+else:
+    try:
+        from PyQt5 import QtCore, QtGui, QtWidgets
+        Signal = QtCore.pyqtSignal
+        Slot = QtCore.pyqtSlot
+    except ImportError:
+        from PySide6 import QtCore, QtGui, QtWidgets
+        Signal = QtCore.Signal
+        Slot = QtCore.Slot
+
+
+# QAction moved from QtWidgets to QtGui in Qt 6
+QAction = getattr(QtWidgets, "QAction", None) or QtGui.QAction
@@ -0,0 +1,118 @@
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from core.result_export import ResultArrays
+from core.result_table import column_order, matched_changes
+from widgets.qt_compat import QtCore, QtGui
+
+Qt = QtCore.Qt
+
+GAIN_COLOR = "#16a34a"
+LOSS_COLOR = "#dc2626"
+
+
+class ResultColumn(NamedTuple):
+    header: str
+    # Names as a list, numbers as a float array
+    values: Sequence
+    # Format spec for numbers; empty for text
+    format: str = ""
+    # Colour increases green and decreases red
+    signed: bool = False
+
+
+class ResultTableModel(QtCore.QAbstractTableModel):
+    """Read-only table over result columns, sorted by permuting row numbers
+
+    Qt only asks for the cells on screen, which are formatted as they are
+    drawn, and sorting argsorts a single column, so showing or sorting a
+    plan costs about the same for any number of products. The sort is
+    kept when new columns are set.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns: List[ResultColumn] = []
+        # Row numbers in display order, or None for the order of the result
+        self.order: Optional[np.ndarray] = None
+        self.sort_column = -1
+        self.descending = False
+
+    def set_columns(self, columns):
+        self.beginResetModel()
+        self.columns = list(columns)
+        self.order = self.sorted_rows()
+        self.endResetModel()
+
+    def sorted_rows(self):
+        if not 0 <= self.sort_column < len(self.columns):
+            return None
+        return column_order(self.columns[self.sort_column].values, self.descending)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid() or not self.columns:
+            return 0
+        return len(self.columns[0].values)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = self.columns[index.column()]
+        row = index.row() if self.order is None else int(self.order[index.row()])
+        value = column.values[row]
+        if role == Qt.DisplayRole:
+            if not column.format:
+                return str(value)
+            return "" if np.isnan(value) else format(value, column.format)
+        if role == Qt.TextAlignmentRole and column.format:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.ForegroundRole and column.signed and value:
+            if value > 0:
+                return QtGui.QColor(GAIN_COLOR)
+            if value < 0:
+                return QtGui.QColor(LOSS_COLOR)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.columns[section].header
+        return super().headerData(section, orientation, role)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self.sort_column = column
+        self.descending = order == Qt.DescendingOrder
+        self.order = self.sorted_rows()
+        self.layoutChanged.emit()
+
+
+def production_columns(arrays: ResultArrays, previous: Optional[ResultArrays]) -> List[ResultColumn]:
+    """Product, quantity and the change in quantity since the previous result"""
+    changes = matched_changes(arrays.products, arrays.quantities, previous and previous.products,
+                              previous and previous.quantities)
+    return [
+        ResultColumn("Product", arrays.products),
+        ResultColumn("Quantity", arrays.quantities, ".2f"),
+        ResultColumn("Change", changes, "+.2f", signed=True),
+    ]
+
+
+def utilization_columns(arrays: ResultArrays, previous: Optional[ResultArrays]) -> List[ResultColumn]:
+    """Resource, capacity used and available, the share used, and the change in use since the previous result"""
+    used = arrays.utilization["used"]
+    available = arrays.utilization["available"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(available > 0, used / available, np.nan)
+    changes = matched_changes(arrays.resources, used, previous and previous.resources,
+                              previous and previous.utilization["used"])
+    return [
+        ResultColumn("Resource", arrays.resources),
+        ResultColumn("Used", used, ".2f"),
+        ResultColumn("Available", available, ".2f"),
+        ResultColumn("Utilization", share, ".1%"),
+        ResultColumn("Change in Use", changes, "+.2f", signed=True),
+    ]
@@ -0,0 +1,168 @@
+import json
+
+from widgets.qt_compat import QtCore, QtWidgets
+
+Qt = QtCore.Qt
+
+# Rows of a container added per fetch, so expanding a huge list stays quick
+FETCH_ROWS = 1000
+# Characters of a long string shown in the value column
+VALUE_CHARS = 200
+
+
+def value_text(value):
+    """Value column text: a size for containers, the value itself for scalars"""
+    if isinstance(value, dict):
+        return f"{{{len(value):,} keys}}"
+    if isinstance(value, list):
+        return f"[{len(value):,} items]"
+    if isinstance(value, str):
+        return value if len(value) <= VALUE_CHARS else value[:VALUE_CHARS] + "..."
+    return json.dumps(value)
+
+
+class ResultNode:
+    """One key and value of a result; child nodes are made the first time they are asked for"""
+    __slots__ = ("parent", "row", "key", "value", "keys", "children", "fetched")
+
+    def __init__(self, parent, row, key, value):
+        self.parent = parent
+        self.row = row
+        self.key = key
+        self.value = value
+        # Keys of a dict value, listed on the first child made
+        self.keys = None
+        self.children = {}
+        # Rows the model has exposed so far
+        self.fetched = 0
+
+    @property
+    def child_count(self):
+        return len(self.value) if isinstance(self.value, (dict, list)) else 0
+
+    def child(self, row):
+        node = self.children.get(row)
+        if node is None:
+            if isinstance(self.value, dict):
+                if self.keys is None:
+                    self.keys = list(self.value)
+                key = self.keys[row]
+                node = ResultNode(self, row, key, self.value[key])
+            else:
+                node = ResultNode(self, row, f"[{row}]", self.value[row])
+            self.children[row] = node
+        return node
+
+
+class ResultTreeModel(QtCore.QAbstractItemModel):
+    """Tree model over a result made of dicts, lists and scalars
+
+    Rows of a container are exposed FETCH_ROWS at a time as the view
+    scrolls to them, and nodes are made only for rows the view asks
+    about, so a result with a huge production plan opens at once.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = ResultNode(None, 0, "", {})
+
+    def set_result(self, result):
+        self.beginResetModel()
+        self.root = ResultNode(None, 0, "", result if result is not None else {})
+        self.endResetModel()
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, self.node(parent).child(row))
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        node = index.internalPointer().parent
+        if node is self.root:
+            return QtCore.QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return self.node(parent).fetched
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 2
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return False
+        return self.node(parent).child_count > 0
+
+    def canFetchMore(self, parent):
+        node = self.node(parent)
+        return node.fetched < node.child_count
+
+    def fetchMore(self, parent):
+        node = self.node(parent)
+        count = min(FETCH_ROWS, node.child_count - node.fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(parent, node.fetched, node.fetched + count - 1)
+        node.fetched += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        node = index.internalPointer()
+        return str(node.key) if index.column() == 0 else value_text(node.value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or orientation != Qt.Horizontal:
+            return None
+        return ("Key", "Value")[section]
+
+
+class ResultView(QtWidgets.QTabWidget):
+    """Result shown as a tree built as it is expanded, and as raw JSON made only when its tab is opened"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.result = None
+        self.raw_loaded = False
+
+        self.model = ResultTreeModel(self)
+        self.tree = QtWidgets.QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setAlternatingRowColors(True)
+        self.tree.setColumnWidth(0, 250)
+        self.addTab(self.tree, "Tree")
+
+        self.raw_text = QtWidgets.QPlainTextEdit()
+        self.raw_text.setReadOnly(True)
+        self.raw_text.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.addTab(self.raw_text, "Raw")
+        self.currentChanged.connect(self.on_tab_changed)
+
+    def set_result(self, result):
+        self.result = result
+        self.model.set_result(result)
+        self.raw_text.clear()
+        self.raw_loaded = False
+        if self.currentWidget() is self.raw_text:
+            self.load_raw()
+
+    def clear(self):
+        self.set_result(None)
+
+    def on_tab_changed(self, index):
+        if self.widget(index) is self.raw_text:
+            self.load_raw()
+
+    def load_raw(self):
+        if not self.raw_loaded and self.result is not None:
+            self.raw_text.setPlainText(json.dumps(self.result, indent=2))
+            self.raw_loaded = True
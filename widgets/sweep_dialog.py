@@ -0,0 +1,59 @@
+from typing import Any, Dict, List
+
+import numpy as np
+
+from widgets.qt_compat import QtWidgets
+
+# Most runs a sweep may take, each one a call to the optimizer
+MAX_STEPS = 10000
+
+
+class SweepDialog(QtWidgets.QDialog):
+    """Dialog choosing a resource and the capacities to solve the scenario at
+
+    resources are in API format. The range starts out at half to one and
+    a half times the capacity of the chosen resource.
+    """
+
+    def __init__(self, resources: List[Dict[str, Any]], parent=None):
+        super().__init__(parent)
+        self.resources = resources
+        self.setWindowTitle("Capacity Sweep")
+
+        layout = QtWidgets.QFormLayout(self)
+        self.resource_combo = QtWidgets.QComboBox()
+        self.resource_combo.addItems([resource["name"] for resource in resources])
+        layout.addRow("Resource:", self.resource_combo)
+
+        self.from_spin = QtWidgets.QDoubleSpinBox()
+        self.to_spin = QtWidgets.QDoubleSpinBox()
+        for spin in (self.from_spin, self.to_spin):
+            spin.setRange(0, 1e12)
+            spin.setDecimals(2)
+        layout.addRow("From capacity:", self.from_spin)
+        layout.addRow("To capacity:", self.to_spin)
+
+        self.steps_spin = QtWidgets.QSpinBox()
+        self.steps_spin.setRange(2, MAX_STEPS)
+        self.steps_spin.setValue(20)
+        layout.addRow("Runs:", self.steps_spin)
+
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+        self.resource_combo.currentIndexChanged.connect(self.reset_range)
+        self.reset_range(0)
+
+    def reset_range(self, index):
+        capacity = float(self.resources[index]["available_capacity"]) if self.resources else 0.0
+        self.from_spin.setValue(capacity * 0.5)
+        self.to_spin.setValue(capacity * 1.5)
+
+    def resource(self) -> str:
+        return self.resource_combo.currentText()
+
+    def capacities(self) -> List[float]:
+        """Evenly spaced capacities from the first to the last, in run order"""
+        return np.linspace(self.from_spin.value(), self.to_spin.value(), self.steps_spin.value()).tolist()
@@ -0,0 +1,102 @@
+import numpy as np
+
+from widgets.qt_compat import QtGui, QtWidgets, Signal
+
+from core.table_index import TableIndex
+from widgets.table_text import column_texts
+
+
+class TableFilterBox(QtWidgets.QLineEdit):
+    """Filter box that hides the rows of a table not matching the typed filter
+
+    The search index is built from the column text handed to set_columns,
+    normally once per table change, and every keystroke only queries it.
+    Only rows whose visibility changes are shown or hidden. A filter the
+    index cannot apply turns the text red with the reason as tooltip.
+    """
+    filtered = Signal(int, int)  # Shown rows, total rows
+
+    def __init__(self, table, name_columns, numeric_columns=(), parent=None):
+        super().__init__(parent)
+        self.table = table
+        self.name_columns = tuple(name_columns)
+        self.numeric_columns = tuple(numeric_columns)
+        self._columns = None
+        self._index = None
+        # Hidden state last applied per row; unknown once rows are inserted or removed
+        self._hidden = None
+        self._palette = self.palette()
+
+        example = ""
+        if self.numeric_columns:
+            field = self.headers()[self.numeric_columns[0]].split()[0].lower()
+            example = f" or {field}>0"
+        self.setPlaceholderText(f"Filter by name, ^prefix{example}")
+        self.setClearButtonEnabled(True)
+        self.textChanged.connect(self.apply)
+
+        model = table.model()
+        model.rowsInserted.connect(self.forget_hidden_rows)
+        model.rowsRemoved.connect(self.forget_hidden_rows)
+        model.modelReset.connect(self.forget_hidden_rows)
+
+    def headers(self):
+        headers = []
+        for column in range(self.table.columnCount()):
+            item = self.table.horizontalHeaderItem(column)
+            headers.append(item.text() if item else "")
+        return headers
+
+    def forget_hidden_rows(self, *args):
+        self._hidden = None
+
+    def set_columns(self, columns):
+        """Index new table contents, given as column text, and re-apply an active filter"""
+        self._columns = columns
+        self._index = None
+        if self.text().strip():
+            self.apply()
+
+    def index(self):
+        if self._index is None or self._index.row_count != self.table.rowCount():
+            if self._columns is None or len(self._columns[0]) != self.table.rowCount():
+                # Rows changed since the last set_columns; read them from the table
+                self._columns = [column_texts(self.table, column) for column in range(self.table.columnCount())]
+            self._index = TableIndex(self._columns, self.headers(), self.name_columns, self.numeric_columns)
+        return self._index
+
+    def focusInEvent(self, event):
+        super().focusInEvent(event)
+        # Build the name index before the first keystroke needs it
+        index = self.index()
+        for column in self.name_columns:
+            index.names(column)
+
+    def apply(self):
+        """Show the rows matching the current filter text and hide the rest"""
+        index = self.index()
+        try:
+            matches = index.match(self.text())
+        except ValueError as error:
+            palette = QtGui.QPalette(self._palette)
+            palette.setColor(QtGui.QPalette.Text, QtGui.QColor("#ef4444"))
+            self.setPalette(palette)
+            self.setToolTip(str(error))
+            return
+        self.setPalette(self._palette)
+        self.setToolTip("")
+
+        row_count = index.row_count
+        hidden = np.zeros(row_count, dtype=bool) if matches is None else ~matches
+        if self._hidden is None or len(self._hidden) != row_count:
+            self._hidden = np.array([self.table.isRowHidden(row) for row in range(row_count)], dtype=bool)
+        changed = np.flatnonzero(hidden != self._hidden).tolist()
+        if changed:
+            updates_enabled = self.table.updatesEnabled()
+            self.table.setUpdatesEnabled(False)
+            hidden_rows = hidden.tolist()
+            for row in changed:
+                self.table.setRowHidden(row, hidden_rows[row])
+            self.table.setUpdatesEnabled(updates_enabled)
+        self._hidden = hidden
+        self.filtered.emit(row_count - int(np.count_nonzero(hidden)), row_count)
@@ -0,0 +1,18 @@
+from widgets.qt_compat import QtCore, QtGui, QtWidgets, QAction
+
+Qt = QtCore.Qt
+
+
+def add_paste_action(table, callback):
+    """Give a table a Ctrl+V and context menu action that hands the clipboard text to callback
+
+    The shortcut only fires while the table itself has focus, so pasting
+    into a cell editor keeps its normal behaviour.
+    """
+    action = QAction("Paste Rows", table)
+    action.setShortcut(QtGui.QKeySequence.Paste)
+    action.setShortcutContext(Qt.WidgetShortcut)
+    action.triggered.connect(lambda: callback(QtWidgets.QApplication.clipboard().text()))
+    table.addAction(action)
+    table.setContextMenuPolicy(Qt.ActionsContextMenu)
+    return action
@@ -0,0 +1,7 @@
+def column_texts(table, column):
+    """Return the text of every cell in one column, empty for missing cells"""
+    texts = []
+    for row in range(table.rowCount()):
+        item = table.item(row, column)
+        texts.append(item.text() if item else "")
+    return texts
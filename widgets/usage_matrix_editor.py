@@ -0,0 +1,226 @@
+import math
+
+from widgets.qt_compat import QtCore, QtGui, QtWidgets, QAction, Signal
+
+from core.usage_matrix import UsageMatrix
+
+Qt = QtCore.Qt
+
+
+def parse_cell(text):
+    """Parse one typed or pasted cell: blank clears it, anything else must be a usage of 0 or more"""
+    text = text.strip()
+    if not text:
+        return None
+    value = float(text)
+    # The usage spin boxes and the table validator allow no negative usage either
+    if not (math.isfinite(value) and value >= 0):
+        raise ValueError(f"Usage must be a number of 0 or more, not {text}")
+    return value
+
+
+class UsageMatrixModel(QtCore.QAbstractTableModel):
+    """Table model exposing a UsageMatrix with products as rows and resources as columns
+
+    Qt only asks the model for the cells that are on screen, so rendering
+    cost follows the viewport rather than the size of the matrix.
+    """
+
+    def __init__(self, matrix, parent=None):
+        super().__init__(parent)
+        self.matrix = matrix
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.matrix.product_names)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.matrix.resource_names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            value = self.matrix.get(index.row(), index.column())
+            if value is None:
+                return ""
+            return f"{value:.2f}" if role == Qt.DisplayRole else str(value)
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.matrix.resource_names[section]
+        return self.matrix.product_names[section]
+
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        try:
+            self.matrix.set(index.row(), index.column(), parse_cell(str(value)))
+        except ValueError:
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+    def set_block(self, top, left, values):
+        """Write a block of values and repaint the affected rectangle once"""
+        bottom, right = self.matrix.set_block(top, left, values)
+        if bottom >= top and right >= left:
+            self.dataChanged.emit(self.index(top, left), self.index(bottom, right))
+
+    def fill(self, top, left, bottom, right, value):
+        """Fill a rectangle with one value and repaint it once"""
+        self.matrix.fill(top, left, bottom, right, value)
+        self.dataChanged.emit(self.index(top, left), self.index(bottom, right))
+
+
+class UsageMatrixEditor(QtWidgets.QTableView):
+    """Grid editor for resource usage supporting block paste, copy and fill"""
+
+    status_message = Signal(str)
+
+    def __init__(self, matrix=None, parent=None):
+        super().__init__(parent)
+        self.setModel(UsageMatrixModel(matrix or UsageMatrix(), self))
+        self.setAlternatingRowColors(True)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.ContiguousSelection)
+        # Fixed section sizes stop Qt from measuring every row and column
+        self.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(28)
+        self.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.horizontalHeader().setDefaultSectionSize(110)
+        self.setContextMenuPolicy(Qt.ActionsContextMenu)
+
+        fill_action = QAction("Fill Selection...", self)
+        fill_action.triggered.connect(self.prompt_fill)
+        self.addAction(fill_action)
+
+    @property
+    def matrix(self):
+        return self.model().matrix
+
+    def set_matrix(self, matrix):
+        self.model().beginResetModel()
+        self.model().matrix = matrix
+        self.model().endResetModel()
+
+    def selected_rect(self):
+        """Return (top, left, bottom, right) of the selection, or None"""
+        ranges = self.selectionModel().selection()
+        if ranges.isEmpty():
+            index = self.currentIndex()
+            if not index.isValid():
+                return None
+            return index.row(), index.column(), index.row(), index.column()
+        selection = ranges[0]
+        return selection.top(), selection.left(), selection.bottom(), selection.right()
+
+    def keyPressEvent(self, event):
+        if event.matches(QtGui.QKeySequence.Paste):
+            self.paste_from_clipboard()
+        elif event.matches(QtGui.QKeySequence.Copy):
+            self.copy_to_clipboard()
+        elif event.key() in (Qt.Key_Delete, Qt.Key_Backspace):
+            rect = self.selected_rect()
+            if rect:
+                self.model().fill(*rect, None)
+        else:
+            super().keyPressEvent(event)
+
+    def paste_from_clipboard(self):
+        """Paste tab-separated clipboard text at the current cell
+
+        A single copied value pasted over a multi-cell selection fills the
+        whole selection, as in a spreadsheet.
+        """
+        rect = self.selected_rect()
+        if rect is None:
+            return
+        text = QtWidgets.QApplication.clipboard().text()
+        lines = text.rstrip("\r\n").split("\n")
+        rows = [line.rstrip("\r").split("\t") for line in lines]
+
+        values = []
+        skipped = 0
+        for cells in rows:
+            parsed = []
+            for cell in cells:
+                try:
+                    parsed.append(parse_cell(cell))
+                except ValueError:
+                    # Leave the target cell unchanged
+                    parsed.append(self.matrix.get(rect[0] + len(values), rect[1] + len(parsed)))
+                    skipped += 1
+            values.append(parsed)
+
+        top, left, bottom, right = rect
+        if len(values) == 1 and len(values[0]) == 1 and (bottom > top or right > left):
+            self.model().fill(top, left, bottom, right, values[0][0])
+        else:
+            self.model().set_block(top, left, values)
+
+        if skipped:
+            self.status_message.emit(f"Skipped {skipped} cell(s) that are not a usage of 0 or more")
+
+    def copy_to_clipboard(self):
+        rect = self.selected_rect()
+        if rect is None:
+            return
+        top, left, bottom, right = rect
+        lines = []
+        for row in range(top, bottom + 1):
+            cells = []
+            for col in range(left, right + 1):
+                value = self.matrix.get(row, col)
+                cells.append("" if value is None else str(value))
+            lines.append("\t".join(cells))
+        QtWidgets.QApplication.clipboard().setText("\n".join(lines))
+
+    def prompt_fill(self):
+        rect = self.selected_rect()
+        if rect is None:
+            return
+        value, ok = QtWidgets.QInputDialog.getDouble(self, "Fill Selection", "Usage per unit:",
+                                                     0.0, 0, 1000000, 2)
+        if ok:
+            self.model().fill(*rect, value)
+
+
+class UsageMatrixDialog(QtWidgets.QDialog):
+    """Dialog for editing resource usage as a product x resource grid"""
+
+    def __init__(self, matrix, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Resource Usage Matrix")
+        self.resize(900, 600)
+
+        layout = QtWidgets.QVBoxLayout(self)
+
+        info_label = QtWidgets.QLabel(
+            "Rows are products, columns are resources. Paste blocks from a spreadsheet "
+            "with Ctrl+V, or select cells and use the context menu to fill them. "
+            "Empty cells mean the product does not use that resource."
+        )
+        info_label.setWordWrap(True)
+        layout.addWidget(info_label)
+
+        self.editor = UsageMatrixEditor(matrix)
+        layout.addWidget(self.editor)
+
+        self.status_label = QtWidgets.QLabel("")
+        self.editor.status_message.connect(self.status_label.setText)
+        layout.addWidget(self.status_label)
+
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def matrix(self):
+        return self.editor.matrix